@@ -0,0 +1,48 @@
+import { NextResponse } from 'next/server'
+import { DatabaseService } from '@/utils/database'
+import { isAuthenticated } from '@/utils/auth'
+
+export async function POST(req: Request) {
+   try {
+      const authenticated = await isAuthenticated()
+      if (!authenticated) {
+         return NextResponse.json(
+            { error: 'Unauthorized' },
+            { status: 401 }
+         )
+      }
+
+      const { projects } = await req.json()
+
+      if (!Array.isArray(projects) || projects.length === 0) {
+         return NextResponse.json(
+            { error: 'Valid projects array is required' },
+            { status: 400 }
+         )
+      }
+
+      // githubLink is the upsert key, so every project needs one
+      const invalidProjects = projects.filter(
+         project => typeof project?.githubLink !== 'string' || !project.githubLink.trim()
+            || typeof project?.title !== 'string'
+      )
+      if (invalidProjects.length > 0) {
+         return NextResponse.json(
+            { error: 'Every project needs a title and a githubLink', invalidProjects },
+            { status: 400 }
+         )
+      }
+
+      const result = await DatabaseService.upsertProjects(
+         projects.map(({ _id, createdAt, updatedAt, ...project }) => project)
+      )
+
+      return NextResponse.json({ success: true, ...result })
+   } catch (error) {
+      console.error('Bulk upsert projects error:', error)
+      return NextResponse.json(
+         { error: 'Failed to upsert projects', details: error instanceof Error ? error.message : 'Unknown error' },
+         { status: 500 }
+      )
+   }
+}
@@ -0,0 +1,61 @@
+import { NextResponse } from 'next/server'
+import { readFile } from 'fs/promises'
+import path from 'path'
+
+// Written here by scripts/main.py and scripts/update_latest.py, which default to the
+// same PROJECTS_SNAPSHOT_DIR or public/snapshots (see scripts/snapshot.py)
+const SNAPSHOT_DIR = process.env.PROJECTS_SNAPSHOT_DIR || path.join(process.cwd(), 'public', 'snapshots')
+
+type SnapshotManifest = {
+   version: number
+   sha256: string
+   count: number
+   files: Record<string, string>
+   etags: Record<string, string>
+}
+
+// Preferred first; identity is always available
+const ENCODINGS = ['br', 'gzip']
+
+function pickEncoding(acceptEncoding: string, manifest: SnapshotManifest): string {
+   const accepted = acceptEncoding
+      .split(',')
+      .map(part => part.trim().split(';'))
+      .filter(([, q]) => !q || parseFloat(q.split('=')[1]) > 0)
+      .map(([coding]) => coding.toLowerCase())
+   return ENCODINGS.find(coding => manifest.files[coding] && accepted.includes(coding)) ?? 'identity'
+}
+
+export async function GET(request: Request) {
+   try {
+      const manifest: SnapshotManifest = JSON.parse(
+         await readFile(path.join(SNAPSHOT_DIR, 'projects.snapshot.json'), 'utf-8')
+      )
+      const encoding = pickEncoding(request.headers.get('accept-encoding') || '', manifest)
+      const headers: Record<string, string> = {
+         'Content-Type': 'application/json',
+         'Cache-Control': 'public, max-age=0, must-revalidate',
+         ETag: manifest.etags[encoding],
+         Vary: 'Accept-Encoding',
+      }
+
+      // Every coding of the snapshot is the same list, so any of its tags is current
+      const ifNoneMatch = request.headers.get('if-none-match')
+      const current = Object.values(manifest.etags)
+      if (ifNoneMatch && ifNoneMatch.split(',').some(tag => current.includes(tag.trim().replace(/^W\//, '')))) {
+         return new NextResponse(null, { status: 304, headers })
+      }
+
+      const body = await readFile(path.join(SNAPSHOT_DIR, manifest.files[encoding]))
+      if (encoding !== 'identity') {
+         headers['Content-Encoding'] = encoding
+      }
+      return new NextResponse(new Uint8Array(body), { headers })
+   } catch (error) {
+      console.error('Projects snapshot error:', error)
+      return NextResponse.json(
+         { error: 'Projects snapshot not available' },
+         { status: 404 }
+      )
+   }
+}
@@ -3,6 +3,7 @@ import { getContributionGraphs } from "@/utils/github"
 import { fetchLanguageStats } from "@/utils/languageStats"
 import { calculateTotalCommits, calculateLongestStreak } from "@/utils/githubStats"
 import { calculateCurrentStreak } from "@/utils/githubStats"
+import { readGithubStatsSnapshot, statsFromSnapshot } from "@/utils/githubStatsSnapshot"
 
 export async function GET(
    request: Request,
@@ -21,6 +22,12 @@ export async function GET(
          )
       }
       
+      // Serve the precomputed snapshot from scripts/github_stats.py while it is fresh
+      const snapshot = await readGithubStatsSnapshot(username)
+      if (snapshot) {
+         return NextResponse.json(statsFromSnapshot(snapshot, excludedLanguages))
+      }
+
       const [contributionData, languageStats] = await Promise.all([
          getContributionGraphs(username),
          fetchLanguageStats(username, excludedLanguages)
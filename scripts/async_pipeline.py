@@ -0,0 +1,201 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional
+from get_projects import Response
+from discription_generator import agen_desc
+from status_analyzer import agen_project_status
+from tech_extractor import agen_tech_stack
+from project_analyzer import agen_project_analysis
+from journal import INDIVIDUAL_STAGES, RunJournal
+from rate_limit import TokenBucket
+from retry import AdaptiveLimiter, RetryPolicy, acall_with_retry, is_output_error
+from stage_graph import INDIVIDUAL_STAGE_SPECS, arun_stage_graph
+from prompt_builder import build_payload
+
+
+async def run_stage(
+    stage: str,
+    label: str,
+    func: Callable[[Response], Awaitable[Response]],
+    project: Response,
+    bucket: TokenBucket,
+    policy: Optional[RetryPolicy] = None,
+    limiter: Optional[AdaptiveLimiter] = None,
+) -> Response:
+    """Run one AI stage behind the token bucket with backoff on throttling"""
+    tokens = build_payload(project, stage).tokens
+
+    async def attempt(project: Response) -> Response:
+        await bucket.aacquire(tokens)
+        return await func(project)
+
+    try:
+        return await acall_with_retry(
+            stage, attempt, project, policy=policy, limiter=limiter
+        )
+    except Exception as error:
+        print(f"    [{project.title}] {label} failed: {str(error)}")
+        raise
+
+
+async def aprocess_project_with_ai(
+    project: Response,
+    bucket: TokenBucket,
+    policy: Optional[RetryPolicy] = None,
+    fused: bool = True,
+    journal: Optional[RunJournal] = None,
+    limiter: Optional[AdaptiveLimiter] = None,
+) -> Response:
+    """Async counterpart of pipeline.process_project_with_ai"""
+    completed = journal.completed_stages(project.title) if journal else set()
+    if "analysis" in completed:
+        journal.restore(project, "analysis")
+        print(f"    [{project.title}] Restored combined analysis from the run journal")
+        return project
+
+    async def run(stage: str, label: str, func, target: Response = project) -> Response:
+        if journal:
+            func = journal.arecording(stage, func)
+        return await run_stage(stage, label, func, target, bucket, policy, limiter)
+
+    resuming_stages = any(stage in completed for stage in INDIVIDUAL_STAGES)
+    if fused and not resuming_stages:
+        try:
+            return await run("analysis", "Combined analysis", agen_project_analysis)
+        except Exception as error:
+            # Only an unusable reply is worth three more calls
+            if not is_output_error(error):
+                raise
+            print(f"    [{project.title}] Falling back to individual stages")
+
+    def step(stage: str, label: str, func, fallback: str):
+        if stage in completed:
+
+            async def restore(project: Response) -> Response:
+                journal.restore(project, stage)
+                return project
+
+            return restore
+
+        async def attempt(project: Response) -> Response:
+            try:
+                return await run(stage, label, func, project)
+            except Exception:
+                print(f"    [{project.title}] {fallback}")
+                return project
+
+        return attempt
+
+    steps = [
+        step("desc", "Description generation", agen_desc, "Using original description"),
+        step(
+            "status", "Status analysis", agen_project_status, "Leaving the status for the next run"
+        ),
+        step("tech", "Tech stack extraction", agen_tech_stack, "Using original languages"),
+    ]
+
+    return await arun_stage_graph(project, list(zip(INDIVIDUAL_STAGE_SPECS, steps)))
+
+
+async def aprocess_projects(
+    projects: List[Response],
+    concurrency: int = 4,
+    requests_per_minute: float = 15,
+    tokens_per_minute: float = 1_000_000,
+    fused: bool = True,
+    journal: Optional[RunJournal] = None,
+    bucket: Optional[TokenBucket] = None,
+    admit: Optional[Callable[[Response], bool]] = None,
+) -> List[Response]:
+    """Process projects concurrently, preserving their original order.
+
+    Up to concurrency projects run at once; an AIMD limiter shrinks the
+    number of in-flight model calls when the API throttles and grows it back
+    as calls succeed. Pass a bucket to share one rate budget between runs.
+    With admit, a project it rejects when its turn comes is returned as is.
+    """
+    bucket = bucket or TokenBucket(requests_per_minute, tokens_per_minute)
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = AdaptiveLimiter(concurrency)
+
+    async def worker(i: int, project: Response) -> Response:
+        async with semaphore:
+            if admit is not None and not admit(project):
+                print(f"Deferred project {i+1}/{len(projects)}: {project.title}")
+                return project
+            print(f"Processing project {i+1}/{len(projects)}: {project.title}")
+            try:
+                return await aprocess_project_with_ai(
+                    project, bucket, fused=fused, journal=journal, limiter=limiter
+                )
+            except Exception as e:
+                print(f"  - Error processing {project.title}: {str(e)}")
+                return project
+
+    results = await asyncio.gather(
+        *(worker(i, project) for i, project in enumerate(projects))
+    )
+    print(f"Adaptive {limiter}")
+    return results
+
+
+def process_projects_concurrently(
+    projects: List[Response],
+    concurrency: int = 4,
+    requests_per_minute: float = 15,
+    tokens_per_minute: float = 1_000_000,
+    fused: bool = True,
+    journal: Optional[RunJournal] = None,
+    bucket: Optional[TokenBucket] = None,
+    admit: Optional[Callable[[Response], bool]] = None,
+) -> List[Response]:
+    """Run the async pipeline to completion from synchronous code"""
+    start = time.perf_counter()
+    results = asyncio.run(
+        aprocess_projects(
+            projects,
+            concurrency,
+            requests_per_minute,
+            tokens_per_minute,
+            fused,
+            journal,
+            bucket,
+            admit,
+        )
+    )
+    elapsed = time.perf_counter() - start
+    print(f"\nProcessed {len(results)} projects in {elapsed:.1f}s")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    from fake_llm import install_fake_model
+
+    parser = argparse.ArgumentParser(description="Benchmark the async pipeline offline")
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--rpm", type=float, default=600)
+    parser.add_argument("--tpm", type=float, default=1_000_000)
+    parser.add_argument("--sequential", action="store_true")
+    args = parser.parse_args()
+
+    fake = install_fake_model(latency=args.latency)
+    synthetic_projects = [
+        Response(
+            title=f"synthetic-project-{i}",
+            languages=["Python"],
+            num_commits=i,
+            readme=f"# Synthetic project {i}\n\nBuilt with FastAPI and React.",
+        )
+        for i in range(args.projects)
+    ]
+    process_projects_concurrently(
+        synthetic_projects,
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        fused=not args.sequential,
+    )
+    print(f"Model calls: {fake.calls}, tokens sent: {fake.input_tokens}")
@@ -0,0 +1,256 @@
+import json
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import JsonOutputParser, PydanticOutputParser
+from pydantic import BaseModel, Field, ValidationError
+from typing import Callable, Dict, List, Optional, Set
+from get_projects import Response
+from llm import DEFAULT_BATCH_TOKEN_BUDGET, DEFAULT_MAX_BATCH_SIZE, get_model, model_id
+from llm_cache import cache_key, get_cache
+from tracing import current_span
+from project_analyzer import ProjectAnalysis, analysis_guidelines, apply_analysis
+from retry import RetryPolicy, call_with_retry, is_output_error
+from journal import RunJournal
+from rate_limit import TokenBucket
+from prompt_builder import build_payload, estimate_prompt_tokens
+from tokens import count_tokens
+
+
+class KeyedAnalysis(ProjectAnalysis):
+    key: str = Field(description="The key of the repository this analysis belongs to")
+
+
+class BatchAnalysis(BaseModel):
+    analyses: List[KeyedAnalysis] = Field(
+        description="One analysis per input repository, in any order"
+    )
+
+
+batch_sys_prompt = (
+    """
+You are a technical writing, project status and technology extraction expert.
+
+Goal
+Analyze several GitHub repositories in one pass. For every repository return
+a description, a project status and the technologies it uses, tagged with
+the repository's "key". Treat each repository independently and never mix
+information between them.
+
+Source data (do not invent or ignore fields)
+repos = [
+  {{
+    "key":                "<key: str>",
+    "title":              "<title: str>",
+    "live_website_url":   "<live_website_url: str>",
+    "languages":          <languages: List[str]>,
+    "num_commits":        <num_commits: int>,
+    "readme":             "<readme: str>"
+  }}
+]
+
+"""
+    + analysis_guidelines
+    + """
+Return exactly one entry in "analyses" for every key you were given.
+
+{format_instructions}
+"""
+)
+
+batch_template = ChatPromptTemplate.from_messages(
+    [
+        ("system", batch_sys_prompt),
+        ("human", "Analyze these repositories:\n{repos}"),
+    ]
+).partial(
+    format_instructions=PydanticOutputParser(
+        pydantic_object=BatchAnalysis
+    ).get_format_instructions()
+)
+
+TEMPERATURE = 0.1
+
+
+def repo_payload(repo_data: Response) -> Dict:
+    return {"key": repo_data.title, **build_payload(repo_data, "batch").data}
+
+
+def pack_batches(
+    projects: List[Response],
+    token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+) -> List[List[Response]]:
+    """Greedily group repos in order so each request stays under the token budget"""
+    batches: List[List[Response]] = []
+    current: List[Response] = []
+    current_tokens = 0
+    for project in projects:
+        tokens = count_tokens(json.dumps(repo_payload(project)))
+        if current and (
+            current_tokens + tokens > token_budget or len(current) >= max_batch_size
+        ):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(project)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def parse_batch(content: str, keys: Set[str]) -> Dict[str, ProjectAnalysis]:
+    """Validate each returned item on its own so one bad entry spares the rest"""
+    data = JsonOutputParser().parse(content)
+    items = data.get("analyses", []) if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return {}
+
+    analyses = {}
+    for item in items:
+        try:
+            keyed = KeyedAnalysis.model_validate(item)
+        except ValidationError:
+            continue
+        if keyed.key in keys and keyed.key not in analyses:
+            analyses[keyed.key] = ProjectAnalysis.model_validate(
+                keyed.model_dump(exclude={"key"})
+            )
+    return analyses
+
+
+def request_batch(batch: List[Response]) -> Dict[str, ProjectAnalysis]:
+    """Send one batched request and return the valid analyses by key"""
+    chain = batch_template | get_model(TEMPERATURE)
+    repos = json.dumps([repo_payload(project) for project in batch], indent=2)
+    estimate_prompt_tokens(batch_template, repos=repos)
+    reply = chain.invoke({"repos": repos})
+    current_span().set(repos=len(batch))
+    current_span().record_usage(reply)
+    return parse_batch(str(reply.content), {project.title for project in batch})
+
+
+def _batch_cache_key(repo_data: Response) -> str:
+    return cache_key("batch", batch_template, model_id(), build_payload(repo_data, "batch").text)
+
+
+def _analyze(
+    batch: List[Response],
+    analyzed: Set[str],
+    policy: Optional[RetryPolicy],
+    journal: Optional[RunJournal],
+    bucket: Optional[TokenBucket] = None,
+) -> None:
+    """Request a batch, then retry whatever failed validation.
+
+    If part of the batch came back valid the failed remainder is retried as
+    one batch; if nothing did, the batch is bisected. Single repos that still
+    fail are left for the caller's per-repo pipeline.
+    """
+    # Cache keys depend on the Response, which apply_analysis rewrites
+    keys = {project.title: _batch_cache_key(project) for project in batch}
+    tokens = sum(count_tokens(json.dumps(repo_payload(project))) for project in batch)
+
+    def attempt(batch: List[Response]) -> Dict[str, ProjectAnalysis]:
+        if bucket:
+            bucket.acquire(tokens)
+        return request_batch(batch)
+
+    try:
+        analyses = call_with_retry("batch", attempt, batch, policy=policy)
+    except Exception as error:
+        if not is_output_error(error):
+            # Throttling outlasted the retries or the request itself is broken;
+            # smaller batches will not help, so leave these to the per-repo pipeline
+            print(f"    Batch of {len(batch)} failed: {str(error)}")
+            return
+        print(f"    Batch of {len(batch)} returned unparseable output")
+        analyses = {}
+
+    failed = []
+    for project in batch:
+        analysis = analyses.get(project.title)
+        if analysis is None:
+            failed.append(project)
+            continue
+        get_cache().set(keys[project.title], "batch", analysis.model_dump_json())
+        apply_analysis(project, analysis)
+        if journal:
+            journal.record(project, "analysis")
+        analyzed.add(project.title)
+
+    if not failed or len(batch) == 1:
+        return
+    if len(failed) < len(batch):
+        print(f"    Retrying {len(failed)} repos that failed validation")
+        _analyze(failed, analyzed, policy, journal, bucket)
+    else:
+        middle = len(failed) // 2
+        print(f"    Bisecting batch of {len(failed)} repos")
+        _analyze(failed[:middle], analyzed, policy, journal, bucket)
+        _analyze(failed[middle:], analyzed, policy, journal, bucket)
+
+
+def analyze_in_batches(
+    projects: List[Response],
+    token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    journal: Optional[RunJournal] = None,
+    policy: Optional[RetryPolicy] = None,
+    bucket: Optional[TokenBucket] = None,
+    admit: Optional[Callable[[Response], bool]] = None,
+) -> Set[str]:
+    """Analyze repos several per request, returning the titles that succeeded.
+
+    Repos missing from the result should go through the per-repo pipeline.
+    With a bucket, each request first reserves its share of the rate budget;
+    with admit, repos it rejects just before their batch is sent are left out.
+    """
+    analyzed: Set[str] = set()
+    pending = []
+    for project in projects:
+        if journal and journal.restore(project, "analysis"):
+            analyzed.add(project.title)
+            continue
+        content = get_cache().get(_batch_cache_key(project))
+        if content is not None:
+            apply_analysis(project, ProjectAnalysis.model_validate_json(content))
+            if journal:
+                journal.record(project, "analysis")
+            analyzed.add(project.title)
+            continue
+        pending.append(project)
+
+    batches = pack_batches(pending, token_budget, max_batch_size)
+    for i, batch in enumerate(batches):
+        if admit is not None:
+            batch = [project for project in batch if admit(project)]
+            if not batch:
+                continue
+        print(f"  - Analyzing batch {i+1}/{len(batches)} ({len(batch)} repos)...")
+        _analyze(batch, analyzed, policy, journal, bucket)
+
+    print(
+        f"Batch analysis: {len(analyzed)}/{len(projects)} repos analyzed "
+        f"in {len(batches)} batches"
+    )
+    return analyzed
+
+
+if __name__ == "__main__":
+    example_repos = [
+        Response(
+            title="AI-Resume-Parser",
+            live_website_url="https://ai-resume-parser.vercel.app",
+            languages=["TypeScript", "Python"],
+            num_commits=172,
+            readme="# AI Resume Analyzer\n\n## Tech Stack\n- Next.js, FastAPI, PostgreSQL",
+        ),
+        Response(
+            title="Weather-CLI",
+            languages=["Go"],
+            num_commits=12,
+            readme="# Weather CLI\n\nUnder development: a terminal weather client in Go.",
+        ),
+    ]
+    analyze_in_batches(example_repos)
+    for repo in example_repos:
+        print(repo.model_dump_json(indent=2, exclude={"readme"}))
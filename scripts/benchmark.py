@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the projects pipeline.
+
+Runs main.py or update_latest.py against a local fake repos endpoint serving
+synthetic repos and a deterministic fake chat model, then reports wall time,
+per-stage latency percentiles, model calls, tokens sent and time spent sleeping.
+Usage: python benchmark.py --repos 40 --modes sequential,fused,concurrent
+       python benchmark.py --target update_latest --rate-limit-every 10 --warm
+"""
+
+import argparse
+import asyncio
+import functools
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import async_pipeline
+import batch_analyzer
+import get_projects
+import main
+import pipeline
+import update_latest
+from fake_llm import install_fake_model
+from fake_servers import FakeServer, fake_projects_api, fake_repos_api
+from llm_cache import configure_cache, get_cache
+from readme_compactor import DEFAULT_README_TOKEN_BUDGET
+from retry import reset_retry_stats, retry_stats
+from run_config import RunConfig
+from tracing import configure_tracing
+
+# Stage name -> pipeline function; the async pipeline uses the "a" prefixed twin
+STAGE_FUNCTIONS = {
+    "analysis": "gen_project_analysis",
+    "desc": "gen_desc",
+    "status": "gen_project_status",
+    "tech": "gen_tech_stack",
+}
+
+# Mode -> (fused, uses --concurrency, batched)
+MODES = {
+    "sequential": (False, False, False),
+    "fused": (True, False, False),
+    "concurrent": (True, True, False),
+    "batch": (True, False, True),
+}
+
+
+class BenchmarkStats:
+    """Thread-safe collector for stage latencies and requested sleeps"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.sleeps: List[float] = []
+        self._lock = threading.Lock()
+
+    def record_latency(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.latencies[stage].append(seconds)
+
+    def record_sleep(self, seconds: float) -> None:
+        with self._lock:
+            self.sleeps.append(seconds)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def timed(stats: BenchmarkStats, stage: str, func: Callable) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats.record_latency(stage, time.perf_counter() - start)
+
+    return wrapper
+
+
+def atimed(stats: BenchmarkStats, stage: str, func: Callable) -> Callable:
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            stats.record_latency(stage, time.perf_counter() - start)
+
+    return wrapper
+
+
+@contextmanager
+def instrumented(stats: BenchmarkStats, sleep_scale: float) -> Iterator[None]:
+    """Time every AI stage and record, then scale, every pipeline sleep"""
+    originals = []
+
+    def patch(owner: Any, name: str, value: Any) -> None:
+        originals.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, value)
+
+    for stage, name in STAGE_FUNCTIONS.items():
+        patch(pipeline, name, timed(stats, stage, getattr(pipeline, name)))
+        async_name = f"a{name}"
+        patch(async_pipeline, async_name, atimed(stats, stage, getattr(async_pipeline, async_name)))
+    patch(batch_analyzer, "request_batch", timed(stats, "batch", batch_analyzer.request_batch))
+
+    real_sleep = time.sleep
+    real_asleep = asyncio.sleep
+
+    def sleep(seconds):
+        stats.record_sleep(seconds)
+        real_sleep(seconds * sleep_scale)
+
+    async def asleep(seconds, *args, **kwargs):
+        stats.record_sleep(seconds)
+        return await real_asleep(seconds * sleep_scale, *args, **kwargs)
+
+    patch(time, "sleep", sleep)
+    patch(asyncio, "sleep", asleep)
+    try:
+        yield
+    finally:
+        for owner, name, value in reversed(originals):
+            setattr(owner, name, value)
+
+
+def run_scenario(
+    label: str,
+    mode: str,
+    args: argparse.Namespace,
+    workdir: str,
+    repos_api: FakeServer,
+    projects_api: Optional[FakeServer],
+) -> Dict[str, Any]:
+    """Run one pipeline pass inside workdir and summarize what it cost"""
+    fused, uses_concurrency, batch = MODES[mode]
+    concurrency = args.concurrency if uses_concurrency else 0
+    readme_budget = None if args.no_compact else args.readme_budget
+
+    stats = BenchmarkStats()
+    fake = install_fake_model(
+        latency=args.latency,
+        rate_limit_every=args.rate_limit_every,
+        invalid_item_rate=args.invalid_item_rate,
+    )
+    configure_cache(
+        enabled=not args.no_cache,
+        path=os.path.join(workdir, "data", "llm_cache.sqlite"),
+    )
+    get_projects.GITHUB_STATS_API = repos_api.url
+    reset_retry_stats()
+    tracer = configure_tracing(None)
+    fetches_before = repos_api.requests
+    writes_before = projects_api.requests if projects_api else 0
+
+    cwd = os.getcwd()
+    output = io.StringIO()
+    os.chdir(workdir)
+    start = time.perf_counter()
+    try:
+        with instrumented(stats, args.sleep_scale):
+            with nullcontext() if args.verbose else redirect_stdout(output):
+                config = RunConfig(
+                    fused=fused,
+                    concurrency=concurrency,
+                    requests_per_minute=args.rpm,
+                    tokens_per_minute=args.tpm,
+                    readme_budget=readme_budget,
+                    batch=batch,
+                    batch_tokens=args.batch_tokens,
+                    dedupe=args.dedupe,
+                    # Keep the snapshot in the scratch directory
+                    snapshot_dir=os.path.join("data", "snapshot"),
+                )
+                if args.target == "main":
+                    # A warm pass measures the cache, not a resumed journal
+                    main.process_all_projects(config, restart=True)
+                else:
+                    update_latest.process_latest_projects(args.repos, projects_api.url, config)
+    finally:
+        wall = time.perf_counter() - start
+        os.chdir(cwd)
+
+    cache = get_cache()
+    return {
+        "label": label,
+        "mode": mode,
+        "target": args.target,
+        "repos": args.repos,
+        "wall_seconds": round(wall, 3),
+        "sleep_seconds": round(sum(stats.sleeps), 3),
+        "sleeps": len(stats.sleeps),
+        "model_requests": fake.requests,
+        "model_calls": fake.calls,
+        "rate_limited": fake.rate_limited,
+        "input_tokens": fake.input_tokens,
+        "output_tokens": fake.output_tokens,
+        "cache_hits": cache.hits,
+        "cache_misses": cache.misses,
+        "repo_fetches": repos_api.requests - fetches_before,
+        "api_writes": (projects_api.requests - writes_before) if projects_api else 0,
+        "stages": {
+            stage: {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "max_ms": round(max(values) * 1000, 1),
+            }
+            for stage, values in stats.latencies.items()
+        },
+        "retries": {
+            stage: {
+                "retries": stage_retries.retries,
+                "rate_limited": stage_retries.rate_limited,
+                "failures": stage_retries.failures,
+                "backoff_seconds": round(stage_retries.sleep_seconds, 1),
+            }
+            for stage, stage_retries in retry_stats().items()
+        },
+        "trace": tracer.summary(),
+    }
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    print(f"\n{result['label']}")
+    print(f"  Wall time:   {result['wall_seconds']:.2f}s")
+    print(
+        f"  Sleep time:  {result['sleep_seconds']:.1f}s requested over "
+        f"{result['sleeps']} sleeps (summed across workers)"
+    )
+    print(
+        f"  Model:       {result['model_calls']} calls, {result['rate_limited']} rate limited, "
+        f"{result['input_tokens']} tokens sent, {result['output_tokens']} received"
+    )
+    print(f"  Cache:       {result['cache_hits']} hits, {result['cache_misses']} misses")
+    print(f"  HTTP:        {result['repo_fetches']} repo fetches, {result['api_writes']} API writes")
+    for stage, summary in sorted(result["stages"].items()):
+        print(
+            f"  {stage:<12} n={summary['count']:<4} p50={summary['p50_ms']:.1f}ms "
+            f"p95={summary['p95_ms']:.1f}ms max={summary['max_ms']:.1f}ms"
+        )
+    for stage, summary in sorted(result["retries"].items()):
+        if summary["retries"] or summary["failures"]:
+            print(
+                f"  {stage:<12} {summary['retries']} retries, {summary['failures']} failed, "
+                f"{summary['backoff_seconds']:.1f}s backing off"
+            )
+
+
+def run_benchmark(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results = []
+    projects_api = fake_projects_api() if args.target == "update_latest" else None
+
+    with fake_repos_api(args.repos) as repos_api:
+        if projects_api:
+            projects_api.start()
+        try:
+            for mode in args.modes:
+                workdir = tempfile.mkdtemp(prefix="portfolio-bench-")
+                try:
+                    runs = ["cold", "warm"] if args.warm else ["cold"]
+                    for run in runs:
+                        label = f"{args.target} / {mode} / {run}"
+                        result = run_scenario(label, mode, args, workdir, repos_api, projects_api)
+                        print_result(result)
+                        results.append(result)
+                finally:
+                    get_cache().close()
+                    shutil.rmtree(workdir, ignore_errors=True)
+        finally:
+            if projects_api:
+                projects_api.stop()
+
+    return results
+
+
+def parse_modes(value: str) -> List[str]:
+    modes = [mode.strip() for mode in value.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown mode(s) {', '.join(unknown)}; choose from {', '.join(MODES)}"
+        )
+    return modes
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark the projects pipeline offline")
+    parser.add_argument("--target", choices=("main", "update_latest"), default="main")
+    parser.add_argument("--repos", type=int, default=40, help="Synthetic repos to serve")
+    parser.add_argument(
+        "--modes",
+        type=parse_modes,
+        default=list(MODES),
+        help=f"Comma-separated pipeline modes to run ({', '.join(MODES)})",
+    )
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake model seconds per call")
+    parser.add_argument(
+        "--rate-limit-every",
+        type=int,
+        default=0,
+        help="Fail every Nth model request with a simulated 429 (0 = never)",
+    )
+    parser.add_argument(
+        "--invalid-item-rate",
+        type=float,
+        default=0.0,
+        help="Share of batched reply entries the fake model drops, to exercise bisection",
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="Workers for the concurrent mode")
+    parser.add_argument(
+        "--batch-tokens",
+        type=int,
+        default=batch_analyzer.DEFAULT_BATCH_TOKEN_BUDGET,
+        help="Repo tokens per request in batch mode",
+    )
+    parser.add_argument("--rpm", type=float, default=15, help="Model requests per minute budget")
+    parser.add_argument("--tpm", type=float, default=1_000_000, help="Model tokens per minute budget")
+    parser.add_argument(
+        "--sleep-scale",
+        type=float,
+        default=0.0,
+        help="Fraction of each requested sleep to actually wait (0 = record only)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Disable the LLM result cache")
+    parser.add_argument(
+        "--warm", action="store_true", help="Repeat each mode against its now-populated cache"
+    )
+    parser.add_argument("--readme-budget", type=int, default=DEFAULT_README_TOKEN_BUDGET)
+    parser.add_argument("--no-compact", action="store_true")
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Analyze near-identical synthetic repos once per cluster (main target only)",
+    )
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own output")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results saved to '{args.json}'")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,291 @@
+import argparse
+from typing import Tuple
+from llm import (
+    BACKENDS,
+    DEFAULT_BATCH_TOKEN_BUDGET,
+    DEFAULT_MAX_BATCH_SIZE,
+    SINGLE_FLIGHT_BACKENDS,
+    backend_name,
+    configure_backend,
+)
+from dedupe import DEFAULT_SIMILARITY_THRESHOLD
+from http_cache import configure_http_cache
+from llm_cache import configure_cache
+from prompt_builder import DEFAULT_STAGE_BUDGETS, PROMPT_FIELDS, configure_stage_budgets
+from readme_compactor import DEFAULT_README_TOKEN_BUDGET
+from run_config import RunConfig
+from scheduler import DEFAULT_PRIORITY_WEIGHTS, PRIORITY_SIGNALS, DailyQuota
+from snapshot import SNAPSHOT_DIR
+from tracing import DEFAULT_TRACE_PATH, configure_tracing
+
+
+def add_concurrency_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the async pipeline and offline model flags shared by the CLIs"""
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=0,
+        help="Process this many projects at once with the async pipeline (0 = sequential)",
+    )
+    parser.add_argument(
+        "--rpm", type=float, default=15, help="Model requests per minute budget"
+    )
+    parser.add_argument(
+        "--tpm", type=float, default=1_000_000, help="Model tokens per minute budget"
+    )
+    parser.add_argument(
+        "--fake-llm",
+        action="store_true",
+        help="Use a deterministic local fake model instead of Gemini",
+    )
+    parser.add_argument(
+        "--fake-latency",
+        type=float,
+        default=0.5,
+        help="Simulated seconds per call for --fake-llm",
+    )
+
+
+def add_backend_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the flags that pick which model backend the stages call"""
+    parser.add_argument(
+        "--backend",
+        choices=list(BACKENDS),
+        help="Model backend (default: $LLM_BACKEND or gemini): "
+        + "; ".join(f"{name} = {backend.description}" for name, backend in BACKENDS.items()),
+    )
+    parser.add_argument(
+        "--model",
+        help="Model for the backend, e.g. a GGUF path for llama-cpp (default: $LLM_MODEL)",
+    )
+
+
+def configure_backend_from_args(args: argparse.Namespace) -> None:
+    import dotenv
+
+    # LLM_BACKEND / LLM_MODEL may come from .env like GOOGLE_API_KEY does
+    dotenv.load_dotenv()
+    try:
+        configure_backend(args.backend, args.model)
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+    if backend_name() in SINGLE_FLIGHT_BACKENDS:
+        print(
+            f"🦙 {backend_name()} generates one reply at a time; for concurrent requests "
+            "run llama-server --parallel N and use --backend llama-server"
+        )
+
+
+def add_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the LLM result and HTTP cache flags shared by the CLIs"""
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Neither read nor write the LLM result cache in ./data",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached LLM results but store the fresh ones",
+    )
+    parser.add_argument(
+        "--cache-ttl-days",
+        type=float,
+        default=30,
+        help="Treat cached LLM results older than this as stale",
+    )
+    parser.add_argument(
+        "--no-http-cache",
+        action="store_true",
+        help="Download the full repo listing instead of revalidating it with ETags",
+    )
+
+
+def configure_cache_from_args(args: argparse.Namespace) -> None:
+    configure_cache(
+        enabled=not args.no_cache,
+        refresh=args.refresh,
+        ttl_seconds=args.cache_ttl_days * 24 * 60 * 60,
+    )
+    configure_http_cache(enabled=not args.no_http_cache)
+
+
+def add_compaction_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the README compaction flags shared by the CLIs"""
+    parser.add_argument(
+        "--readme-budget",
+        type=int,
+        default=DEFAULT_README_TOKEN_BUDGET,
+        help="Cap each compacted README at roughly this many tokens",
+    )
+    parser.add_argument(
+        "--no-compact",
+        action="store_true",
+        help="Send READMEs to the model verbatim instead of compacting them",
+    )
+    parser.add_argument(
+        "--stage-budget",
+        action="append",
+        type=stage_budget_arg,
+        default=[],
+        metavar="STAGE=TOKENS",
+        help="Cap one repo's data in a stage's prompt (stages: "
+        f"{', '.join(f'{stage}={tokens}' for stage, tokens in DEFAULT_STAGE_BUDGETS.items())}); "
+        "repeatable",
+    )
+
+
+def stage_budget_arg(value: str) -> Tuple[str, int]:
+    stage, _, tokens = value.partition("=")
+    if stage not in PROMPT_FIELDS or not tokens.isdigit() or int(tokens) <= 0:
+        raise argparse.ArgumentTypeError(
+            f"expected STAGE=TOKENS with STAGE one of {', '.join(PROMPT_FIELDS)}"
+        )
+    return stage, int(tokens)
+
+
+def configure_stage_budgets_from_args(args: argparse.Namespace) -> None:
+    configure_stage_budgets(dict(args.stage_budget))
+
+
+def add_batch_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the batched analysis flags shared by the CLIs"""
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Analyze several repos per model request, falling back per repo on failure",
+    )
+    parser.add_argument(
+        "--batch-tokens",
+        type=int,
+        default=DEFAULT_BATCH_TOKEN_BUDGET,
+        help="Approximate repo tokens packed into one batched request",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_MAX_BATCH_SIZE,
+        help="Most repos packed into one batched request",
+    )
+
+
+def add_dedupe_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the near-duplicate README flags"""
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Analyze near-identical repos (forks, template copies) once and "
+        "reuse the result for the rest of their cluster",
+    )
+    parser.add_argument(
+        "--dedupe-threshold",
+        type=float,
+        default=DEFAULT_SIMILARITY_THRESHOLD,
+        help="Estimated README similarity (0-1) at which repos count as duplicates",
+    )
+
+
+def add_schedule_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the quota-aware priority scheduling flags"""
+    parser.add_argument(
+        "--rpd",
+        type=float,
+        default=0,
+        help="Model requests per day budget, counted across runs in data/quota.json "
+        "(0 = unlimited); repos that do not fit are deferred, least important first",
+    )
+    parser.add_argument(
+        "--tpd", type=float, default=0, help="Model tokens per day budget (0 = unlimited)"
+    )
+    parser.add_argument(
+        "--priority",
+        action="append",
+        type=priority_weight_arg,
+        default=[],
+        metavar="SIGNAL=WEIGHT",
+        help="Weight of one repo ranking signal (signals: "
+        f"{', '.join(f'{signal}={weight:g}' for signal, weight in DEFAULT_PRIORITY_WEIGHTS.items())}); "
+        "repeatable, and enables priority order without a daily budget",
+    )
+
+
+def priority_weight_arg(value: str) -> Tuple[str, float]:
+    signal, _, weight = value.partition("=")
+    try:
+        if signal in PRIORITY_SIGNALS:
+            return signal, float(weight)
+    except ValueError:
+        pass
+    raise argparse.ArgumentTypeError(
+        f"expected SIGNAL=WEIGHT with SIGNAL one of {', '.join(PRIORITY_SIGNALS)}"
+    )
+
+
+def add_snapshot_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the precompressed projects snapshot flags shared by the CLIs"""
+    parser.add_argument(
+        "--snapshot-dir",
+        default=SNAPSHOT_DIR,
+        help="Write the content-hashed, gzip/brotli projects snapshot here "
+        "(default: $PROJECTS_SNAPSHOT_DIR or ../public/snapshots, where the site's "
+        "snapshot route reads it)",
+    )
+    parser.add_argument(
+        "--no-snapshot", action="store_true", help="Do not write the projects snapshot"
+    )
+
+
+def add_dry_run_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the flag that fetches and plans a run without the model"""
+    parser.add_argument(
+        "--dry-run",
+        "--fetch-only",
+        dest="dry_run",
+        action="store_true",
+        help="Fetch and classify repos and report what would be analyzed, "
+        "without loading the model or writing anything",
+    )
+
+
+def add_tracing_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the span tracing flags shared by the CLIs"""
+    parser.add_argument(
+        "--trace",
+        default=DEFAULT_TRACE_PATH,
+        help="Append one JSON line per fetch, AI stage and API push to this file",
+    )
+    parser.add_argument(
+        "--no-trace",
+        action="store_true",
+        help="Only print the per-run timing summary, without writing trace lines",
+    )
+
+
+def configure_tracing_from_args(args: argparse.Namespace) -> None:
+    # A dry run writes nothing, trace lines included
+    configure_tracing(None if args.no_trace or args.dry_run else args.trace)
+
+
+def run_config_from_args(args: argparse.Namespace) -> RunConfig:
+    """The RunConfig a CLI's flags describe; options it has no flags for keep their defaults"""
+    defaults = vars(RunConfig())
+    flags = vars(args)
+    scheduled = bool(flags.get("rpd") or flags.get("tpd") or flags.get("priority"))
+    return RunConfig(
+        fused=not args.sequential,
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        incremental=args.incremental,
+        readme_budget=None if args.no_compact else args.readme_budget,
+        output_format=flags.get("format", defaults["output_format"]),
+        batch=args.batch,
+        batch_tokens=args.batch_tokens,
+        batch_size=args.batch_size,
+        dedupe=flags.get("dedupe", defaults["dedupe"]),
+        dedupe_threshold=flags.get("dedupe_threshold", defaults["dedupe_threshold"]),
+        quota=DailyQuota(args.rpd, args.tpd) if scheduled else None,
+        priority_weights=dict(flags.get("priority") or {}),
+        snapshot=not args.no_snapshot,
+        snapshot_dir=args.snapshot_dir,
+    )
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Compare model backends on the labelled status fixtures.
+
+Runs the combined analysis for every fixture repo on each backend and reports
+status accuracy against the labels, agreement with the first (reference)
+backend, tech stack overlap, how many descriptions follow the 50-100 word
+plain-text rules, parse failures, latency, throughput and token usage.
+Usage: python compare_backends.py --backends gemini,llama-server
+       python compare_backends.py --backends gemini,llama-cpp --model llama-cpp=./qwen2.5-3b-q4.gguf
+"""
+
+import argparse
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from get_projects import Response
+from llm import BACKENDS, configure_backend
+from llm_cache import configure_cache
+from retry import call_with_retry
+from status_heuristics import STATUS_FIXTURES_PATH, load_status_fixtures
+from tracing import configure_tracing
+
+MARKUP_RE = re.compile(r"[#*_`<>]")
+
+
+def analyze_fixtures(
+    fixtures: List[Dict[str, Any]], concurrency: int
+) -> List[Optional[Response]]:
+    """Run the combined analysis on every fixture, None where it failed"""
+    from project_analyzer import gen_project_analysis
+
+    def analyze(fixture: Dict[str, Any]) -> Optional[Response]:
+        repo_data = Response.model_validate(
+            {key: value for key, value in fixture.items() if key != "label"}
+        )
+        try:
+            return call_with_retry("analysis", gen_project_analysis, repo_data)
+        except Exception as e:
+            print(f"  - {repo_data.title}: {type(e).__name__}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        return list(executor.map(analyze, fixtures))
+
+
+def follows_description_rules(description: str) -> bool:
+    words = len(description.split())
+    return 50 <= words <= 100 and not MARKUP_RE.search(description) and "\n" not in description
+
+
+def jaccard(a: List[str], b: List[str]) -> float:
+    a_set = {item.lower() for item in a}
+    b_set = {item.lower() for item in b}
+    return len(a_set & b_set) / len(a_set | b_set) if a_set | b_set else 1.0
+
+
+def score_backend(
+    fixtures: List[Dict[str, Any]],
+    results: List[Optional[Response]],
+    reference: Optional[List[Optional[Response]]],
+) -> Dict[str, Any]:
+    labelled = len(fixtures)
+    ok = correct = rule_following = 0
+    agree = compared = 0
+    overlaps = []
+    for i, (fixture, result) in enumerate(zip(fixtures, results)):
+        if result is None:
+            continue
+        ok += 1
+        correct += result.status == fixture["label"]
+        rule_following += follows_description_rules(result.description or "")
+        baseline = reference[i] if reference else None
+        if baseline is not None:
+            compared += 1
+            agree += result.status == baseline.status
+            overlaps.append(jaccard(result.languages or [], baseline.languages or []))
+
+    return {
+        "fixtures": labelled,
+        "parsed": ok,
+        "status_accuracy": round(correct / labelled, 3) if labelled else 0,
+        "description_rules": round(rule_following / ok, 3) if ok else None,
+        "status_agreement": round(agree / compared, 3) if compared else None,
+        "tech_overlap": round(sum(overlaps) / len(overlaps), 3) if overlaps else None,
+    }
+
+
+def compare_backends(
+    backends: List[str],
+    models: Dict[str, str],
+    fixtures_path: str = STATUS_FIXTURES_PATH,
+    concurrency: int = 4,
+) -> List[Dict[str, Any]]:
+    fixtures = load_status_fixtures(fixtures_path)
+    # Every backend answers every fixture; cached replies would hide latency
+    configure_cache(enabled=False)
+
+    rows = []
+    reference = None
+    for backend in backends:
+        print(f"🤖 {backend}: analyzing {len(fixtures)} fixtures...")
+        configure_backend(backend, models.get(backend))
+        tracer = configure_tracing(None)
+        start = time.perf_counter()
+        results = analyze_fixtures(fixtures, concurrency)
+        wall = time.perf_counter() - start
+
+        row = {"backend": backend, **score_backend(fixtures, results, reference)}
+        span = tracer.summary().get("analysis", {})
+        row.update(
+            {
+                "p50_ms": span.get("p50_ms"),
+                "p95_ms": span.get("p95_ms"),
+                "repos_per_min": round(len(fixtures) / wall * 60, 1) if wall else None,
+                "input_tokens": span.get("input_tokens", 0),
+                "output_tokens": span.get("output_tokens", 0),
+            }
+        )
+        rows.append(row)
+        if reference is None:
+            reference = results
+    return rows
+
+
+def print_rows(rows: List[Dict[str, Any]]) -> None:
+    def show(value: Any, percent: bool = False) -> str:
+        if value is None:
+            return "-"
+        return f"{100 * value:.0f}%" if percent else str(value)
+
+    print(
+        f"\n{'backend':<14} {'parsed':>7} {'status':>7} {'agree':>6} {'tech':>6} "
+        f"{'desc ok':>8} {'p50 ms':>8} {'p95 ms':>8} {'repos/min':>10} {'tok in':>8} {'tok out':>8}"
+    )
+    for row in rows:
+        print(
+            f"{row['backend']:<14} {row['parsed']:>3}/{row['fixtures']:<3} "
+            f"{show(row['status_accuracy'], True):>7} {show(row['status_agreement'], True):>6} "
+            f"{show(row['tech_overlap'], True):>6} {show(row['description_rules'], True):>8} "
+            f"{show(row['p50_ms']):>8} {show(row['p95_ms']):>8} {show(row['repos_per_min']):>10} "
+            f"{row['input_tokens']:>8} {row['output_tokens']:>8}"
+        )
+    print("agree/tech are measured against the first backend; status against the labels")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Compare output quality and speed of model backends")
+    parser.add_argument(
+        "--backends",
+        default="gemini",
+        help=f"Comma-separated backends, the first is the reference ({', '.join(BACKENDS)})",
+    )
+    parser.add_argument(
+        "--model",
+        action="append",
+        default=[],
+        metavar="BACKEND=MODEL",
+        help="Model for one backend, e.g. llama-cpp=./model.gguf; repeatable",
+    )
+    parser.add_argument("--fixtures", default=STATUS_FIXTURES_PATH)
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="Fixtures analyzed at once per backend"
+    )
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    backends = [backend.strip() for backend in args.backends.split(",") if backend.strip()]
+    unknown = [backend for backend in backends if backend not in BACKENDS]
+    if unknown:
+        parser.error(f"unknown backend(s) {', '.join(unknown)}")
+    models = dict(value.split("=", 1) for value in args.model if "=" in value)
+
+    import dotenv
+
+    dotenv.load_dotenv()
+    rows = compare_backends(backends, models, args.fixtures, args.concurrency)
+    print_rows(rows)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        print(f"\n📄 Results saved to '{args.json}'")
+
+
+if __name__ == "__main__":
+    main_cli()
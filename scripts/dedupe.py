@@ -0,0 +1,136 @@
+import hashlib
+import heapq
+import re
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+from get_projects import Response
+from status_heuristics import classify_status
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.85
+
+# Bottom-k MinHash: the k smallest shingle hashes estimate Jaccard similarity
+SKETCH_SIZE = 128
+SHINGLE_WORDS = 5
+# READMEs with fewer shingles (e.g. empty or one-line) never count as duplicates
+MIN_SHINGLES = 10
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+class DuplicateCluster(NamedTuple):
+    representative: str
+    members: List[str]
+    # Lowest estimated similarity between a member and the representative
+    similarity: float
+
+
+def readme_sketch(
+    readme: str, title: str = "", size: int = SKETCH_SIZE
+) -> Optional[FrozenSet[int]]:
+    """MinHash sketch of a README's word shingles, or None if it is too short.
+
+    The repo's own name is left out, so a renamed copy still matches.
+    """
+    text = readme.lower()
+    if title:
+        text = text.replace(title.lower(), " ")
+    words = WORD_RE.findall(text)
+    shingles = {
+        " ".join(words[i : i + SHINGLE_WORDS])
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    }
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    hashes = (
+        int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+        for shingle in shingles
+    )
+    return frozenset(heapq.nsmallest(size, hashes))
+
+
+def estimate_similarity(
+    a: FrozenSet[int], b: FrozenSet[int], size: int = SKETCH_SIZE
+) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two sketches"""
+    smallest = heapq.nsmallest(size, a | b)
+    return sum(1 for value in smallest if value in a and value in b) / len(smallest)
+
+
+def find_duplicates(
+    projects: List[Response], threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+) -> List[DuplicateCluster]:
+    """Group repos whose READMEs are near-identical, e.g. forks and template copies.
+
+    Repos are scanned in listing order and each joins the first earlier
+    representative it is at least threshold-similar to, so every member is
+    close to its own representative rather than merely to some other member.
+    Only clusters with at least one member are returned.
+    """
+    representatives: List[Tuple[str, FrozenSet[int]]] = []
+    clusters: Dict[str, DuplicateCluster] = {}
+
+    for project in projects:
+        sketch = readme_sketch(project.readme or "", project.title)
+        if sketch is None:
+            continue
+        for title, representative_sketch in representatives:
+            similarity = estimate_similarity(sketch, representative_sketch)
+            if similarity >= threshold:
+                cluster = clusters.get(title) or DuplicateCluster(title, [], 1.0)
+                cluster.members.append(project.title)
+                clusters[title] = cluster._replace(
+                    similarity=min(cluster.similarity, similarity)
+                )
+                break
+        else:
+            representatives.append((project.title, sketch))
+
+    return list(clusters.values())
+
+
+def duplicate_map(clusters: List[DuplicateCluster]) -> Dict[str, str]:
+    """Member title -> representative title"""
+    return {
+        member: cluster.representative
+        for cluster in clusters
+        for member in cluster.members
+    }
+
+
+def adapt_analysis(representative: Response, member: Response) -> Response:
+    """Give a duplicate repo the AI results of its cluster representative.
+
+    The description is copied with the representative's name swapped for
+    the member's, the tech stack keeps any GitHub languages only the member
+    has, and the status comes from the member's own signals when the local
+    heuristic is confident, since a fork can be at a different stage.
+    """
+    description = representative.description or member.description
+    if description:
+        description = description.replace(representative.title, member.title)
+
+    languages = list(representative.languages or [])
+    known = {language.lower() for language in languages}
+    languages += [
+        language for language in member.languages or [] if language.lower() not in known
+    ]
+
+    status = classify_status(member).status or representative.status
+    return member.model_copy(
+        update={"description": description, "languages": languages, "status": status}
+    )
+
+
+def print_dedupe_report(
+    clusters: List[DuplicateCluster], reused: int, calls_per_repo: int = 1
+) -> None:
+    """List the clusters and the model calls saved by the reused analyses"""
+    print("Near-duplicate repos (analyzed once per cluster):")
+    for cluster in clusters:
+        print(
+            f"  - {cluster.representative} <- {', '.join(cluster.members)} "
+            f"(similarity >= {cluster.similarity:.2f})"
+        )
+    print(
+        f"  Total: {reused} repos reuse another's analysis, "
+        f"saving ~{reused * calls_per_repo} model calls"
+    )
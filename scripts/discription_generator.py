@@ -1,10 +1,9 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from get_projects import Response
-import dotenv
-import os
-
-dotenv.load_dotenv()
+from llm import get_model, model_id
+from llm_cache import cache_key, get_cache
+from tracing import current_span
+from prompt_builder import build_payload, estimate_prompt_tokens
 
 desc_sys_prompt = """
 You are a technical writing assistant.
@@ -46,25 +45,48 @@ desc_templet = ChatPromptTemplate.from_messages(
     ]
 )
 
-google_api_key = os.getenv("GOOGLE_API_KEY")
-
-model = ChatGoogleGenerativeAI(
-    model="gemini-2.0-flash",
-    temperature=0.2,
-    google_api_key=google_api_key,
-)
-
+TEMPERATURE = 0.2
 
-def gen_desc(repo_data: Response):
-    json_repo_data = repo_data.model_dump_json()
 
-    chain = desc_templet | model
-    res = chain.invoke({"repo_data": json_repo_data})
+def apply_desc(repo_data: Response, content: str) -> Response:
+    repo_data.description = content.strip()
+    return repo_data
 
-    print(res.content)
 
-    repo_data.description = res.content.strip()
-    return repo_data
+def gen_desc(repo_data: Response):
+    json_repo_data = build_payload(repo_data, "desc").text
+
+    key = cache_key("desc", desc_templet, model_id(), json_repo_data)
+    content = get_cache().get(key)
+    span = current_span()
+    span.set(title=repo_data.title, cache="miss" if content is None else "hit")
+    if content is None:
+        chain = desc_templet | get_model(TEMPERATURE)
+        estimate_prompt_tokens(desc_templet, repo_data=json_repo_data)
+        res = chain.invoke({"repo_data": json_repo_data})
+        span.record_usage(res)
+        content = res.content
+        get_cache().set(key, "desc", content)
+
+    return apply_desc(repo_data, content)
+
+
+async def agen_desc(repo_data: Response):
+    json_repo_data = build_payload(repo_data, "desc").text
+
+    key = cache_key("desc", desc_templet, model_id(), json_repo_data)
+    content = get_cache().get(key)
+    span = current_span()
+    span.set(title=repo_data.title, cache="miss" if content is None else "hit")
+    if content is None:
+        chain = desc_templet | get_model(TEMPERATURE)
+        estimate_prompt_tokens(desc_templet, repo_data=json_repo_data)
+        res = await chain.ainvoke({"repo_data": json_repo_data})
+        span.record_usage(res)
+        content = res.content
+        get_cache().set(key, "desc", content)
+
+    return apply_desc(repo_data, content)
 
 
 if __name__ == "__main__":
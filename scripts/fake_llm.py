@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, List, Optional
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from llm import use_model
+from tokens import estimate_tokens
+
+# Captured at import so benchmarks can patch time.sleep / asyncio.sleep to
+# account for pipeline waits without counting simulated model latency
+_sleep = time.sleep
+_asleep = asyncio.sleep
+
+
+class ResourceExhausted(Exception):
+    """Shaped like google.api_core.exceptions.ResourceExhausted"""
+
+    code = 429
+
+
+class FakeChatModel(BaseChatModel):
+    """Deterministic offline stand-in for the Gemini chat model.
+
+    The reply is derived from a hash of the prompt so repeated runs produce the
+    same output, and the shape follows whichever analyzer prompt was sent.
+    With rate_limit_every set, every Nth request fails like a Gemini 429;
+    invalid_item_rate drops that share of the entries in a batched reply.
+    """
+
+    latency: float = 0.0
+    rate_limit_every: int = 0
+    invalid_item_rate: float = 0.0
+    requests: int = 0
+    rate_limited: int = 0
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        system = str(messages[0].content) if messages else ""
+        prompt = "".join(str(message.content) for message in messages)
+        digest = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16)
+        status = "cwp"[digest % 3]
+        technologies = ["Python", "React", "Docker", "PostgreSQL", "FastAPI"]
+        technologies = technologies[: 1 + digest % len(technologies)]
+        description = (
+            "A deterministic placeholder description generated offline so the "
+            "pipeline can be exercised without calling the real model."
+        )
+
+        if "JSON instance" in system and '"analyses"' in system:
+            return self._batch_reply(messages[-1], description)
+        if "JSON instance" in system:
+            return json.dumps(
+                {
+                    "description": description,
+                    "status": status,
+                    "technologies": technologies,
+                }
+            )
+        if "single character" in system:
+            return status
+        if "comma-separated" in system:
+            return ", ".join(technologies)
+        return description
+
+    def _batch_reply(self, human: BaseMessage, description: str) -> str:
+        text = str(human.content)
+        repos, _ = json.JSONDecoder().raw_decode(text, text.index("["))
+        analyses = []
+        for repo in repos:
+            item_digest = int(
+                hashlib.sha256((repo["key"] + text).encode("utf-8")).hexdigest(), 16
+            )
+            if item_digest % 1000 < self.invalid_item_rate * 1000:
+                continue
+            technologies = ["Python", "React", "Docker", "PostgreSQL", "FastAPI"]
+            analyses.append(
+                {
+                    "key": repo["key"],
+                    "description": description,
+                    "status": "cwp"[item_digest % 3],
+                    "technologies": technologies[: 1 + item_digest % len(technologies)],
+                }
+            )
+        return json.dumps({"analyses": analyses})
+
+    def _check_rate_limit(self) -> None:
+        self.requests += 1
+        if self.rate_limit_every and self.requests % self.rate_limit_every == 0:
+            self.rate_limited += 1
+            raise ResourceExhausted("429 Resource has been exhausted (simulated quota)")
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        content = self._reply(messages)
+        prompt_tokens = sum(estimate_tokens(str(m.content)) for m in messages)
+        completion_tokens = estimate_tokens(content)
+
+        self.calls += 1
+        self.input_tokens += prompt_tokens
+        self.output_tokens += completion_tokens
+
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self._check_rate_limit()
+        if self.latency:
+            _sleep(self.latency)
+        return self._result(messages)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self._check_rate_limit()
+        if self.latency:
+            await _asleep(self.latency)
+        return self._result(messages)
+
+
+def install_fake_model(
+    latency: float = 0.0, rate_limit_every: int = 0, invalid_item_rate: float = 0.0
+) -> FakeChatModel:
+    """Route every analyzer's model through llm.get_model to a shared fake"""
+    fake = FakeChatModel(
+        latency=latency,
+        rate_limit_every=rate_limit_every,
+        invalid_item_rate=invalid_item_rate,
+    )
+    use_model(fake)
+    return fake
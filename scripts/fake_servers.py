@@ -0,0 +1,371 @@
+"""
+Local stand-ins for the HTTP services the scripts talk to, for offline tests
+and benchmarks. Each server runs on an ephemeral localhost port in a
+background thread and counts the requests and connections it receives.
+"""
+
+import base64
+import hashlib
+import json
+import re
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive so pooled clients reuse them
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def count_request(self) -> None:
+        with self.server.lock:
+            self.server.requests += 1
+
+    def read_json(self) -> Any:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"null")
+
+    def send_json(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeServer:
+    """Serve a handler class on localhost until stopped"""
+
+    def __init__(self, handler_class: type, **state: Any):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+        self.httpd.daemon_threads = True
+        self.httpd.lock = threading.Lock()
+        self.httpd.requests = 0
+        self.httpd.connections = 0
+        for key, value in state.items():
+            setattr(self.httpd, key, value)
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> int:
+        return self.httpd.requests
+
+    @property
+    def connections(self) -> int:
+        return self.httpd.connections
+
+    def start(self) -> "FakeServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FakeServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class ProjectsApiHandler(CountingHandler):
+    """Mimics POST /api/projects (insertOne) and POST /api/projects/bulk (upsert)"""
+
+    def do_POST(self):
+        self.count_request()
+        payload = self.read_json()
+        documents: List[Dict[str, Any]] = self.server.documents
+
+        if self.path == "/api/projects":
+            with self.server.lock:
+                documents.append(payload)
+            self.send_json(201, payload)
+        elif self.path == "/api/projects/bulk":
+            matched = upserted = 0
+            with self.server.lock:
+                by_link = {doc.get("githubLink"): doc for doc in documents}
+                for project in payload.get("projects", []):
+                    existing = by_link.get(project.get("githubLink"))
+                    if existing is None:
+                        documents.append(dict(project))
+                        by_link[project.get("githubLink")] = documents[-1]
+                        upserted += 1
+                    else:
+                        existing.update(project)
+                        matched += 1
+            self.send_json(
+                200,
+                {"success": True, "matched": matched, "modified": matched, "upserted": upserted},
+            )
+        else:
+            self.send_json(404, {"error": "Not found"})
+
+
+def fake_projects_api() -> FakeServer:
+    return FakeServer(ProjectsApiHandler, documents=[])
+
+
+SYNTHETIC_README_TEMPLATES = (
+    """# {title}
+
+[![Build](https://img.shields.io/badge/build-passing-green.svg)](#)
+
+<div align="center"><img src="./banner.png" width="200"/></div>
+
+A web application for {topic}.
+
+## Live Demo
+
+[Open the app](https://{title}.vercel.app)
+
+## Tech Stack
+
+- **Frontend:** Next.js, React, Tailwind CSS
+- **Backend:** FastAPI, PostgreSQL, Docker
+
+## Installation
+
+```sh
+git clone https://github.com/example/{title}.git
+cd {title} && npm install
+```
+
+## License
+
+MIT
+""",
+    """# {title}
+
+This project is currently under development.
+
+## TODO
+- [ ] Add authentication
+- [ ] Write tests
+- [x] Set up {topic} data pipeline
+
+Built with Python and pandas.
+""",
+    """# {title}
+
+Planning to build a tool for {topic}. Coming soon!
+""",
+    """# {title}
+
+A command line utility for {topic}, written in Go with a small Redis cache.
+Contributions welcome.
+
+## Usage
+
+```
+{title} --help
+```
+""",
+)
+SYNTHETIC_TOPICS = ("resume parsing", "weather alerts", "expense tracking", "music tagging")
+
+
+def synthetic_repo(index: int) -> Dict[str, Any]:
+    """A deterministic raw repo entry in the github-stats API format"""
+    variant = index % len(SYNTHETIC_README_TEMPLATES)
+    title = f"synthetic-repo-{index}"
+    readme = SYNTHETIC_README_TEMPLATES[variant].format(
+        title=title, topic=SYNTHETIC_TOPICS[index % len(SYNTHETIC_TOPICS)]
+    )
+    return {
+        "title": title,
+        "description": None,
+        "live_website_url": f"https://{title}.vercel.app" if variant == 0 else None,
+        "languages": [["TypeScript", "Python"], ["Python"], [], ["Go"]][variant],
+        "num_commits": [150, 40, 2, 25][variant] + index % 7,
+        "readme": base64.b64encode(readme.encode("utf-8")).decode("ascii"),
+    }
+
+
+class ReposApiHandler(CountingHandler):
+    """Mimics GET /<username>/repos on github-stats.tashif.codes, with optional paging and ETags"""
+
+    def do_GET(self):
+        self.count_request()
+        url = urlparse(self.path)
+        if not url.path.endswith("/repos"):
+            self.send_json(404, {"error": "Not found"})
+            return
+
+        repos = self.server.repos
+        query = parse_qs(url.query)
+        if "per_page" in query:
+            per_page = int(query["per_page"][0])
+            page = int(query.get("page", ["1"])[0])
+            repos = repos[(page - 1) * per_page : page * per_page]
+
+        body = json.dumps(repos).encode("utf-8")
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            with self.server.lock:
+                self.server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def fake_repos_api(num_repos: int = 100) -> FakeServer:
+    return FakeServer(
+        ReposApiHandler,
+        repos=[synthetic_repo(i) for i in range(num_repos)],
+        not_modified=0,
+    )
+
+
+SYNTHETIC_LANGUAGES = ("Python", "TypeScript", "JavaScript", "Go", "HTML", "CSS", "Jupyter Notebook")
+
+
+def synthetic_languages(index: int) -> Dict[str, int]:
+    """Deterministic GitHub-style {language: bytes} for repo number index"""
+    count = 1 + index % 4
+    return {
+        SYNTHETIC_LANGUAGES[(index + i) % len(SYNTHETIC_LANGUAGES)]: 1000 * (index % 7 + 1) * (i + 1)
+        for i in range(count)
+    }
+
+
+def synthetic_contribution_days(year: int, until: date) -> List[Dict[str, Any]]:
+    """A year of contribution days with regular gaps, ending at until"""
+    days = []
+    day = date(year, 1, 1)
+    while day.year == year and day <= until:
+        ordinal = day.toordinal()
+        # Every day contributes except for a short gap every few weeks
+        count = 0 if ordinal % 23 in (0, 1) else 1 + ordinal % 5
+        days.append({"contributionCount": count, "date": day.isoformat()})
+        day += timedelta(days=1)
+    return days
+
+
+class GithubApiHandler(CountingHandler):
+    """The slice of the GitHub REST and GraphQL APIs github_stats.py uses"""
+
+    def do_GET(self):
+        self.count_request()
+        time.sleep(self.server.latency)
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+
+        if len(parts) == 3 and parts[0] == "users" and parts[2] == "repos":
+            query = parse_qs(url.query)
+            per_page = int(query.get("per_page", ["30"])[0])
+            page = int(query.get("page", ["1"])[0])
+            host, port = self.server.server_address[:2]
+            repos = [
+                {
+                    "name": f"synthetic-repo-{i}",
+                    "fork": False,
+                    "languages_url": f"http://{host}:{port}/repos/{parts[1]}/synthetic-repo-{i}/languages",
+                }
+                for i in range(self.server.num_repos)
+            ]
+            self.send_json(200, repos[(page - 1) * per_page : page * per_page])
+        elif len(parts) == 4 and parts[0] == "repos" and parts[3] == "languages":
+            index = int(parts[2].rsplit("-", 1)[-1])
+            self.send_json(200, synthetic_languages(index))
+        else:
+            self.send_json(404, {"message": "Not Found"})
+
+    def do_POST(self):
+        self.count_request()
+        time.sleep(self.server.latency)
+        if self.path != "/graphql":
+            self.send_json(404, {"message": "Not Found"})
+            return
+
+        query = self.read_json()["query"]
+        year = int(re.search(r'from: "(\d{4})', query).group(1))
+        days = synthetic_contribution_days(year, self.server.today)
+        weeks = [{"contributionDays": days[i : i + 7]} for i in range(0, len(days), 7)]
+        self.send_json(
+            200,
+            {
+                "data": {
+                    "user": {
+                        "createdAt": f"{self.server.created_year}-03-01T00:00:00Z",
+                        "contributionsCollection": {
+                            "contributionYears": list(
+                                range(self.server.today.year, self.server.created_year - 1, -1)
+                            ),
+                            "contributionCalendar": {"weeks": weeks},
+                        },
+                    }
+                }
+            },
+        )
+
+
+def fake_github_api(
+    num_repos: int = 100, latency: float = 0.0, created_year: int = 2021
+) -> FakeServer:
+    return FakeServer(
+        GithubApiHandler,
+        num_repos=num_repos,
+        latency=latency,
+        created_year=created_year,
+        today=date.today(),
+    )
+
+
+if __name__ == "__main__":
+    from update_latest import (
+        add_project_to_mongodb,
+        bulk_upsert_projects,
+        create_api_session,
+    )
+
+    projects = [
+        {
+            "position": i,
+            "title": f"project-{i}",
+            "description": "",
+            "technologies": [],
+            "githubLink": f"https://github.com/tashifkhan/project-{i}",
+            "liveLink": "",
+            "status": "Completed",
+        }
+        for i in range(50)
+    ]
+
+    for name in ("per-project POST", "bulk upsert"):
+        with fake_projects_api() as server:
+            session = create_api_session()
+            for _ in range(2):  # a re-run should update, not duplicate
+                if name == "bulk upsert":
+                    bulk_upsert_projects(projects, server.url, session)
+                else:
+                    for project in projects:
+                        add_project_to_mongodb(project, server.url, session)
+            print(
+                f"{name}: {server.requests} requests, {server.connections} connections, "
+                f"{len(server.httpd.documents)} documents after two runs"
+            )
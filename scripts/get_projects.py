@@ -1,8 +1,18 @@
+import codecs
 import json
-from typing import List, Optional
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 from pydantic import BaseModel
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import base64
+from http_cache import get_http_cache
+from tracing import get_tracer
+
+GITHUB_STATS_API = os.getenv("GITHUB_STATS_API", "https://github-stats.tashif.codes")
+DEFAULT_GITHUB_USERNAME = "tashifkhan"
 
 
 class Response(BaseModel):
@@ -17,40 +27,199 @@ class Response(BaseModel):
     )
 
 
-def get_projects(github_username: str) -> List[Response]:
-    res = requests.get(f"https://github-stats.tashif.codes/{github_username}/repos")
+def create_session(
+    retries: int = 3,
+    backoff_factor: float = 0.5,
+    pool_size: int = 10,
+    retry_methods: tuple = ("GET", "HEAD"),
+) -> requests.Session:
+    """Build a keep-alive session that retries transient failures with backoff"""
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=retry_methods,
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
-    if res.status_code != 200:
-        raise Exception(
-            f"Failed to fetch projects for {github_username}. Status code: {res.status_code}"
-        )
 
-    projects = res.json()
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array as its bytes arrive"""
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    started = False
 
-    for project in projects:
-        if "readme" in project and project["readme"] is not None:
+    for chunk in chunks:
+        buffer += utf8.decode(chunk)
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array of projects")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
             try:
-                project["readme"] = base64.b64decode(project["readme"]).decode("utf-8")
-            except Exception:
-                project["readme"] = ""
-
-    # Convert to Response objects
-    response_objects = []
-    for project in projects:
-        response_obj = Response(
-            title=project.get("title", "Unknown Project"),
-            description=project.get("description"),
-            live_website_url=project.get("live_website_url"),
-            languages=project.get("languages", []),
-            num_commits=project.get("num_commits", 0),
-            readme=project.get("readme"),
-            status=project.get("status"),
-        )
-        response_objects.append(response_obj)
-
-    return response_objects
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The current item is still downloading
+                break
+            yield item
+        buffer = buffer[pos:]
+
+    raise ValueError("Truncated JSON array of projects")
+
+
+def timed_chunks(chunks: Iterator[bytes], usage: Dict[str, float]) -> Iterator[bytes]:
+    """Pass chunks through, adding their size and the time spent waiting to usage"""
+    while True:
+        start = time.perf_counter()
+        chunk = next(chunks, None)
+        usage["seconds"] += time.perf_counter() - start
+        if chunk is None:
+            return
+        usage["bytes"] += len(chunk)
+        yield chunk
+
+
+def to_response(project: Dict[str, Any]) -> Response:
+    """Decode one raw repo entry, including its base64 README"""
+    readme = project.get("readme")
+    if readme is not None:
+        try:
+            readme = base64.b64decode(readme).decode("utf-8")
+        except Exception:
+            readme = ""
+
+    return Response(
+        title=project.get("title", "Unknown Project"),
+        description=project.get("description"),
+        live_website_url=project.get("live_website_url"),
+        languages=project.get("languages", []),
+        num_commits=project.get("num_commits", 0),
+        readme=readme,
+        status=project.get("status"),
+    )
+
+
+def iter_projects(
+    github_username: str,
+    session: Optional[requests.Session] = None,
+    per_page: Optional[int] = None,
+    timeout: tuple = (10, 120),
+    chunk_size: int = 64 * 1024,
+) -> Iterator[Response]:
+    """Stream projects one at a time as the repo listing downloads.
+
+    With per_page set, pages are requested until a short or repeated page
+    comes back; otherwise the whole listing is streamed from one request.
+    Each request is conditional on the HTTP cache's stored validators, and
+    a 304 replays the projects parsed from the last full response.
+    """
+    session = session or create_session()
+    http_cache = get_http_cache()
+    url = f"{GITHUB_STATS_API}/{github_username}/repos"
+    page = 1
+    previous_first_title = None
+
+    while True:
+        params = {"page": page, "per_page": per_page} if per_page else None
+        cache_url = requests.Request("GET", url, params=params).prepare().url
+        cached = http_cache.get(cache_url)
+        # Only time spent waiting on the network counts toward the fetch span,
+        # not the processing the caller does between streamed repos
+        usage = {"seconds": 0.0, "bytes": 0}
+        count = 0
+        not_modified = False
+        start = time.perf_counter()
+        try:
+            with session.get(
+                url,
+                params=params,
+                headers=http_cache.conditional_headers(cached),
+                stream=True,
+                timeout=timeout,
+            ) as res:
+                usage["seconds"] += time.perf_counter() - start
+                if res.status_code == 304 and cached is not None:
+                    not_modified = True
+                    http_cache.mark_revalidated()
+                    projects = (
+                        Response.model_validate(project)
+                        for project in json.loads(cached.body)
+                    )
+                elif res.status_code == 200:
+                    chunks = timed_chunks(res.iter_content(chunk_size), usage)
+                    projects = (to_response(raw) for raw in iter_json_array(chunks))
+                else:
+                    raise Exception(
+                        f"Failed to fetch projects for {github_username}. Status code: {res.status_code}"
+                    )
+
+                downloaded = []
+                for project in projects:
+                    if count == 0:
+                        if project.title == previous_first_title:
+                            return
+                        previous_first_title = project.title
+                    count += 1
+                    if not not_modified:
+                        # Dumped before the caller gets to compact or analyze it
+                        downloaded.append(project.model_dump())
+                    yield project
+
+                if not not_modified:
+                    http_cache.set(cache_url, res.headers, json.dumps(downloaded))
+        finally:
+            get_tracer().record(
+                "fetch",
+                usage["seconds"],
+                bytes=usage["bytes"],
+                repos=count,
+                page=page,
+                cache="hit" if not_modified else "miss",
+            )
+
+        if not per_page or count < per_page:
+            return
+        page += 1
+
+
+def refresh_listing(
+    github_username: str,
+    session: Optional[requests.Session] = None,
+    per_page: Optional[int] = None,
+) -> bool:
+    """Revalidate a user's repo listing, True if it changed since it was stored.
+
+    When nothing changed every request is a 304 with an empty body, so
+    polling this costs one round trip per page.
+    """
+    http_cache = get_http_cache()
+    changes = http_cache.changes
+    for _ in iter_projects(github_username, session=session, per_page=per_page):
+        pass
+    return http_cache.changes > changes
+
+
+def get_projects(github_username: str) -> List[Response]:
+    return list(iter_projects(github_username))
 
 
 if __name__ == "__main__":
 
-    get_projects("tashifkhan")
+    get_projects(DEFAULT_GITHUB_USERNAME)
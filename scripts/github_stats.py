@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Precompute the GitHub stats served by /api/stats/github/[username].
+
+Fetches every repo's languages concurrently over one pooled session and the
+contribution calendar for each year, then writes a compact snapshot with the
+per-language byte totals, total contributions and streaks. The route serves
+the snapshot while it is fresh instead of calling GitHub once per repo.
+Usage: python github_stats.py tashifkhan
+       python github_stats.py tashifkhan --benchmark --repos 60 --latency 0.05
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import requests
+from get_projects import create_session
+from storage import write_json
+from tracing import get_tracer
+
+GITHUB_API = os.getenv("GITHUB_API", "https://api.github.com")
+
+# Read by app/api/stats/github/[username]/route.ts via utils/githubStatsSnapshot.ts
+SNAPSHOT_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "data", "github-stats"
+)
+SNAPSHOT_VERSION = 1
+
+# GitHub's contribution calendar starts in 2005
+MINIMUM_YEAR = 2005
+
+
+def github_session(workers: int) -> requests.Session:
+    """Pooled session sized for the worker count, authenticated when a token is set"""
+    # Languages and contributions are fetched side by side, each with workers threads
+    session = create_session(pool_size=workers * 2, retry_methods=("GET", "POST"))
+    token = os.getenv("GITHUB_TOKEN") or os.getenv("NEXT_PUBLIC_GITHUB_TOKEN")
+    if token:
+        session.headers["Authorization"] = f"Bearer {token}"
+    return session
+
+
+def fetch_repos(username: str, session: requests.Session) -> List[Dict[str, Any]]:
+    """Every repo of the user, following pages of 100"""
+    repos = []
+    page = 1
+    while True:
+        res = session.get(
+            f"{GITHUB_API}/users/{username}/repos",
+            params={"type": "all", "per_page": 100, "page": page},
+            timeout=30,
+        )
+        res.raise_for_status()
+        batch = res.json()
+        repos.extend(batch)
+        if len(batch) < 100:
+            return repos
+        page += 1
+
+
+def fetch_languages(session: requests.Session, languages_url: str) -> Dict[str, int]:
+    with get_tracer().span("languages") as span:
+        res = session.get(languages_url, timeout=30)
+        res.raise_for_status()
+        span.set(bytes=len(res.content))
+        return res.json()
+
+
+def aggregate_languages(
+    session: requests.Session, repos: List[Dict[str, Any]], workers: int
+) -> Dict[str, int]:
+    """Sum language bytes across repos, fetching up to workers repos at a time"""
+    totals: Dict[str, int] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        urls = [repo["languages_url"] for repo in repos]
+        for languages in executor.map(lambda url: fetch_languages(session, url), urls):
+            for language, size in languages.items():
+                totals[language] = totals.get(language, 0) + size
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def contribution_query(username: str, year: int) -> str:
+    return f"""query {{
+    user(login: "{username}") {{
+      createdAt
+      contributionsCollection(from: "{year}-01-01T00:00:00Z", to: "{year}-12-31T23:59:59Z") {{
+        contributionCalendar {{
+          weeks {{
+            contributionDays {{
+              contributionCount
+              date
+            }}
+          }}
+        }}
+      }}
+    }}
+  }}"""
+
+
+def fetch_contribution_year(
+    session: requests.Session, username: str, year: int
+) -> Dict[str, Any]:
+    with get_tracer().span("contributions", year=year) as span:
+        res = session.post(
+            f"{GITHUB_API}/graphql",
+            json={"query": contribution_query(username, year)},
+            timeout=30,
+        )
+        res.raise_for_status()
+        span.set(bytes=len(res.content))
+        payload = res.json()
+    user = (payload.get("data") or {}).get("user")
+    if not user or payload.get("errors"):
+        raise Exception(f"Failed to fetch {username}'s {year} contributions: {payload.get('errors')}")
+    return user
+
+
+def contribution_days(user: Dict[str, Any]) -> List[Tuple[str, int]]:
+    weeks = user["contributionsCollection"]["contributionCalendar"]["weeks"]
+    return [
+        (day["date"], day["contributionCount"]) for week in weeks for day in week["contributionDays"]
+    ]
+
+
+def fetch_contribution_days(
+    session: requests.Session, username: str, workers: int
+) -> List[Tuple[str, int]]:
+    """All (date, count) days since the account was created, oldest first"""
+    current_year = date.today().year
+    current = fetch_contribution_year(session, username, current_year)
+    created_year = max(int(current["createdAt"][:4]), MINIMUM_YEAR)
+
+    days = contribution_days(current)
+    years = range(created_year, current_year)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for user in executor.map(
+            lambda year: fetch_contribution_year(session, username, year), years
+        ):
+            days.extend(contribution_days(user))
+    return sorted(days)
+
+
+def longest_streak(days: List[Tuple[str, int]]) -> int:
+    """Longest run of consecutive contributing days, as utils/githubStats.ts counts it"""
+    longest = current = 0
+    for _, count in days:
+        current = current + 1 if count > 0 else 0
+        longest = max(longest, current)
+    return longest
+
+
+def current_streak(days: List[Tuple[str, int]], today: Optional[date] = None) -> int:
+    """Streak ending at the most recent data, allowing today to be empty so far"""
+    if not days:
+        return 0
+    today = today or date.today()
+    recent_first = sorted(days, reverse=True)
+    if (today - date.fromisoformat(recent_first[0][0])).days > 2:
+        return 0
+
+    streak = 0
+    last_contribution: Optional[date] = None
+    for day_string, count in recent_first:
+        day = date.fromisoformat(day_string)
+        gap = (last_contribution - day).days if last_contribution else 0
+        if count > 0:
+            if last_contribution is not None and gap > 1:
+                break
+            streak += 1
+            last_contribution = day
+        elif last_contribution is not None and gap > 1:
+            break
+    return streak
+
+
+def build_snapshot(username: str, workers: int = 16) -> Dict[str, Any]:
+    session = github_session(workers)
+    repos = fetch_repos(username, session)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        languages = executor.submit(aggregate_languages, session, repos, workers)
+        contributions = executor.submit(fetch_contribution_days, session, username, workers)
+        language_bytes, days = languages.result(), contributions.result()
+
+    return {
+        "version": SNAPSHOT_VERSION,
+        "username": username,
+        "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "repoCount": len(repos),
+        "languageBytes": language_bytes,
+        "totalCommits": sum(count for _, count in days),
+        "longestStreak": longest_streak(days),
+        "currentStreak": current_streak(days),
+    }
+
+
+def snapshot_path(username: str, output_dir: str = SNAPSHOT_DIR) -> str:
+    return os.path.join(output_dir, f"{username.lower()}.json")
+
+
+def write_snapshot(username: str, output_dir: str = SNAPSHOT_DIR, workers: int = 16) -> str:
+    snapshot = build_snapshot(username, workers)
+    path = snapshot_path(username, output_dir)
+    write_json(path, snapshot, compact=True)
+    return path
+
+
+def run_benchmark(repos: int, latency: float, worker_counts: List[int]) -> None:
+    """Time the job against a local fake GitHub for each worker count"""
+    global GITHUB_API
+    from fake_servers import fake_github_api
+
+    for workers in worker_counts:
+        with fake_github_api(repos, latency) as server:
+            GITHUB_API = server.url
+            start = time.perf_counter()
+            snapshot = build_snapshot("benchmark-user", workers)
+            wall = time.perf_counter() - start
+            print(
+                f"workers={workers:<3} {wall:6.2f}s  {server.requests} requests over "
+                f"{server.connections} connections, {len(snapshot['languageBytes'])} languages, "
+                f"{snapshot['totalCommits']} contributions"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute GitHub language and streak stats")
+    parser.add_argument("username", nargs="?", default="tashifkhan")
+    parser.add_argument("--output-dir", default=SNAPSHOT_DIR)
+    parser.add_argument(
+        "--workers", type=int, default=16, help="Concurrent GitHub requests"
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Run against a local fake GitHub instead, comparing 1 worker with --workers",
+    )
+    parser.add_argument("--repos", type=int, default=60, help="Fake repos for --benchmark")
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Fake GitHub seconds per request"
+    )
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.repos, args.latency, [1, args.workers])
+    else:
+        path = write_snapshot(args.username, args.output_dir, args.workers)
+        print(f"📄 GitHub stats for {args.username} saved to '{path}'")
+        get_tracer().print_summary()
@@ -0,0 +1,152 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Mapping, NamedTuple, Optional
+
+DEFAULT_HTTP_CACHE_PATH = os.path.join("./data", "http_cache.sqlite")
+
+
+class CachedResponse(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    # Parsed result of the last full response, serialized by the caller
+    body: str
+    # sha256 of body, to tell whether a fresh download changed anything
+    digest: str
+
+
+class HttpCache:
+    """Persistent validator cache for conditional GETs.
+
+    Stores the ETag / Last-Modified of each URL's last 200 together with the
+    parsed result, so the next request can send If-None-Match /
+    If-Modified-Since and a 304 reuses the stored result instead of
+    downloading and decoding the body again.
+    """
+
+    def __init__(self, path: str = DEFAULT_HTTP_CACHE_PATH, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        # 304s answered from the store
+        self.revalidated = 0
+        # Full bodies downloaded
+        self.fetched = 0
+        # Full bodies that differed from the stored one
+        self.changes = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Return the stored response for a URL, or None"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT etag, last_modified, body, digest FROM http_cache WHERE url = ?",
+                (url,),
+            ).fetchone()
+        return CachedResponse(*row) if row else None
+
+    def conditional_headers(self, cached: Optional[CachedResponse]) -> Dict[str, str]:
+        """Validator headers that let the server answer 304 Not Modified"""
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        return headers
+
+    def mark_revalidated(self) -> None:
+        with self._lock:
+            self.revalidated += 1
+
+    def set(self, url: str, headers: Mapping[str, str], body: str) -> bool:
+        """Store a full response's validators and parsed body.
+
+        Returns True if the body differs from the one stored before.
+        """
+        digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+        with self._lock:
+            self.fetched += 1
+            if not self.enabled:
+                self.changes += 1
+                return True
+
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT digest FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+            changed = row is None or row[0] != digest
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO http_cache
+                    (url, etag, last_modified, body, digest, stored_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    url,
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                    body,
+                    digest,
+                    time.time(),
+                ),
+            )
+            conn.commit()
+            if changed:
+                self.changes += 1
+            return changed
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_http_cache = HttpCache()
+
+
+def get_http_cache() -> HttpCache:
+    return _http_cache
+
+
+def configure_http_cache(
+    enabled: bool = True, path: str = DEFAULT_HTTP_CACHE_PATH
+) -> HttpCache:
+    """Replace the process-wide HTTP cache, e.g. from --no-http-cache"""
+    global _http_cache
+    _http_cache.close()
+    _http_cache = HttpCache(path, enabled)
+    return _http_cache
+
+
+def http_cache_stats() -> str:
+    cache = get_http_cache()
+    return (
+        f"HTTP cache: {cache.revalidated} not modified, "
+        f"{cache.fetched} downloaded ({cache.changes} changed)"
+    )
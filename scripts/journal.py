@@ -0,0 +1,207 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from get_projects import Response
+from manifest import ALL_PROJECTS_PATH
+from storage import write_json
+
+JOURNAL_PATH = os.path.join("./data", "journal.jsonl")
+
+# Response fields each AI stage produces
+STAGE_FIELDS = {
+    "analysis": ("description", "status", "languages"),
+    "desc": ("description",),
+    "status": ("status",),
+    "tech": ("languages",),
+}
+INDIVIDUAL_STAGES = ("desc", "status", "tech")
+
+
+class RunJournal:
+    """Append-only log of completed AI stages and finished repos for one run.
+
+    Every record is a single JSON line written with one append and fsynced, so
+    a crash can at worst tear the final line, which is dropped on load. Records
+    carry the repo fingerprint; a repo that changed since it was journaled
+    starts over. A finished run removes its journal, so one that is still
+    there belongs to an interrupted run: without resume it is only replaced
+    when restart says so, and otherwise FileExistsError is raised rather
+    than losing that run's progress.
+    """
+
+    def __init__(
+        self, path: str = JOURNAL_PATH, resume: bool = False, restart: bool = False
+    ):
+        self.path = path
+        self._lock = threading.Lock()
+        self._fingerprints: Dict[str, Dict[str, Any]] = {}
+        self._stages: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._journaled_fingerprints: Dict[str, Dict[str, Any]] = {}
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if resume:
+            self._load()
+            return
+        if self.unfinished() and not restart:
+            raise FileExistsError(
+                f"'{path}' holds an interrupted run; pass --resume to continue it "
+                "or --restart to discard it"
+            )
+        open(path, "w", encoding="utf-8").close()
+
+    def unfinished(self) -> bool:
+        """Whether the journal file holds records of a run that did not finish"""
+        return os.path.exists(self.path) and os.path.getsize(self.path) > 0
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+
+        good_bytes = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final write; everything after it is discarded
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                good_bytes += len(line)
+                self._apply(record)
+
+        if good_bytes < os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(good_bytes)
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        title = record["title"]
+        if self._journaled_fingerprints.get(title) != record["fingerprint"]:
+            self._stages.pop(title, None)
+            self._entries.pop(title, None)
+            self._journaled_fingerprints[title] = record["fingerprint"]
+
+        if record["stage"] == "done":
+            self._entries[title] = record["fields"]
+        else:
+            self._stages.setdefault(title, {})[record["stage"]] = record["fields"]
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._apply(record)
+
+    def start_project(self, title: str, project_fingerprint: Dict[str, Any]) -> None:
+        """Register the fingerprint of a fetched repo, forgetting stale records"""
+        self._fingerprints[title] = project_fingerprint
+        if self._journaled_fingerprints.get(title) != project_fingerprint:
+            self._stages.pop(title, None)
+            self._entries.pop(title, None)
+
+    def completed_stages(self, title: str) -> Set[str]:
+        return set(self._stages.get(title, {}))
+
+    def is_complete(self, title: str) -> bool:
+        """True once the combined analysis or all three individual stages succeeded"""
+        stages = self.completed_stages(title)
+        return "analysis" in stages or all(stage in stages for stage in INDIVIDUAL_STAGES)
+
+    def restore(self, project: Response, stage: str) -> bool:
+        """Apply a journaled stage result to the project, if there is one"""
+        fields = self._stages.get(project.title, {}).get(stage)
+        if fields is None:
+            return False
+        for field, value in fields.items():
+            setattr(project, field, value)
+        return True
+
+    def record(self, project: Response, stage: str) -> None:
+        """Journal the fields a stage just produced"""
+        self._append(
+            {
+                "title": project.title,
+                "fingerprint": self._fingerprints.get(project.title),
+                "stage": stage,
+                "fields": {field: getattr(project, field) for field in STAGE_FIELDS[stage]},
+                "time": time.time(),
+            }
+        )
+
+    def recording(
+        self, stage: str, func: Callable[[Response], Response]
+    ) -> Callable[[Response], Response]:
+        """Wrap a stage function so its successful results are journaled"""
+
+        def run(project: Response) -> Response:
+            project = func(project)
+            self.record(project, stage)
+            return project
+
+        return run
+
+    def arecording(
+        self, stage: str, func: Callable[[Response], Awaitable[Response]]
+    ) -> Callable[[Response], Awaitable[Response]]:
+        async def run(project: Response) -> Response:
+            project = await func(project)
+            self.record(project, stage)
+            return project
+
+        return run
+
+    def finish_project(self, title: str, entry: Dict[str, Any]) -> None:
+        """Journal the final aggregate entry for a repo"""
+        self._append(
+            {
+                "title": title,
+                "fingerprint": self._fingerprints.get(title),
+                "stage": "done",
+                "fields": entry,
+                "time": time.time(),
+            }
+        )
+
+    def finished_entry(self, title: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(title)
+
+    def finished_entries(self) -> List[Dict[str, Any]]:
+        return list(self._entries.values())
+
+    def discard(self) -> None:
+        """Remove the journal once its run has been fully written out"""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+def rebuild_aggregate(
+    journal_path: str = JOURNAL_PATH,
+    output_path: str = ALL_PROJECTS_PATH,
+    position_key: str = "location",
+) -> int:
+    """Write the aggregate from the finished repos of an interrupted run"""
+    entries = RunJournal(journal_path, resume=True).finished_entries()
+    entries.sort(key=lambda entry: entry.get(position_key, 0))
+    write_json(output_path, entries)
+    return len(entries)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Rebuild data/all_projects.json from an interrupted run's journal"
+    )
+    parser.add_argument("--journal", default=JOURNAL_PATH)
+    parser.add_argument("--output", default=ALL_PROJECTS_PATH)
+    args = parser.parse_args()
+
+    count = rebuild_aggregate(args.journal, args.output)
+    print(f"📄 Rebuilt '{args.output}' with {count} projects from '{args.journal}'")
@@ -0,0 +1,199 @@
+import os
+import threading
+from typing import Any, Callable, Dict, NamedTuple, Optional, Union
+
+MODEL_NAME = "gemini-2.0-flash"
+
+DEFAULT_BATCH_TOKEN_BUDGET = 8000
+DEFAULT_MAX_BATCH_SIZE = 8
+
+DEFAULT_BACKEND = "gemini"
+DEFAULT_LLAMA_SERVER_URL = "http://127.0.0.1:8080/v1"
+SINGLE_FLIGHT_BACKENDS = {"llama-cpp"}
+
+
+class Backend(NamedTuple):
+    # (temperature, model) -> LangChain chat model
+    factory: Callable[[float, str], Any]
+    # A callable is read on use, after the CLI has loaded .env
+    default_model: Union[str, Callable[[], str]]
+    description: str
+
+
+def _gemini(temperature: float, model: str) -> Any:
+    import dotenv
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    dotenv.load_dotenv()
+    return ChatGoogleGenerativeAI(
+        model=model,
+        temperature=temperature,
+        google_api_key=os.getenv("GOOGLE_API_KEY"),
+    )
+
+
+def _llama_cpp(temperature: float, model: str) -> Any:
+    """A quantized GGUF model run in-process on the CPU by llama-cpp-python.
+
+    This backend is single-flight: a llama.cpp context is not thread-safe and
+    each one already uses every CPU thread, so all its models share one lock
+    and concurrent stages and repos wait for each other's generations. Use
+    llama-server with parallel slots to decode several requests at once.
+    """
+    try:
+        from langchain_community.chat_models import ChatLlamaCpp
+    except ImportError as e:
+        raise ImportError(
+            "The llama-cpp backend needs its extra: uv sync --extra llama-cpp "
+            "(or pip install langchain-community llama-cpp-python)"
+        ) from e
+    if not model or not os.path.exists(model):
+        raise FileNotFoundError(
+            f"llama-cpp backend: set --model or LLM_MODEL to a GGUF file (got {model!r})"
+        )
+
+    class SingleFlightChatLlamaCpp(ChatLlamaCpp):
+        """Runs one generation at a time; the other callers block on the lock"""
+
+        def _generate(self, *args: Any, **kwargs: Any) -> Any:
+            with _llama_cpp_lock:
+                return super()._generate(*args, **kwargs)
+
+    return SingleFlightChatLlamaCpp(
+        model_path=model,
+        temperature=temperature,
+        n_ctx=int(os.getenv("LLAMA_N_CTX", "8192")),
+        # Chunk size for evaluating one prompt's tokens; it does not batch
+        # separate requests together
+        n_batch=int(os.getenv("LLAMA_N_BATCH", "512")),
+        n_threads=int(os.getenv("LLAMA_N_THREADS", str(os.cpu_count() or 4))),
+        max_tokens=1024,
+        verbose=False,
+    )
+
+
+def _llama_server(temperature: float, model: str) -> Any:
+    """A local llama.cpp server (or any OpenAI-compatible one) over HTTP.
+
+    Started with --parallel N, llama-server keeps N slots and decodes their
+    requests together, so this is the backend for concurrent stages and repos.
+    """
+    try:
+        from langchain_openai import ChatOpenAI
+    except ImportError as e:
+        raise ImportError(
+            "The llama-server backend needs its extra: uv sync --extra llama-server "
+            "(or pip install langchain-openai)"
+        ) from e
+
+    return ChatOpenAI(
+        base_url=os.getenv("LLAMA_SERVER_URL", DEFAULT_LLAMA_SERVER_URL),
+        api_key=os.getenv("LLAMA_SERVER_API_KEY", "local"),
+        model=model,
+        temperature=temperature,
+    )
+
+
+def _fake(temperature: float, model: str) -> Any:
+    from fake_llm import FakeChatModel
+
+    return FakeChatModel()
+
+
+BACKENDS: Dict[str, Backend] = {
+    "gemini": Backend(_gemini, MODEL_NAME, "Google Gemini API (GOOGLE_API_KEY)"),
+    "llama-cpp": Backend(
+        _llama_cpp,
+        lambda: os.getenv("LLAMA_MODEL_PATH", ""),
+        "In-process GGUF model on the CPU, one generation at a time",
+    ),
+    "llama-server": Backend(
+        _llama_server,
+        "local",
+        "llama.cpp server (concurrent with --parallel N) or other OpenAI-compatible endpoint",
+    ),
+    "fake": Backend(_fake, "fake", "Deterministic offline replies"),
+}
+
+_models: Dict[float, Any] = {}
+_override: Optional[Any] = None
+_backend = os.getenv("LLM_BACKEND", DEFAULT_BACKEND)
+_model = os.getenv("LLM_MODEL") or None
+_lock = threading.Lock()
+_llama_cpp_lock = threading.Lock()
+
+
+def register_backend(
+    name: str,
+    factory: Callable[[float, str], Any],
+    default_model: Union[str, Callable[[], str]],
+    description: str = "",
+) -> None:
+    BACKENDS[name] = Backend(factory, default_model, description)
+
+
+def _selected_backend(name: str) -> Backend:
+    backend = BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown LLM backend {name!r}; choose from {', '.join(BACKENDS)}")
+    return backend
+
+
+def _default_model(backend: Backend) -> str:
+    default = backend.default_model
+    return default() if callable(default) else default
+
+
+def configure_backend(name: Optional[str] = None, model: Optional[str] = None) -> None:
+    """Choose the backend and model get_model builds from now on.
+
+    Defaults to LLM_BACKEND / LLM_MODEL from the environment, then Gemini.
+    """
+    global _backend, _model
+    name = name or os.getenv("LLM_BACKEND", DEFAULT_BACKEND)
+    _selected_backend(name)
+    with _lock:
+        _backend = name
+        _model = model or os.getenv("LLM_MODEL") or None
+        _models.clear()
+
+
+def backend_name() -> str:
+    return _backend
+
+
+def get_model(temperature: float = 0.1) -> Any:
+    """Return the shared chat model for a temperature, building it on first use.
+
+    The client libraries take over a second to import, so nothing loads them
+    until a stage actually needs the model.
+    """
+    if _override is not None:
+        return _override
+
+    with _lock:
+        model = _models.get(temperature)
+        if model is None:
+            backend = _selected_backend(_backend)
+            model = backend.factory(temperature, _model or _default_model(backend))
+            _models[temperature] = model
+        return model
+
+
+def model_id() -> str:
+    """Name of the model get_model returns, without constructing it"""
+    if _override is not None:
+        from llm_cache import model_name
+
+        return model_name(_override)
+    model = _model or _default_model(_selected_backend(_backend))
+    if _backend == DEFAULT_BACKEND:
+        # Bare Gemini names keep the cache keys of earlier runs valid
+        return model
+    return f"{_backend}/{os.path.basename(model)}"
+
+
+def use_model(model: Optional[Any]) -> None:
+    """Answer every get_model call with model, e.g. a fake; None restores the backend"""
+    global _override
+    _override = model
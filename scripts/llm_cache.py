@@ -0,0 +1,161 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+DEFAULT_CACHE_PATH = os.path.join("./data", "llm_cache.sqlite")
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 5000
+
+
+class LLMCache:
+    """Persistent content-addressed store for model outputs.
+
+    Entries are keyed by a hash of everything that influences the reply, so a
+    repo whose README, languages and commit count are unchanged is never sent
+    to the model twice. Entries older than the TTL are ignored and the least
+    recently used ones are evicted once the store grows past max_entries.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        enabled: bool = True,
+        refresh: bool = False,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    stage TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached output for a key, or None on a miss"""
+        if not self.enabled or self.refresh:
+            self.misses += 1
+            return None
+
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            now = time.time()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            conn.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, stage: str, value: str) -> None:
+        """Store a model output and evict expired or least recently used entries"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            conn = self._connect()
+            now = time.time()
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_cache (key, stage, value, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, stage, value, now, now),
+            )
+            conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            conn.execute(
+                """
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_cache = LLMCache()
+
+
+def get_cache() -> LLMCache:
+    return _cache
+
+
+def configure_cache(
+    enabled: bool = True,
+    refresh: bool = False,
+    path: str = DEFAULT_CACHE_PATH,
+    ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+) -> LLMCache:
+    """Replace the process-wide cache, e.g. from --no-cache or --refresh"""
+    global _cache
+    _cache.close()
+    _cache = LLMCache(path, ttl_seconds, max_entries, enabled, refresh)
+    return _cache
+
+
+def model_name(model: Any) -> str:
+    """Best-effort identifier for a LangChain chat model or a model name"""
+    if isinstance(model, str):
+        return model
+    for attr in ("model", "model_name"):
+        name = getattr(model, attr, None)
+        if isinstance(name, str) and name:
+            return name
+    return type(model).__name__
+
+
+def cache_key(stage: str, template: Any, model: Any, repo_data_json: str) -> str:
+    """Hash the prompt template, model name and serialized repo fields"""
+    digest = hashlib.sha256()
+    for part in (stage, template.pretty_repr(), model_name(model), repo_data_json):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def cache_stats() -> str:
+    cache = get_cache()
+    return f"LLM cache: {cache.hits} hits, {cache.misses} misses"
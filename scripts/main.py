@@ -1,11 +1,60 @@
-import json
+import argparse
 import os
 import time
-from typing import Dict, Any
-from get_projects import get_projects, Response
-from discription_generator import gen_desc
-from status_analyzer import gen_project_status
-from tech_extractor import gen_tech_stack
+from collections import Counter
+from dataclasses import replace
+from typing import Callable, Dict, Any, Iterator, Optional, Tuple
+from get_projects import DEFAULT_GITHUB_USERNAME, iter_projects, refresh_listing, Response
+from cli import (
+    add_concurrency_arguments,
+    add_cache_arguments,
+    add_compaction_arguments,
+    add_backend_arguments,
+    add_batch_arguments,
+    add_dedupe_arguments,
+    add_dry_run_arguments,
+    add_schedule_arguments,
+    add_snapshot_arguments,
+    add_tracing_arguments,
+    configure_backend_from_args,
+    configure_cache_from_args,
+    configure_stage_budgets_from_args,
+    configure_tracing_from_args,
+    run_config_from_args,
+)
+from dedupe import (
+    adapt_analysis,
+    duplicate_map,
+    find_duplicates,
+    print_dedupe_report,
+)
+from readme_compactor import compact_project, print_compaction_report
+from llm_cache import get_cache, cache_stats
+from http_cache import configure_http_cache, http_cache_stats
+from retry import print_retry_stats
+from tracing import get_tracer
+from journal import JOURNAL_PATH, RunJournal
+from rate_limit import TokenBucket
+from run_config import RunConfig
+from scheduler import QuotaScheduler
+from snapshot import build_snapshot, print_snapshot
+from prompt_builder import build_payload
+from storage import (
+    AGGREGATE_FORMATS,
+    AggregateWriter,
+    aggregate_path,
+    read_entries,
+    write_json,
+)
+from manifest import (
+    ALL_PROJECTS_PATH,
+    MANIFEST_PATH,
+    classify_project,
+    fingerprint,
+    load_aggregate,
+    load_manifest,
+    save_manifest,
+)
 
 
 def convert_status_to_readable(status: str) -> str:
@@ -14,117 +63,524 @@ def convert_status_to_readable(status: str) -> str:
     return status_map.get(status, "Work in Progress")
 
 
-def create_project_json(repo_data: Response, location: int) -> Dict[str, Any]:
+def create_project_json(
+    repo_data: Response, location: int, username: str = DEFAULT_GITHUB_USERNAME
+) -> Dict[str, Any]:
     """Convert Response object to the required JSON format"""
     return {
         "location": location,
         "title": repo_data.title,
         "description": repo_data.description or "",
         "technologies": repo_data.languages or [],
-        "githubLink": f"https://github.com/tashifkhan/{repo_data.title}",
+        "githubLink": f"https://github.com/{username}/{repo_data.title}",
         "liveLink": repo_data.live_website_url or "",
         "status": convert_status_to_readable(repo_data.status or "w"),
     }
 
 
-def process_all_projects():
-    """Fetch all projects and process them with AI functions"""
+def process_all_projects(
+    config: Optional[RunConfig] = None,
+    username: str = DEFAULT_GITHUB_USERNAME,
+    data_dir: str = "./data",
+    resume: bool = False,
+    restart: bool = False,
+    bucket: Optional[TokenBucket] = None,
+) -> int:
+    """Fetch all projects and process them with AI functions.
+
+    Batch, dedupe, quota and the other options below come from config.
+    Completed stages are journaled as they finish; with resume, repos and
+    stages finished by an interrupted run are taken from the journal, and
+    with restart its journal is discarded (without either, an interrupted
+    run's journal raises FileExistsError).
+    Entries are spooled to disk as they are generated and the aggregate is
+    replaced atomically at the end. With batch, repos are first analyzed
+    several per request and only the ones that fail go through the per-repo
+    pipeline. With dedupe, only the first repo of each cluster of
+    near-identical READMEs is analyzed and the others adapt its result.
+    With a quota, repos are processed in priority order and the ones that
+    do not fit the day's budget keep their previous entries until a later
+    run. The manifest, journal and outputs live in data_dir, along with the
+    site's projects snapshot unless snapshot_dir puts it elsewhere; a shared
+    bucket paces model calls across several runs at once. Returns the number
+    of projects written.
+    """
+    config = config or RunConfig()
+    # Imported here so --dry-run never loads LangChain
+    from pipeline import process_project_with_ai
+
     print("Fetching projects from GitHub...")
-    projects = get_projects("tashifkhan")
 
-    print(f"Found {len(projects)} projects. Processing...")
+    manifest_path = os.path.join(data_dir, os.path.basename(MANIFEST_PATH))
+    manifest = load_manifest(manifest_path)
+    all_projects_path = aggregate_path(
+        os.path.join(data_dir, os.path.basename(ALL_PROJECTS_PATH)), config.output_format
+    )
+    # Repos a scheduled run defers keep their previous entries
+    existing_projects = (
+        load_aggregate(all_projects_path)
+        if config.incremental or config.quota is not None
+        else {}
+    )
+    journal = RunJournal(
+        os.path.join(data_dir, os.path.basename(JOURNAL_PATH)), resume, restart
+    )
+
+    listing = []
+    fingerprints = {}
+    changes = {}
+    resumed_projects = {}
+    change_counts = Counter()
+    compaction_reports = []
+
+    def select_projects(stream: Iterator[Response]) -> Iterator[Tuple[int, Response]]:
+        """Fingerprint, filter and compact repos as they stream in"""
+        for location, project in enumerate(stream):
+            listing.append(project.title)
+            # Fingerprint before the AI stages rewrite languages
+            fingerprints[project.title] = fingerprint(project)
+            journal.start_project(project.title, fingerprints[project.title])
+            change = classify_project(project, manifest)
+            change_counts[change] += 1
+            changes[project.title] = change
+            finished_entry = journal.finished_entry(project.title)
+            if finished_entry is not None:
+                resumed_projects[project.title] = finished_entry
+                continue
+            if (
+                config.incremental
+                and change == "unchanged"
+                and project.title in existing_projects
+            ):
+                continue
+            if config.readme_budget:
+                compaction_reports.append(compact_project(project, config.readme_budget))
+            yield location, project
+
+    to_process = select_projects(iter_projects(username))
+
+    clusters = []
+    duplicate_of: Dict[str, str] = {}
+    if config.dedupe:
+        selected = list(to_process)
+        clusters = find_duplicates([project for _, project in selected], config.dedupe_threshold)
+        duplicate_of = duplicate_map(clusters)
+        to_process = iter(selected)
+
+    scheduler = None
+    if config.quota is not None:
+        bucket = bucket or TokenBucket(config.requests_per_minute, config.tokens_per_minute)
+        scheduler = QuotaScheduler(
+            config.quota,
+            bucket,
+            config.priority_weights,
+            config.fused,
+            config.batch_size if config.batch else 0,
+        )
+        selected = list(to_process)
+        to_process = iter(
+            scheduler.plan(
+                [(location, project, changes[project.title]) for location, project in selected],
+                len(listing),
+                duplicate_of,
+            )
+        )
+
+    # Repos admitted as they were sent; the rest are admitted one by one below
+    sent = set()
+
+    def admit(project: Response) -> bool:
+        """Check a repo against what has been spent just before it goes to the model"""
+        if journal.is_complete(project.title):
+            return True
+        scheduler.settle(pace=False)
+        if not scheduler.admit(project.title):
+            return False
+        sent.add(project.title)
+        return True
+
+    batched = set()
+    if config.batch:
+        from batch_analyzer import analyze_in_batches
+
+        selected = list(to_process)
+        batched = analyze_in_batches(
+            [project for _, project in selected if project.title not in duplicate_of],
+            config.batch_tokens,
+            config.batch_size,
+            journal,
+            bucket=bucket,
+            admit=admit if scheduler is not None else None,
+        )
+        # Repos the batches could not analyze go to the model again, so they
+        # are admitted again first
+        sent &= batched
+        to_process = iter(selected)
+
+    if config.concurrency > 0:
+        from async_pipeline import process_projects_concurrently
+
+        # The async pipeline schedules the whole batch at once
+        selected = list(to_process)
+        processed = process_projects_concurrently(
+            [
+                project
+                for _, project in selected
+                if project.title not in batched and project.title not in duplicate_of
+            ],
+            config.concurrency,
+            config.requests_per_minute,
+            config.tokens_per_minute,
+            config.fused,
+            journal,
+            bucket,
+            admit if scheduler is not None else None,
+        )
+        processed_by_title = {project.title: project for project in processed}
+        to_process = (
+            (location, processed_by_title.get(project.title, project))
+            for location, project in selected
+        )
 
     # Create data directory if it doesn't exist
-    os.makedirs("./data", exist_ok=True)
+    os.makedirs(data_dir, exist_ok=True)
 
-    processed_projects = []
+    aggregate = AggregateWriter(all_projects_path, config.output_format)
+    compact = config.output_format != "pretty"
+    incomplete = []
+    analyzed: Dict[str, Response] = {}
+    reused = 0
+    if scheduler is not None:
+        # Charge what the batched or concurrent calls spent
+        scheduler.settle(pace=False)
 
-    for i, project in enumerate(projects):
-        print(f"\nProcessing project {i+1}/{len(projects)}: {project.title}")
+    for location, project in to_process:
+        if (
+            scheduler is not None
+            and not journal.is_complete(project.title)
+            and project.title not in sent
+            and not scheduler.admit(project.title)
+        ):
+            print(f"\nDeferred project {location+1}: {project.title}")
+            continue
+        print(f"\nProcessing project {location+1}: {project.title}")
 
         try:
-            # Generate description using AI with retry logic
-            print("  - Generating description...")
-            try:
-                project = gen_desc(project)
-            except Exception as desc_error:
-                print(f"    Description generation failed: {str(desc_error)}")
-                if "ResourceExhausted" in str(desc_error) or "429" in str(desc_error):
-                    print("    Rate limit hit, waiting 60 seconds...")
-                    time.sleep(60)
-                    try:
-                        project = gen_desc(project)
-                    except Exception:
-                        print("    Retry failed, using original description")
-
-            # Analyze project status with retry logic
-            print("  - Analyzing project status...")
-            try:
-                project = gen_project_status(project)
-            except Exception as status_error:
-                print(f"    Status analysis failed: {str(status_error)}")
-                if "ResourceExhausted" in str(status_error) or "429" in str(
-                    status_error
-                ):
-                    print("    Rate limit hit, waiting 60 seconds...")
-                    time.sleep(60)
-                    try:
-                        project = gen_project_status(project)
-                    except Exception:
-                        print("    Retry failed, using default status")
-                        project.status = "w"  # Default to work in progress
-
-            # Extract tech stack with retry logic
-            print("  - Extracting tech stack...")
-            try:
-                project = gen_tech_stack(project)
-            except Exception as tech_error:
-                print(f"    Tech stack extraction failed: {str(tech_error)}")
-                if "ResourceExhausted" in str(tech_error) or "429" in str(tech_error):
-                    print("    Rate limit hit, waiting 60 seconds...")
-                    time.sleep(60)
-                    try:
-                        project = gen_tech_stack(project)
-                    except Exception:
-                        print("    Retry failed, using original languages")
+            misses_before = get_cache().misses
+            representative = analyzed.get(duplicate_of.get(project.title))
+            if representative is not None and journal.is_complete(representative.title):
+                project = adapt_analysis(representative, project)
+                journal.record(project, "analysis")
+                reused += 1
+                print(f"  - Reused the analysis of near-duplicate {representative.title}")
+            elif config.concurrency <= 0 and project.title not in batched:
+                # The scheduler paces by what the repo actually spent, so the
+                # stages must not reserve from the same bucket beforehand
+                project = process_project_with_ai(
+                    project,
+                    fused=config.fused,
+                    journal=journal,
+                    bucket=bucket if scheduler is None else None,
+                )
+            analyzed[project.title] = project
 
             # Convert to required format
-            project_json = create_project_json(project, i)
-            processed_projects.append(project_json)
+            project_json = create_project_json(project, location, username)
+            aggregate.add(project_json)
+            if journal.is_complete(project.title):
+                manifest[project.title] = fingerprints[project.title]
+                journal.finish_project(project.title, project_json)
+            else:
+                # Unfingerprinted, so --incremental retries the failed stages
+                manifest.pop(project.title, None)
+                incomplete.append(project.title)
 
             # Save individual project JSON file in data directory
             filename = f"{project.title.replace(' ', '_').replace('-', '_')}.json"
             # Remove any invalid characters for filename
             filename = "".join(c for c in filename if c.isalnum() or c in ("_", "."))
-            filepath = os.path.join("./data", filename)
+            filepath = os.path.join(data_dir, filename)
 
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(project_json, f, indent=2, ensure_ascii=False)
+            write_json(filepath, project_json, compact)
 
             print(f"  - Saved to {filepath}")
 
-            # Add a small delay between projects to avoid hitting rate limits
-            print("  - Waiting 5 seconds before next project...")
-            time.sleep(5)
+            # Add a small delay between projects to avoid hitting rate limits,
+            # unless every stage was answered from the cache
+            if scheduler is not None:
+                scheduler.settle()
+            elif config.concurrency <= 0 and get_cache().misses > misses_before:
+                print("  - Waiting 5 seconds before next project...")
+                time.sleep(5)
 
         except Exception as e:
             print(f"  - Error processing {project.title}: {str(e)}")
-            # Create basic entry even if processing fails
-            project_json = create_project_json(project, i)
-            processed_projects.append(project_json)
+            manifest.pop(project.title, None)
+            incomplete.append(project.title)
+            # Create basic entry even if processing fails, but keep the
+            # previous entry when an incremental sync already has one
+            if project.title not in existing_projects and project.title not in aggregate:
+                aggregate.add(create_project_json(project, location, username))
+
+    print(f"\nFound {len(listing)} projects.")
+    if resumed_projects:
+        print(f"Resumed {len(resumed_projects)} finished projects from the run journal")
+        for title in resumed_projects:
+            manifest[title] = fingerprints[title]
+    if config.incremental:
+        removed = sum(1 for title in manifest if title not in fingerprints)
+        print(
+            f"Incremental sync: {change_counts['new']} new, "
+            f"{change_counts['modified']} modified, "
+            f"{change_counts['unchanged']} unchanged, {removed} removed"
+        )
+    if compaction_reports:
+        print_compaction_report(compaction_reports)
+    if clusters:
+        print_dedupe_report(clusters, reused, 1 if config.fused or config.batch else 3)
+    if scheduler is not None:
+        scheduler.print_report()
+        for repo in scheduler.deferred:
+            if repo.project.title not in existing_projects:
+                aggregate.add(create_project_json(repo.project, repo.location, username))
+
+    # Fill in repos that were not regenerated, dropping removed ones
+    generated_count = len(aggregate)
+    for location, title in enumerate(listing):
+        entry = resumed_projects.get(title) or existing_projects.get(title)
+        if entry is not None and title not in aggregate:
+            aggregate.add({**entry, "location": location})
 
     # Save all projects in one file in data directory
-    all_projects_path = os.path.join("./data", "all_projects.json")
-    with open(all_projects_path, "w", encoding="utf-8") as f:
-        json.dump(processed_projects, f, indent=2, ensure_ascii=False)
+    project_count = aggregate.commit()
+    if config.snapshot:
+        snapshot_dir = config.snapshot_dir or os.path.join(data_dir, "snapshot")
+        print_snapshot(build_snapshot(read_entries(all_projects_path), snapshot_dir), snapshot_dir)
 
-    print(
-        f"\n✅ Processing complete! Generated {len(processed_projects)} project files."
+    # Forget repos that no longer exist so they are treated as new if they return
+    save_manifest(
+        {title: manifest[title] for title in fingerprints if title in manifest},
+        manifest_path,
     )
-    print(f"📄 All projects saved to '{all_projects_path}'")
 
-    return processed_projects
+    # Keep the journal while some repos still have failed stages to retry
+    if incomplete:
+        print(
+            f"⚠️  {len(incomplete)} projects have failed stages; "
+            "rerun with --resume or --incremental to retry them"
+        )
+    else:
+        journal.discard()
+
+    print(f"✅ Processing complete! Generated {generated_count} project files.")
+    print(f"📄 All {project_count} projects saved to '{all_projects_path}'")
+    print(f"🗄️  {cache_stats()}")
+    print(f"🌐 {http_cache_stats()}")
+    print_retry_stats()
+    get_tracer().print_summary()
+
+    return project_count
+
+
+def watch_projects(username: str, interval: float, process: Callable[..., Any]) -> None:
+    """Process the repos, then poll the listing and process again whenever it changes.
+
+    Each poll is one conditional request; while nothing changed the server
+    answers 304 and nothing is decoded, compared or sent to the model. Later
+    passes are called with resume=True, so repos an earlier pass left with
+    failed stages continue from its journal.
+    """
+    process()
+    print(f"👀 Watching {username}'s repos every {interval:g}s (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(interval)
+            if refresh_listing(username):
+                print(f"\n🔔 {username}'s repo listing changed, processing it")
+                process(resume=True)
+    except KeyboardInterrupt:
+        print("👋 Stopped watching")
+
+
+def preview_projects(
+    config: Optional[RunConfig] = None, username: str = DEFAULT_GITHUB_USERNAME
+) -> int:
+    """Fetch and classify repos like a real run, without model calls or writes.
+
+    Returns the number of repos a real run would send to the model.
+    """
+    config = config or RunConfig()
+    print("Fetching projects from GitHub (dry run)...")
+
+    manifest = load_manifest()
+    all_projects_path = aggregate_path(ALL_PROJECTS_PATH, config.output_format)
+    existing_projects = load_aggregate(all_projects_path) if config.incremental else {}
+
+    change_counts = Counter()
+    selected = []
+    candidates = []
+    prompt_tokens = 0
+    for location, project in enumerate(iter_projects(username)):
+        change = classify_project(project, manifest)
+        change_counts[change] += 1
+        if config.incremental and change == "unchanged" and project.title in existing_projects:
+            print(f"  {location+1:>3}. {project.title} ({change}, skipped)")
+            continue
+        if config.readme_budget:
+            compact_project(project, config.readme_budget)
+        tokens = build_payload(project, "analysis").tokens
+        selected.append(project)
+        candidates.append((location, project, change))
+        prompt_tokens += tokens
+        print(f"  {location+1:>3}. {project.title} ({change}, ~{tokens} prompt tokens)")
+
+    print(
+        f"\nFound {sum(change_counts.values())} projects: {change_counts['new']} new, "
+        f"{change_counts['modified']} modified, {change_counts['unchanged']} unchanged"
+    )
+    clusters = find_duplicates(selected, config.dedupe_threshold) if config.dedupe else []
+    if clusters:
+        print_dedupe_report(clusters, sum(len(cluster.members) for cluster in clusters))
+    duplicate_of = duplicate_map(clusters)
+    analyzed = len(selected) - len(duplicate_of)
+    if config.quota is not None:
+        scheduler = QuotaScheduler(config.quota, TokenBucket(), config.priority_weights)
+        scheduler.plan(candidates, sum(change_counts.values()), duplicate_of)
+        scheduler.print_report()
+        analyzed -= sum(1 for repo in scheduler.deferred if repo.project.title not in duplicate_of)
+    print(
+        f"🔎 Dry run: would analyze {analyzed} projects "
+        f"(~{prompt_tokens} repo tokens before prompt overhead); nothing was written"
+    )
+    get_tracer().print_summary()
+    return analyzed
 
 
 if __name__ == "__main__":
-    process_all_projects()
+    parser = argparse.ArgumentParser(description="Generate project data with AI")
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Use three separate AI calls per project instead of one combined call",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only process repos that are new or changed since the last run",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run, skipping repos and stages it already finished",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Discard an interrupted run's journal and start over",
+    )
+    parser.add_argument(
+        "--format",
+        choices=AGGREGATE_FORMATS,
+        default="pretty",
+        help="Aggregate output: indented JSON, minified JSON, or NDJSON (all_projects.ndjson)",
+    )
+    parser.add_argument(
+        "--user", default=DEFAULT_GITHUB_USERNAME, help="GitHub user or org to process"
+    )
+    parser.add_argument(
+        "--users",
+        help="Comma-separated users/orgs to process in parallel, each into "
+        "data/tenants/<user>, sharing one --rpm/--tpm budget and the LLM cache",
+    )
+    parser.add_argument(
+        "--tenant-workers",
+        type=int,
+        default=4,
+        help="Accounts processed at once with --users",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and reprocess (incrementally) whenever the repo listing changes",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=300,
+        help="Seconds between checks of the repo listing with --watch",
+    )
+    add_concurrency_arguments(parser)
+    add_backend_arguments(parser)
+    add_cache_arguments(parser)
+    add_compaction_arguments(parser)
+    add_batch_arguments(parser)
+    add_dedupe_arguments(parser)
+    add_dry_run_arguments(parser)
+    add_schedule_arguments(parser)
+    add_snapshot_arguments(parser)
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+    if args.resume and args.restart:
+        parser.error("--resume and --restart are mutually exclusive")
+    if args.watch and (args.users or args.dry_run):
+        parser.error("--watch works with a single --user and without --dry-run")
+    scheduled = bool(args.rpd or args.tpd or args.priority)
+    if scheduled and args.users:
+        parser.error("--rpd, --tpd and --priority work with a single --user")
+    configure_tracing_from_args(args)
+    configure_stage_budgets_from_args(args)
+    configure_backend_from_args(args)
+
+    usernames = [user.strip() for user in (args.users or "").split(",") if user.strip()]
+    config = run_config_from_args(args)
+
+    if args.dry_run:
+        # A dry run writes nothing, not even the listing's validators
+        configure_http_cache(enabled=False)
+        for username in usernames or [args.user]:
+            preview_projects(config, username)
+    elif usernames:
+        configure_cache_from_args(args)
+
+        if args.fake_llm:
+            from fake_llm import install_fake_model
+
+            install_fake_model(latency=args.fake_latency)
+
+        from multi_tenant import DEFAULT_TENANT_CONCURRENCY, process_tenants
+
+        process_tenants(
+            usernames,
+            replace(
+                config,
+                # Tenants always use the async pipeline so every call is paced by the shared bucket
+                concurrency=config.concurrency or DEFAULT_TENANT_CONCURRENCY,
+                # Each tenant's snapshot goes to its own data directory
+                snapshot_dir=None,
+            ),
+            workers=args.tenant_workers,
+            resume=args.resume,
+            restart=args.restart,
+        )
+    else:
+        configure_cache_from_args(args)
+
+        if args.fake_llm:
+            from fake_llm import install_fake_model
+
+            install_fake_model(latency=args.fake_latency)
+
+        if args.watch:
+            # Watching only ever reprocesses what changed
+            config = replace(config, incremental=True)
+
+        def process(resume: bool = args.resume, restart: bool = args.restart) -> int:
+            return process_all_projects(config, args.user, resume=resume, restart=restart)
+
+        try:
+            if args.watch:
+                watch_projects(args.user, args.watch_interval, process)
+            else:
+                process()
+        except FileExistsError as e:
+            parser.error(str(e))
@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, NamedTuple
+from get_projects import Response
+from storage import read_entries, write_json
+
+MANIFEST_PATH = os.path.join("./data", "manifest.json")
+ALL_PROJECTS_PATH = os.path.join("./data", "all_projects.json")
+
+
+class ProjectChanges(NamedTuple):
+    new: List[Response]
+    modified: List[Response]
+    unchanged: List[Response]
+    removed: List[str]
+
+
+def fingerprint(project: Response) -> Dict[str, Any]:
+    """Summarize the inputs the AI stages depend on for one fetched repo"""
+    readme = project.readme or ""
+    return {
+        "num_commits": project.num_commits,
+        "readme_sha256": hashlib.sha256(readme.encode("utf-8")).hexdigest(),
+        "languages": sorted(project.languages or []),
+    }
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> Dict[str, Dict[str, Any]]:
+    """Load per-repo fingerprints from the last run, keyed by title"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest: Dict[str, Dict[str, Any]], path: str = MANIFEST_PATH) -> None:
+    write_json(path, manifest, sort_keys=True)
+
+
+def diff_projects(
+    projects: List[Response], manifest: Dict[str, Dict[str, Any]]
+) -> ProjectChanges:
+    """Split a fresh listing into new, modified and unchanged repos"""
+    changes = ProjectChanges([], [], [], [])
+    titles = set()
+    for project in projects:
+        titles.add(project.title)
+        getattr(changes, classify_project(project, manifest)).append(project)
+    changes.removed.extend(title for title in manifest if title not in titles)
+    return changes
+
+
+def classify_project(project: Response, manifest: Dict[str, Dict[str, Any]]) -> str:
+    """Return "new", "modified" or "unchanged" for one fetched repo"""
+    previous = manifest.get(project.title)
+    if previous is None:
+        return "new"
+    if previous != fingerprint(project):
+        return "modified"
+    return "unchanged"
+
+
+def load_aggregate(path: str = ALL_PROJECTS_PATH) -> Dict[str, Dict[str, Any]]:
+    """Load the previously generated project entries, keyed by title"""
+    if not os.path.exists(path):
+        return {}
+    return {entry["title"]: entry for entry in read_entries(path)}
+
+
+def merge_aggregate(
+    titles: List[str],
+    updated: Dict[str, Dict[str, Any]],
+    existing: Dict[str, Dict[str, Any]],
+    position_key: str = "location",
+) -> List[Dict[str, Any]]:
+    """Combine fresh and previous entries in listing order, dropping removed repos"""
+    merged = []
+    for title in titles:
+        entry = updated.get(title) or existing.get(title)
+        if entry is None:
+            continue
+        entry = dict(entry)
+        entry[position_key] = len(merged)
+        merged.append(entry)
+    return merged
@@ -0,0 +1,143 @@
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, TextIO
+from http_cache import http_cache_stats
+from llm_cache import cache_stats
+from rate_limit import TokenBucket
+from retry import print_retry_stats
+from run_config import RunConfig
+from storage import write_json
+from tracing import get_tracer
+
+TENANTS_DIR = os.path.join("./data", "tenants")
+STATUS_FILENAME = "status.json"
+DEFAULT_TENANT_CONCURRENCY = 4
+
+
+class ThreadRoutedOutput:
+    """A stdout stand-in that sends each thread's prints to its own stream.
+
+    Threads without a route write to the original stream, so the tenant
+    logs stay readable while the console only shows the overall progress.
+    """
+
+    def __init__(self, default: TextIO):
+        self.default = default
+        self._local = threading.local()
+
+    def route(self, stream: Optional[TextIO]) -> None:
+        self._local.stream = stream
+
+    def _stream(self) -> TextIO:
+        return getattr(self._local, "stream", None) or self.default
+
+    def write(self, text: str) -> int:
+        return self._stream().write(text)
+
+    def flush(self) -> None:
+        self._stream().flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.default, name)
+
+
+def tenant_dir(username: str, data_root: str = TENANTS_DIR) -> str:
+    return os.path.join(data_root, username.lower())
+
+
+def process_tenants(
+    usernames: List[str],
+    config: Optional[RunConfig] = None,
+    workers: int = 4,
+    data_root: str = TENANTS_DIR,
+    resume: bool = False,
+    restart: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    """Run the projects pipeline for several accounts at once.
+
+    Up to workers tenants are fetched and processed in parallel with the
+    same config, each with its own manifest, journal and outputs under
+    data_root/<username>. Every tenant draws on one token bucket sized by
+    the config's per-minute budgets so the Gemini budget is global, and
+    they share the process-wide LLM cache, retry stats and tracer. Each
+    tenant's output goes to its run.log; data_root/status.json records how
+    every tenant finished. Returns that status by username.
+    """
+    from main import process_all_projects
+
+    config = config or RunConfig(concurrency=DEFAULT_TENANT_CONCURRENCY)
+    bucket = TokenBucket(config.requests_per_minute, config.tokens_per_minute)
+    status_path = os.path.join(data_root, STATUS_FILENAME)
+    status: Dict[str, Dict[str, Any]] = {}
+    status_lock = threading.Lock()
+    output = ThreadRoutedOutput(sys.stdout)
+
+    def run(username: str) -> Dict[str, Any]:
+        data_dir = tenant_dir(username, data_root)
+        os.makedirs(data_dir, exist_ok=True)
+        start = time.perf_counter()
+        with open(os.path.join(data_dir, "run.log"), "w", encoding="utf-8") as log:
+            output.route(log)
+            try:
+                count = process_all_projects(
+                    config,
+                    username,
+                    data_dir,
+                    resume=resume,
+                    restart=restart,
+                    bucket=bucket,
+                )
+                result = {"ok": True, "projects": count}
+            except Exception as e:
+                traceback.print_exc(file=log)
+                result = {"ok": False, "error": str(e)}
+            finally:
+                output.route(None)
+        result["seconds"] = round(time.perf_counter() - start, 2)
+        result["finishedAt"] = time.time()
+
+        with status_lock:
+            status[username] = result
+            write_json(status_path, status)
+        return result
+
+    print(
+        f"👥 Processing {len(usernames)} accounts with {workers} workers "
+        f"(shared budget: {config.requests_per_minute:g} requests/min)"
+    )
+    start = time.perf_counter()
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {executor.submit(run, username): username for username in usernames}
+            for done, future in enumerate(as_completed(futures), 1):
+                username = futures[future]
+                result = future.result()
+                if result["ok"]:
+                    summary = f"{result['projects']} projects"
+                else:
+                    summary = f"failed: {result['error']}"
+                # The main thread has no route, so this reaches the console
+                print(
+                    f"  [{done}/{len(usernames)}] {username}: {summary} "
+                    f"in {result['seconds']:.1f}s"
+                )
+    finally:
+        sys.stdout = output.default
+
+    failed = [username for username, result in status.items() if not result["ok"]]
+    print(
+        f"✅ {len(usernames) - len(failed)}/{len(usernames)} accounts done in "
+        f"{time.perf_counter() - start:.1f}s; outputs in '{data_root}'"
+    )
+    if failed:
+        print(f"⚠️  Failed: {', '.join(failed)} (see their run.log)")
+    print(f"🗄️  {cache_stats()}")
+    print(f"🌐 {http_cache_stats()}")
+    print_retry_stats()
+    get_tracer().print_summary()
+    return status
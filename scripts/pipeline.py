@@ -0,0 +1,135 @@
+from typing import Callable, Optional
+from get_projects import Response
+from discription_generator import gen_desc
+from status_analyzer import gen_project_status
+from tech_extractor import gen_tech_stack
+from project_analyzer import gen_project_analysis
+from journal import INDIVIDUAL_STAGES, RunJournal
+from prompt_builder import build_payload
+from rate_limit import TokenBucket
+from retry import RetryPolicy, call_with_retry, is_output_error
+from stage_graph import INDIVIDUAL_STAGE_SPECS, run_stage_graph
+
+
+def process_project_with_fused_call(
+    project: Response,
+    policy: Optional[RetryPolicy] = None,
+    journal: Optional[RunJournal] = None,
+) -> bool:
+    """Run the single combined analysis call, returning False if its reply was unusable.
+
+    Only a reply that does not validate falls back to the individual stages;
+    rate limits, quota and network errors are raised, since three more calls
+    would only make them worse.
+    """
+    analyze = journal.recording("analysis", gen_project_analysis) if journal else gen_project_analysis
+
+    print("  - Analyzing project (description, status, tech stack)...")
+    try:
+        call_with_retry("analysis", analyze, project, policy=policy)
+        return True
+    except Exception as analysis_error:
+        if not is_output_error(analysis_error):
+            raise
+        print(f"    Combined analysis failed: {str(analysis_error)}")
+        print("    Falling back to individual stages")
+        return False
+
+
+def process_project_with_ai(
+    project: Response,
+    policy: Optional[RetryPolicy] = None,
+    fused: bool = True,
+    journal: Optional[RunJournal] = None,
+    bucket: Optional[TokenBucket] = None,
+) -> Response:
+    """Process a single project with AI functions and retry logic.
+
+    Rate limits and transient errors are retried with backoff per the policy.
+    With a journal, stages that already succeeded in an interrupted run are
+    restored instead of repeated, and new successes are journaled. Without
+    the combined call, the individual stages run one after another, or
+    concurrently through the stage graph when a shared bucket is passed to
+    pace every attempt. A stage that still fails
+    leaves its fields as they were (the status unset) and is not journaled,
+    so the repo stays incomplete and a later run retries it.
+    """
+    completed = journal.completed_stages(project.title) if journal else set()
+    if "analysis" in completed:
+        journal.restore(project, "analysis")
+        print("  - Restored combined analysis from the run journal")
+        return project
+
+    # A repo that already has individual stage results resumes stage by stage
+    resuming_stages = any(stage in completed for stage in INDIVIDUAL_STAGES)
+    if fused and not resuming_stages and process_project_with_fused_call(
+        project, policy, journal
+    ):
+        return project
+
+    def step(
+        stage: str, func: Callable, restored: str, action: str, failed: str, fallback: str
+    ) -> Callable[[Response], Response]:
+        if stage in completed:
+
+            def restore(project: Response) -> Response:
+                journal.restore(project, stage)
+                print(f"  - Restored {restored} from the run journal")
+                return project
+
+            return restore
+
+        if journal:
+            func = journal.recording(stage, func)
+        if bucket is not None:
+            tokens = build_payload(project, stage).tokens
+            paced = func
+
+            def func(project: Response) -> Response:
+                bucket.acquire(tokens)
+                return paced(project)
+
+        def run(project: Response) -> Response:
+            print(f"  - {action}...")
+            try:
+                return call_with_retry(stage, func, project, policy=policy)
+            except Exception as error:
+                print(f"    {failed} failed: {str(error)}")
+                print(f"    {fallback}")
+                return project
+
+        return run
+
+    steps = [
+        step(
+            "desc",
+            gen_desc,
+            "description",
+            "Generating description",
+            "Description generation",
+            "Using original description",
+        ),
+        step(
+            "status",
+            gen_project_status,
+            "status",
+            "Analyzing project status",
+            "Status analysis",
+            "Leaving the status for the next run",
+        ),
+        step(
+            "tech",
+            gen_tech_stack,
+            "tech stack",
+            "Extracting tech stack",
+            "Tech stack extraction",
+            "Using original languages",
+        ),
+    ]
+
+    if bucket is not None:
+        # None of the three reads what another writes, so they run side by side
+        return run_stage_graph(project, list(zip(INDIVIDUAL_STAGE_SPECS, steps)))
+    for run in steps:
+        project = run(project)
+    return project
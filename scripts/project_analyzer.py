@@ -0,0 +1,162 @@
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import PydanticOutputParser
+from pydantic import BaseModel, Field
+from typing import List, Literal
+from get_projects import Response
+from llm import get_model, model_id
+from llm_cache import cache_key, get_cache
+from tracing import current_span
+from prompt_builder import build_payload, estimate_prompt_tokens
+from tech_extractor import merge_technologies
+
+
+class ProjectAnalysis(BaseModel):
+    description: str = Field(
+        description="50-100 word plain text description of the repository"
+    )
+    status: Literal["c", "w", "p"] = Field(
+        description='"c" = completed, "w" = work in progress, "p" = planned'
+    )
+    technologies: List[str] = Field(
+        description="Technologies, frameworks, libraries, databases and tools used"
+    )
+
+
+# Field guidance shared with the batched prompt in batch_analyzer.py
+analysis_guidelines = """description
+- 50-100 words, a single paragraph of clean plain text.
+- No Markdown symbols, no HTML tags, no emojis or decorative characters.
+- Use the title as the main subject and the readme as the source of information.
+- Try to not mention the website URL or the number of commits.
+
+status (a single character)
+- "c" = Completed: deployment links, comprehensive documentation, stable
+  version tags, "complete" or "finished" mentions
+- "w" = Work in Progress: TODO sections, "under development", incomplete
+  features, development branches
+- "p" = Planned: minimal code, mostly documentation, "coming soon",
+  concept descriptions, early prototypes
+- A present live_website_url and a high num_commits suggest completion.
+
+technologies
+- Programming languages, frameworks, libraries, databases, tools, platforms
+  and CSS frameworks mentioned in the readme.
+- Use standard technology names (e.g., "PostgreSQL" not "postgres").
+- No version numbers and no duplicates. Use an empty list if none are found.
+"""
+
+analysis_sys_prompt = (
+    """
+You are a technical writing, project status and technology extraction expert.
+
+Goal
+Analyze a GitHub repository once and return three things together:
+a description, a project status and the technologies it uses.
+
+Source data (do not invent or ignore fields)
+repo_data = {{
+  "title":              "<title: str>",
+  "live_website_url":   "<live_website_url: str>",
+  "languages":          <languages: List[str]>,
+  "num_commits":        <num_commits: int>,
+  "readme":             "<readme: str>"
+}}
+
+"""
+    + analysis_guidelines
+    + """
+{format_instructions}
+"""
+)
+
+analysis_parser = PydanticOutputParser(pydantic_object=ProjectAnalysis)
+
+analysis_template = ChatPromptTemplate.from_messages(
+    [
+        ("system", analysis_sys_prompt),
+        ("human", "Analyze this repository: {repo_data}"),
+    ]
+).partial(format_instructions=analysis_parser.get_format_instructions())
+
+TEMPERATURE = 0.1
+
+
+def apply_analysis(repo_data: Response, analysis: ProjectAnalysis) -> Response:
+    """Copy a validated analysis onto the Response object"""
+    repo_data.description = analysis.description.strip()
+    repo_data.status = analysis.status
+    repo_data.languages = merge_technologies(
+        repo_data.languages,
+        [tech.strip() for tech in analysis.technologies if tech.strip()],
+    )
+    return repo_data
+
+
+def gen_project_analysis(repo_data: Response) -> Response:
+    """Generate description, status and tech stack with a single model call.
+
+    Raises OutputParserException when the model output does not validate
+    against ProjectAnalysis, so callers can fall back to the individual stages.
+    """
+    json_repo_data = build_payload(repo_data, "analysis").text
+
+    key = cache_key("analysis", analysis_template, model_id(), json_repo_data)
+    content = get_cache().get(key)
+    span = current_span()
+    span.set(title=repo_data.title, cache="miss" if content is None else "hit")
+    if content is not None:
+        return apply_analysis(repo_data, ProjectAnalysis.model_validate_json(content))
+
+    chain = analysis_template | get_model(TEMPERATURE)
+    estimate_prompt_tokens(analysis_template, repo_data=json_repo_data)
+    message = chain.invoke({"repo_data": json_repo_data})
+    span.record_usage(message)
+    analysis = analysis_parser.invoke(message)
+    get_cache().set(key, "analysis", analysis.model_dump_json())
+
+    return apply_analysis(repo_data, analysis)
+
+
+async def agen_project_analysis(repo_data: Response) -> Response:
+    """Async variant of gen_project_analysis for the concurrent pipeline"""
+    json_repo_data = build_payload(repo_data, "analysis").text
+
+    key = cache_key("analysis", analysis_template, model_id(), json_repo_data)
+    content = get_cache().get(key)
+    span = current_span()
+    span.set(title=repo_data.title, cache="miss" if content is None else "hit")
+    if content is not None:
+        return apply_analysis(repo_data, ProjectAnalysis.model_validate_json(content))
+
+    chain = analysis_template | get_model(TEMPERATURE)
+    estimate_prompt_tokens(analysis_template, repo_data=json_repo_data)
+    message = await chain.ainvoke({"repo_data": json_repo_data})
+    span.record_usage(message)
+    analysis = analysis_parser.invoke(message)
+    get_cache().set(key, "analysis", analysis.model_dump_json())
+
+    return apply_analysis(repo_data, analysis)
+
+
+if __name__ == "__main__":
+    example_repo_data = Response.model_validate(
+        {
+            "title": "AI-Resume-Parser",
+            "live_website_url": "https://ai-resume-parser.vercel.app",
+            "languages": ["TypeScript", "Python", "Dockerfile", "CSS"],
+            "num_commits": 172,
+            "readme": """# AI Resume Analyzer & Job Matching Platform
+
+## Live Demo
+[Check out the live platform here!](https://ai-resume-parser.vercel.app/)
+
+## Tech Stack
+- **Frontend:** Next.js, React, Tailwind CSS, Framer Motion, Chart.js
+- **Backend & Database:** Python, FastAPI, PostgreSQL, SQLAlchemy
+- **AI/ML:** scikit-learn, spaCy, LangChain
+- **Deployment:** Docker, AWS
+""",
+        }
+    )
+    res = gen_project_analysis(example_repo_data)
+    print(res.model_dump_json(indent=2))
@@ -0,0 +1,126 @@
+import json
+from typing import Any, Dict, NamedTuple, Optional
+from get_projects import Response
+from readme_compactor import trim_sections
+from tokens import count_tokens
+from tracing import current_span
+
+# Response fields each stage's prompt reads; everything else stays out of it
+PROMPT_FIELDS = {
+    "desc": ("title", "live_website_url", "languages", "num_commits", "readme"),
+    "status": ("title", "live_website_url", "languages", "num_commits", "readme"),
+    "tech": ("title", "languages", "readme"),
+    "analysis": ("title", "live_website_url", "languages", "num_commits", "readme"),
+    "batch": ("title", "live_website_url", "languages", "num_commits", "readme"),
+}
+
+# README sections that inform each stage most, kept first when trimming
+ANALYSIS_SECTIONS = (
+    "about",
+    "overview",
+    "description",
+    "features",
+    "tech stack",
+    "built with",
+    "technologies",
+    "status",
+    "roadmap",
+    "todo",
+    "demo",
+)
+STAGE_SECTIONS = {
+    "desc": ("about", "overview", "description", "introduction", "features"),
+    "status": ("status", "project status", "roadmap", "todo", "to do", "demo", "deployment"),
+    "tech": ("tech stack", "built with", "technologies", "stack", "architecture"),
+    "analysis": ANALYSIS_SECTIONS,
+    "batch": ANALYSIS_SECTIONS,
+}
+
+# Most tokens one repo's data may take in each stage's prompt
+DEFAULT_STAGE_BUDGETS = {
+    "desc": 2000,
+    "status": 1000,
+    "tech": 2000,
+    "analysis": 2500,
+    "batch": 1500,
+}
+
+_budgets: Dict[str, int] = dict(DEFAULT_STAGE_BUDGETS)
+
+
+class PromptPayload(NamedTuple):
+    data: Dict[str, Any]
+    text: str
+    tokens: int
+    # README tokens before trimming, when it had to be trimmed to fit
+    trimmed_from: Optional[int]
+
+
+def configure_stage_budgets(budgets: Dict[str, int]) -> None:
+    """Override the token budget of some stages for the rest of the run"""
+    unknown = [stage for stage in budgets if stage not in PROMPT_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown stage(s) {', '.join(unknown)}; choose from {', '.join(PROMPT_FIELDS)}"
+        )
+    _budgets.update(budgets)
+
+
+def stage_budget(stage: str) -> int:
+    return _budgets[stage]
+
+
+def dump_payload(data: Dict[str, Any]) -> str:
+    # Same compact form as Response.model_dump_json
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def build_payload(
+    repo_data: Response, stage: str, budget: Optional[int] = None
+) -> PromptPayload:
+    """The repo data a stage's prompt needs, trimmed to the stage's token budget.
+
+    Only the fields the stage reads are kept. When they still exceed the
+    budget the README keeps its intro and the sections most useful to the
+    stage (STAGE_SECTIONS) that fit, so a huge README can never blow up a
+    request's latency or quota. Trimming is extractive: summarizing would
+    take another model call per repo.
+    """
+    budget = budget or stage_budget(stage)
+    data = repo_data.model_dump(include=set(PROMPT_FIELDS[stage]))
+    text = dump_payload(data)
+    tokens = count_tokens(text)
+    trimmed_from = None
+
+    readme = data.get("readme") or ""
+    if readme and tokens > budget:
+        overhead = count_tokens(dump_payload({**data, "readme": ""}))
+        trimmed_from = count_tokens(readme)
+        readme_budget = budget - overhead
+        # JSON escaping makes the dumped README a little larger than the raw text
+        while tokens > budget and readme_budget > 0:
+            data["readme"] = trim_sections(
+                readme, readme_budget, STAGE_SECTIONS[stage], count_tokens
+            )
+            text = dump_payload(data)
+            tokens = count_tokens(text)
+            readme_budget -= max(1, tokens - budget)
+        if tokens > budget:
+            data["readme"] = ""
+            text = dump_payload(data)
+            tokens = count_tokens(text)
+        current_span().set(readme_trimmed_from=trimmed_from)
+
+    return PromptPayload(data, text, tokens, trimmed_from)
+
+
+def estimate_prompt_tokens(template: Any, **values: Any) -> int:
+    """Tokens of the whole formatted prompt, to compare with the reported usage.
+
+    Called right before each model request, so it also counts the requests.
+    """
+    tokens = count_tokens(template.format(**values))
+    span = current_span()
+    span.set(estimated_tokens=tokens)
+    span.add("model_calls")
+    return tokens
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Pace model calls against a requests-per-minute and tokens-per-minute budget.
+
+    Both budgets refill continuously. A caller reserves one request plus its
+    estimated token count and is told how long to wait; reservations may push
+    the buckets negative so that concurrent callers queue up fairly.
+    """
+
+    def __init__(self, requests_per_minute: float = 15, tokens_per_minute: float = 1_000_000):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(
+            self.requests_per_minute,
+            self._requests + elapsed * self.requests_per_minute / 60,
+        )
+        self._tokens = min(
+            self.tokens_per_minute,
+            self._tokens + elapsed * self.tokens_per_minute / 60,
+        )
+
+    def reserve(self, tokens: int = 0, requests: float = 1) -> float:
+        """Reserve capacity for one call (or several) and return the seconds to wait"""
+        with self._lock:
+            self._refill(time.monotonic())
+            # A single call larger than the whole minute budget still has to go through
+            tokens = min(tokens, self.tokens_per_minute)
+            self._requests -= requests
+            self._tokens -= tokens
+
+            wait = 0.0
+            if self._requests < 0:
+                wait = max(wait, -self._requests * 60 / self.requests_per_minute)
+            if self._tokens < 0:
+                wait = max(wait, -self._tokens * 60 / self.tokens_per_minute)
+            return wait
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until a call of the given size may be sent"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        """Wait without blocking the event loop until a call may be sent"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
@@ -0,0 +1,217 @@
+import re
+from typing import Callable, List, NamedTuple, Sequence, Tuple
+from get_projects import Response
+from tokens import count_tokens, token_counter
+
+DEFAULT_README_TOKEN_BUDGET = 1500
+
+# Sections that describe how to run or credit a project rather than what it is
+BOILERPLATE_SECTIONS = (
+    "table of contents",
+    "contents",
+    "getting started",
+    "prerequisites",
+    "installation",
+    "install",
+    "setup",
+    "set up",
+    "running",
+    "running the application",
+    "running locally",
+    "local development",
+    "development setup",
+    "contributing",
+    "contributors",
+    "license",
+    "acknowledgments",
+    "acknowledgements",
+    "team",
+    "authors",
+    "contact",
+    "support",
+)
+
+HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+FENCED_CODE_RE = re.compile(r"^[ \t]*(```|~~~).*?^[ \t]*\1[^\n]*$", re.DOTALL | re.MULTILINE)
+IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+LINKED_IMAGE_RE = re.compile(r"\[\s*!\[[^\]]*\]\([^)]*\)\s*\]\([^)]*\)")
+LINK_RE = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+HTML_TAG_RE = re.compile(r"</?[a-zA-Z][^>]*>")
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+EMPHASIS_RE = re.compile(r"(\*\*|__|`)")
+RULE_RE = re.compile(r"^\s*([-*_=]\s*){3,}$")
+
+
+class CompactionReport(NamedTuple):
+    title: str
+    tokens_before: int
+    tokens_after: int
+
+
+def _normalize_heading(heading: str) -> str:
+    heading = re.sub(r"[^a-z &]", "", heading.lower())
+    return re.sub(r"\s+", " ", heading).strip(" &")
+
+
+def _drop_boilerplate_sections(lines: List[str]) -> List[str]:
+    kept = []
+    skip_level = 0
+    for line in lines:
+        match = HEADING_RE.match(line)
+        if match:
+            level = len(match.group(1))
+            if skip_level and level > skip_level:
+                continue
+            skip_level = 0
+            heading = _normalize_heading(match.group(2))
+            if any(
+                heading == section or heading.startswith(section + " ")
+                for section in BOILERPLATE_SECTIONS
+            ):
+                skip_level = level
+                continue
+        elif skip_level:
+            continue
+        kept.append(line)
+    return kept
+
+
+def truncate_to_budget(
+    text: str, max_tokens: int, count: Callable[[str], int] = count_tokens
+) -> str:
+    """Keep whole leading paragraphs of text that fit in max_tokens"""
+    if count(text) <= max_tokens:
+        return text
+    kept = []
+    used = 0
+    for paragraph in text.split("\n\n"):
+        cost = count(paragraph) + 1
+        if used + cost > max_tokens:
+            break
+        kept.append(paragraph)
+        used += cost
+    if kept:
+        return "\n\n".join(kept)
+
+    # A single paragraph larger than the budget is cut mid-paragraph
+    cut = text[: max_tokens * 4]
+    while cut and count(cut) > max_tokens:
+        cut = cut[: int(len(cut) * 0.9)]
+    return cut
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """Split Markdown into (normalized heading, text) sections, the intro first"""
+    sections: List[Tuple[str, List[str]]] = [("", [])]
+    for line in text.split("\n"):
+        match = HEADING_RE.match(line)
+        if match:
+            sections.append((_normalize_heading(match.group(2)), []))
+        sections[-1][1].append(line)
+    sections = [(heading, "\n".join(lines).strip()) for heading, lines in sections]
+    return [(heading, body) for heading, body in sections if body]
+
+
+def trim_sections(
+    text: str,
+    max_tokens: int,
+    priorities: Sequence[str] = (),
+    count: Callable[[str], int] = count_tokens,
+) -> str:
+    """Keep the sections of text that fit in max_tokens, the most useful first.
+
+    The intro (the first section, usually under the title) goes first, then
+    sections whose heading starts with one of priorities, in that order,
+    then the rest in README order. Sections are kept whole and in their
+    original order; the most useful one that did not fit is cut down to
+    whatever budget is left.
+    """
+    if count(text) <= max_tokens:
+        return text
+    sections = split_sections(text)
+
+    def rank(i: int) -> int:
+        if i == 0:
+            return -1
+        heading = sections[i][0]
+        for k, priority in enumerate(priorities):
+            if heading == priority or heading.startswith(priority + " "):
+                return k
+        return len(priorities) + i
+
+    kept = {}
+    used = 0
+    skipped = []
+    for i in sorted(range(len(sections)), key=rank):
+        cost = count(sections[i][1]) + 1
+        if used + cost <= max_tokens:
+            kept[i] = sections[i][1]
+            used += cost
+        else:
+            skipped.append(i)
+    if skipped and max_tokens - used > 1:
+        first = skipped[0]
+        cut = truncate_to_budget(sections[first][1], max_tokens - used - 1, count)
+        # A heading left without any of its text is only noise
+        if not sections[first][0] or "\n" in cut.strip():
+            kept[first] = cut
+    return "\n\n".join(kept[i] for i in sorted(kept) if kept[i])
+
+
+def compact_readme(readme: str, max_tokens: int = DEFAULT_README_TOKEN_BUDGET) -> str:
+    """Strip markup, code and boilerplate from a README and cap it to a token budget"""
+    if not readme:
+        return readme or ""
+
+    text = readme.replace("\r\n", "\n")
+    text = HTML_COMMENT_RE.sub("", text)
+    text = FENCED_CODE_RE.sub("", text)
+    text = LINKED_IMAGE_RE.sub("", text)
+    text = IMAGE_RE.sub("", text)
+    text = LINK_RE.sub(r"\1", text)
+    text = HTML_TAG_RE.sub("", text)
+    text = EMPHASIS_RE.sub("", text)
+
+    lines = []
+    for line in _drop_boilerplate_sections(text.split("\n")):
+        line = line.strip()
+        if RULE_RE.match(line):
+            continue
+        # Navigation rows such as "Intro • Features • Demo" carry no content
+        if (line.count("•") >= 2 or line.endswith("•")) and len(
+            line.replace("•", "").split()
+        ) <= 12:
+            continue
+        lines.append(line)
+
+    text = "\n".join(lines)
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n\s*\n+", "\n\n", text).strip()
+
+    return truncate_to_budget(text, max_tokens)
+
+
+def compact_projects(
+    projects: List[Response], max_tokens: int = DEFAULT_README_TOKEN_BUDGET
+) -> List[CompactionReport]:
+    """Compact every project README in place and report the token savings"""
+    return [compact_project(project, max_tokens) for project in projects]
+
+
+def compact_project(
+    project: Response, max_tokens: int = DEFAULT_README_TOKEN_BUDGET
+) -> CompactionReport:
+    """Compact one project README in place"""
+    before = count_tokens(project.readme or "")
+    project.readme = compact_readme(project.readme or "", max_tokens)
+    return CompactionReport(project.title, before, count_tokens(project.readme))
+
+
+def print_compaction_report(reports: List[CompactionReport]) -> None:
+    print(f"README compaction (tokens counted with {token_counter()}):")
+    for report in reports:
+        print(f"  - {report.title}: {report.tokens_before} -> {report.tokens_after}")
+    before = sum(report.tokens_before for report in reports)
+    after = sum(report.tokens_after for report in reports)
+    saved = 100 * (before - after) / before if before else 0
+    print(f"  Total: {before} -> {after} tokens ({saved:.0f}% saved)")
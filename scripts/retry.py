@@ -0,0 +1,359 @@
+import asyncio
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, TypeVar
+from tracing import get_tracer
+
+T = TypeVar("T")
+
+RATE_LIMITED = "rate_limited"
+# A per-day quota ran out; retrying before the quota window resets is pointless
+QUOTA_EXHAUSTED = "quota_exhausted"
+TRANSIENT = "transient"
+FATAL = "fatal"
+
+# Exception class names across google-api-core (langchain-google-genai 2.x),
+# langchain-core's provider-neutral ModelError family, requests and builtins.
+# Matching on the MRO keeps every SDK optional.
+RATE_LIMIT_TYPES = {
+    "ResourceExhausted",
+    "TooManyRequests",
+    "ModelRateLimitError",
+    "GoogleRateLimitError",
+}
+TRANSIENT_TYPES = {
+    "ServiceUnavailable",
+    "InternalServerError",
+    "BadGateway",
+    "GatewayTimeout",
+    "DeadlineExceeded",
+    "ModelAPIError",
+    "ModelConnectionError",
+    "ModelTimeoutError",
+    "ConnectionError",
+    "Timeout",
+    "TimeoutError",
+}
+RATE_LIMIT_TEXT = re.compile(r"\b429\b|ResourceExhausted|RESOURCE_EXHAUSTED|quota", re.IGNORECASE)
+TRANSIENT_TEXT = re.compile(
+    r"\b(500|502|503|504)\b|UNAVAILABLE|DEADLINE_EXCEEDED|timed out|timeout|"
+    r"connection (reset|aborted|refused)",
+    re.IGNORECASE,
+)
+# Gemini names the exhausted quota, e.g. "GenerateRequestsPerDayPerProjectPerModel-FreeTier"
+DAILY_QUOTA_TEXT = re.compile(r"PerDay|per day|daily (limit|quota)", re.IGNORECASE)
+# A reply that arrived but did not parse or validate; the request itself worked,
+# so asking again in a different shape may succeed
+OUTPUT_ERROR_TYPES = {"OutputParserException", "ValidationError", "JSONDecodeError"}
+# Gemini puts the server's suggestion in the error text, e.g.
+# "retry_delay { seconds: 37 }" or "Please retry in 37.4s."
+RETRY_AFTER_TEXT = re.compile(
+    r"retry_delay\s*\{\s*seconds:\s*(\d+(?:\.\d+)?)|retry (?:in|after) (\d+(?:\.\d+)?)\s*s",
+    re.IGNORECASE,
+)
+
+
+def _error_chain(error: BaseException) -> Iterator[BaseException]:
+    """The error and the exceptions it wraps, as LangChain often re-raises"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    for attr in ("status_code", "code"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def classify_error(error: BaseException) -> str:
+    """Return RATE_LIMITED, QUOTA_EXHAUSTED, TRANSIENT or FATAL for a failed model call"""
+    kind = _classify(error)
+    if kind == RATE_LIMITED and any(
+        DAILY_QUOTA_TEXT.search(str(cause)) for cause in _error_chain(error)
+    ):
+        return QUOTA_EXHAUSTED
+    return kind
+
+
+def _classify(error: BaseException) -> str:
+    # A reply that failed to parse may quote anything, "500" or "quota per
+    # day" included, so it is never read as a provider error
+    if is_output_error(error):
+        return FATAL
+    for cause in _error_chain(error):
+        names = {cls.__name__ for cls in type(cause).__mro__}
+        status = _status_code(cause)
+        if names & RATE_LIMIT_TYPES or status == 429:
+            return RATE_LIMITED
+        if names & TRANSIENT_TYPES or (status is not None and 500 <= status < 600):
+            return TRANSIENT
+
+    # Wrapped errors sometimes only keep the provider's message
+    message = str(error)
+    if RATE_LIMIT_TEXT.search(message):
+        return RATE_LIMITED
+    if TRANSIENT_TEXT.search(message):
+        return TRANSIENT
+    return FATAL
+
+
+def is_output_error(error: BaseException) -> bool:
+    """Whether a model call failed on the content of its reply, not on the request"""
+    return any(
+        {cls.__name__ for cls in type(cause).__mro__} & OUTPUT_ERROR_TYPES
+        for cause in _error_chain(error)
+    )
+
+
+def retry_after_hint(error: BaseException) -> Optional[float]:
+    """Seconds the server asked us to wait, from an attribute, header or message"""
+    for cause in _error_chain(error):
+        value = getattr(cause, "retry_after", None)
+        if isinstance(value, (int, float)):
+            return float(value)
+        headers = getattr(getattr(cause, "response", None), "headers", None) or {}
+        try:
+            return float(headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            pass
+        match = RETRY_AFTER_TEXT.search(str(cause))
+        if match:
+            return float(match.group(1) or match.group(2))
+    return None
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with jitter, honoring server retry-after hints"""
+
+    max_attempts: int = 4
+    base_delay: float = 2.0
+    rate_limit_base_delay: float = 15.0
+    max_delay: float = 120.0
+
+    def delay(self, attempt: int, error: BaseException, kind: str) -> float:
+        """Seconds to wait before retry number attempt (1-based)"""
+        hint = retry_after_hint(error)
+        if hint is not None:
+            # Small jitter so concurrent workers do not retry in lockstep
+            return min(self.max_delay, hint) + random.uniform(0, 1)
+        base = self.rate_limit_base_delay if kind == RATE_LIMITED else self.base_delay
+        ceiling = min(self.max_delay, base * 2 ** (attempt - 1))
+        # "Equal jitter": never retry sooner than half the exponential step
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+class StageRetryStats:
+    def __init__(self):
+        self.calls = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.transient = 0
+        self.failures = 0
+        self.sleep_seconds = 0.0
+        # Stage-graph and tenant threads update the same stage's counters
+        self._lock = threading.Lock()
+
+    def add(self, **counts: float) -> None:
+        with self._lock:
+            for counter, amount in counts.items():
+                setattr(self, counter, getattr(self, counter) + amount)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.calls} calls, {self.retries} retries "
+            f"({self.rate_limited} rate limited, {self.transient} transient), "
+            f"{self.failures} failed, {self.sleep_seconds:.1f}s backing off"
+        )
+
+
+_stats: Dict[str, StageRetryStats] = {}
+_stats_lock = threading.Lock()
+_quota_exhausted = threading.Event()
+
+
+def stage_stats(stage: str) -> StageRetryStats:
+    with _stats_lock:
+        return _stats.setdefault(stage, StageRetryStats())
+
+
+def retry_stats() -> Dict[str, StageRetryStats]:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_retry_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def daily_quota_exhausted() -> bool:
+    """Whether a model call failed because a per-day quota ran out"""
+    return _quota_exhausted.is_set()
+
+
+def print_retry_stats() -> None:
+    for stage, stats in sorted(retry_stats().items()):
+        print(f"🔁 {stage}: {stats}")
+
+
+def _record_failure(
+    stage: str, error: BaseException, attempt: int, policy: RetryPolicy
+) -> Optional[float]:
+    """Count a failed attempt and return the backoff, or None to give up"""
+    stats = stage_stats(stage)
+    kind = classify_error(error)
+    if kind in (RATE_LIMITED, QUOTA_EXHAUSTED):
+        stats.add(rate_limited=1)
+    elif kind == TRANSIENT:
+        stats.add(transient=1)
+    if kind == QUOTA_EXHAUSTED:
+        _quota_exhausted.set()
+
+    if kind in (FATAL, QUOTA_EXHAUSTED) or attempt >= policy.max_attempts:
+        stats.add(failures=1)
+        return None
+
+    delay = policy.delay(attempt, error, kind)
+    stats.add(retries=1, sleep_seconds=delay)
+    reason = "Rate limit hit" if kind == RATE_LIMITED else "Transient error"
+    print(
+        f"    {reason} in {stage}, waiting {delay:.1f} seconds "
+        f"(attempt {attempt + 1}/{policy.max_attempts})..."
+    )
+    return delay
+
+
+def call_with_retry(
+    stage: str,
+    func: Callable[..., T],
+    *args: Any,
+    policy: Optional[RetryPolicy] = None,
+    **kwargs: Any,
+) -> T:
+    """Call func, retrying rate limits and transient errors with backoff.
+
+    The whole call, retries included, is traced as one span named after the
+    stage, which the stage function can annotate through current_span.
+    """
+    policy = policy or DEFAULT_RETRY_POLICY
+    attempt = 1
+    with get_tracer().span(stage) as span:
+        while True:
+            stage_stats(stage).add(calls=1)
+            try:
+                return func(*args, **kwargs)
+            except Exception as error:
+                delay = _record_failure(stage, error, attempt, policy)
+                if delay is None:
+                    raise
+            span.add("retries")
+            time.sleep(delay)
+            attempt += 1
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for in-flight model calls.
+
+    Every success raises the limit by 1/limit (about +1 per round of calls)
+    up to maximum; a throttled call halves it, at most once per cooldown so
+    a burst of 429s from one overload only counts once.
+    """
+
+    def __init__(
+        self,
+        maximum: int,
+        minimum: int = 1,
+        initial: Optional[int] = None,
+        decrease_factor: float = 0.5,
+        cooldown: float = 5.0,
+    ):
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.limit = float(initial or self.maximum)
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.decreases = 0
+        self._last_decrease = float("-inf")
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Created lazily so the limiter can be built outside the event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    def on_success(self) -> None:
+        self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def on_throttle(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.decreases += 1
+        self.limit = max(self.minimum, self.limit * self.decrease_factor)
+
+    def __str__(self) -> str:
+        return f"concurrency limit {self.limit:.1f}/{self.maximum} ({self.decreases} decreases)"
+
+
+async def acall_with_retry(
+    stage: str,
+    func: Callable[..., Awaitable[T]],
+    *args: Any,
+    policy: Optional[RetryPolicy] = None,
+    limiter: Optional[AdaptiveLimiter] = None,
+    **kwargs: Any,
+) -> T:
+    """Async counterpart of call_with_retry that also feeds an AIMD limiter"""
+    policy = policy or DEFAULT_RETRY_POLICY
+    attempt = 1
+    with get_tracer().span(stage) as span:
+        while True:
+            stage_stats(stage).add(calls=1)
+            try:
+                if limiter is None:
+                    result = await func(*args, **kwargs)
+                else:
+                    async with limiter:
+                        result = await func(*args, **kwargs)
+                if limiter is not None:
+                    limiter.on_success()
+                return result
+            except Exception as error:
+                if limiter is not None and classify_error(error) == RATE_LIMITED:
+                    limiter.on_throttle()
+                delay = _record_failure(stage, error, attempt, policy)
+                if delay is None:
+                    raise
+            span.add("retries")
+            await asyncio.sleep(delay)
+            attempt += 1
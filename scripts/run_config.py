@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+from dedupe import DEFAULT_SIMILARITY_THRESHOLD
+from llm import DEFAULT_BATCH_TOKEN_BUDGET, DEFAULT_MAX_BATCH_SIZE
+from readme_compactor import DEFAULT_README_TOKEN_BUDGET
+from scheduler import DailyQuota
+
+
+@dataclass
+class RunConfig:
+    """How main.py processes an account's repos, shared by every tenant of a run.
+
+    cli.run_config_from_args builds it from the command line; the defaults
+    match a plain `python main.py`.
+    """
+
+    # One combined analysis call per repo instead of three stages
+    fused: bool = True
+    # Repos analyzed at once by the async pipeline (0 = one after another)
+    concurrency: int = 0
+    requests_per_minute: float = 15
+    tokens_per_minute: float = 1_000_000
+    incremental: bool = False
+    # README token budget; None sends READMEs uncompacted
+    readme_budget: Optional[int] = DEFAULT_README_TOKEN_BUDGET
+    output_format: str = "pretty"
+    batch: bool = False
+    batch_tokens: int = DEFAULT_BATCH_TOKEN_BUDGET
+    batch_size: int = DEFAULT_MAX_BATCH_SIZE
+    dedupe: bool = False
+    dedupe_threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+    # Daily budgets; with one, repos are processed in priority order
+    quota: Optional[DailyQuota] = None
+    priority_weights: Optional[Dict[str, float]] = None
+    snapshot: bool = True
+    # None writes the snapshot into the run's data directory
+    snapshot_dir: Optional[str] = None
@@ -0,0 +1,306 @@
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from get_projects import Response
+from prompt_builder import build_payload
+from rate_limit import TokenBucket
+from retry import daily_quota_exhausted
+from storage import write_json
+from tracing import get_tracer
+
+QUOTA_PATH = os.path.join("./data", "quota.json")
+# Gemini's per-day quotas reset at midnight Pacific time
+QUOTA_TIMEZONE = "America/Los_Angeles"
+
+PRIORITY_SIGNALS = ("commits", "live", "recency", "changed")
+DEFAULT_PRIORITY_WEIGHTS = {"commits": 1.0, "live": 1.0, "recency": 1.0, "changed": 2.0}
+
+# Tokens each stage's prompt template adds around the repo data
+PROMPT_OVERHEAD_TOKENS = {
+    "analysis": 650,
+    "desc": 300,
+    "status": 350,
+    "tech": 275,
+    "batch": 800,
+}
+
+
+class RepoCost(NamedTuple):
+    requests: float
+    tokens: float
+
+
+class ScheduledRepo(NamedTuple):
+    location: int
+    project: Response
+    score: float
+    cost: RepoCost
+
+
+def estimate_cost(project: Response, fused: bool = True, batch_size: int = 0) -> RepoCost:
+    """Model requests and prompt tokens one repo is expected to use.
+
+    Cache hits, the local status heuristics and rule-based tech extraction
+    make the real cost lower; a failed combined call falling back to the
+    individual stages makes it higher.
+    """
+    if batch_size:
+        # A batched request's template is shared by the repos packed into it
+        tokens = build_payload(project, "batch").tokens
+        return RepoCost(1 / batch_size, tokens + PROMPT_OVERHEAD_TOKENS["batch"] / batch_size)
+    stages = ("analysis",) if fused else ("desc", "status", "tech")
+    return RepoCost(
+        len(stages),
+        sum(build_payload(project, stage).tokens + PROMPT_OVERHEAD_TOKENS[stage] for stage in stages),
+    )
+
+
+def priority_signals(
+    project: Response, location: int, listing_size: int, change: str, max_commits: int
+) -> Dict[str, float]:
+    """Each ranking signal of a repo, scaled to 0-1"""
+    return {
+        "commits": math.log1p(project.num_commits) / math.log1p(max_commits) if max_commits else 0.0,
+        "live": 1.0 if project.live_website_url else 0.0,
+        # The listing comes newest first
+        "recency": 1 - location / max(1, listing_size - 1),
+        "changed": 0.0 if change == "unchanged" else 1.0,
+    }
+
+
+def model_usage() -> RepoCost:
+    """Model requests and prompt tokens this process has spent so far"""
+    requests = tokens = 0
+    for row in get_tracer().summary().values():
+        requests += row.get("model_calls", 0)
+        # Reported usage when the model gives it, the local estimate otherwise
+        tokens += row.get("input_tokens") or row.get("estimated_tokens", 0)
+    return RepoCost(requests, tokens)
+
+
+def _quota_zone():
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+    try:
+        return ZoneInfo(QUOTA_TIMEZONE)
+    except ZoneInfoNotFoundError:
+        # Windows without the tzdata package
+        from datetime import timezone
+
+        return timezone.utc
+
+
+class DailyQuota:
+    """Model requests and tokens spent against per-day budgets, kept across runs.
+
+    Spending is stored per quota day in path, so a second run on the same
+    day starts from what the first one used. A budget of 0 is unlimited.
+    """
+
+    def __init__(
+        self,
+        requests_per_day: float = 0,
+        tokens_per_day: float = 0,
+        path: str = QUOTA_PATH,
+    ):
+        self.requests_per_day = requests_per_day
+        self.tokens_per_day = tokens_per_day
+        self.path = path
+        self._lock = threading.Lock()
+        self.day, self.requests, self.tokens = self._load()
+
+    def _today(self) -> str:
+        return datetime.now(_quota_zone()).date().isoformat()
+
+    def _load(self) -> Tuple[str, float, float]:
+        today = self._today()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return today, 0, 0
+        if data.get("day") != today:
+            return today, 0, 0
+        return today, data.get("requests", 0), data.get("tokens", 0)
+
+    def remaining(self) -> RepoCost:
+        with self._lock:
+            if self.day != self._today():
+                self.day, self.requests, self.tokens = self._today(), 0, 0
+            return RepoCost(
+                self.requests_per_day - self.requests if self.requests_per_day else math.inf,
+                self.tokens_per_day - self.tokens if self.tokens_per_day else math.inf,
+            )
+
+    def fits(self, cost: RepoCost, remaining: Optional[RepoCost] = None) -> bool:
+        remaining = remaining or self.remaining()
+        return cost.requests <= remaining.requests and cost.tokens <= remaining.tokens
+
+    def charge(self, cost: RepoCost) -> None:
+        """Add spending to the current day and save it"""
+        if not cost.requests and not cost.tokens:
+            return
+        self.remaining()
+        with self._lock:
+            self.requests += cost.requests
+            self.tokens += cost.tokens
+            write_json(
+                self.path,
+                {"day": self.day, "requests": self.requests, "tokens": self.tokens},
+            )
+
+    def resets_at(self) -> datetime:
+        now = datetime.now(_quota_zone())
+        return datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), now.tzinfo)
+
+    def __str__(self) -> str:
+        def used(spent: float, budget: float) -> str:
+            return f"{spent:,.0f}/{budget:,.0f}" if budget else f"{spent:,.0f}"
+
+        return (
+            f"{used(self.requests, self.requests_per_day)} requests, "
+            f"{used(self.tokens, self.tokens_per_day)} tokens used on {self.day}"
+        )
+
+
+class QuotaScheduler:
+    """Send repos to the model in priority order within per-minute and per-day budgets.
+
+    plan() ranks the repos by a weighted score and admits them while the
+    day's remaining budget lasts; during the run admit() re-checks each repo
+    against what was actually spent and defers the rest once the budget or
+    the API's daily quota runs out, so the least important repos wait for
+    the next quota window rather than whichever happened to come last.
+    """
+
+    def __init__(
+        self,
+        quota: DailyQuota,
+        bucket: TokenBucket,
+        weights: Optional[Dict[str, float]] = None,
+        fused: bool = True,
+        batch_size: int = 0,
+    ):
+        self.quota = quota
+        self.bucket = bucket
+        self.weights = {**DEFAULT_PRIORITY_WEIGHTS, **(weights or {})}
+        self.fused = fused
+        self.batch_size = batch_size
+        self.admitted: List[ScheduledRepo] = []
+        self.deferred: List[ScheduledRepo] = []
+        self._costs: Dict[str, RepoCost] = {}
+        # Near-duplicate -> its representative
+        self._leaders: Dict[str, str] = {}
+        self._deferred_titles = set()
+        # Admitted repos deferred during the run
+        self._late = 0
+        self._usage = model_usage()
+
+    def score(self, signals: Dict[str, float]) -> float:
+        return sum(self.weights[name] * value for name, value in signals.items())
+
+    def plan(
+        self,
+        candidates: Sequence[Tuple[int, Response, str]],
+        listing_size: int,
+        duplicate_of: Optional[Dict[str, str]] = None,
+    ) -> List[Tuple[int, Response]]:
+        """Rank (location, repo, change) candidates and return the admitted ones in order.
+
+        A repo too large for what is left of the day's budget is deferred,
+        but smaller, lower ranked ones may still be admitted after it.
+        Near-duplicates reuse their representative's analysis, so they cost
+        nothing and are admitted or deferred right after it.
+        """
+        duplicate_of = duplicate_of or {}
+        titles = {project.title for _, project, _ in candidates}
+        max_commits = max((project.num_commits for _, project, _ in candidates), default=0)
+
+        repos = []
+        followers: Dict[str, List[ScheduledRepo]] = {}
+        for location, project, change in candidates:
+            representative = duplicate_of.get(project.title)
+            signals = priority_signals(project, location, listing_size, change, max_commits)
+            if representative in titles:
+                self._leaders[project.title] = representative
+                repo = ScheduledRepo(location, project, self.score(signals), RepoCost(0, 0))
+                followers.setdefault(representative, []).append(repo)
+                continue
+            cost = estimate_cost(project, self.fused, self.batch_size)
+            repos.append(ScheduledRepo(location, project, self.score(signals), cost))
+
+        remaining = self.quota.remaining()
+        for repo in sorted(repos, key=lambda repo: (-repo.score, repo.location)):
+            group = [repo] + followers.get(repo.project.title, [])
+            if self.quota.fits(repo.cost, remaining):
+                remaining = RepoCost(
+                    remaining.requests - repo.cost.requests, remaining.tokens - repo.cost.tokens
+                )
+                self.admitted.extend(group)
+            else:
+                self.deferred.extend(group)
+
+        self._costs = {repo.project.title: repo.cost for repo in self.admitted}
+        self._deferred_titles = {repo.project.title for repo in self.deferred}
+        return [(repo.location, repo.project) for repo in self.admitted]
+
+    def admit(self, title: str) -> bool:
+        """Whether an admitted repo may still go to the model, given what was spent"""
+        if title in self._deferred_titles:
+            return False
+        cost = self._costs.get(title, RepoCost(0, 0))
+        leader = self._leaders.get(title)
+        if leader is None:
+            allowed = not cost.requests or (
+                not daily_quota_exhausted() and self.quota.fits(cost)
+            )
+        else:
+            # A near-duplicate waits for its representative
+            allowed = leader not in self._deferred_titles
+        if allowed:
+            return True
+        self.deferred.extend(repo for repo in self.admitted if repo.project.title == title)
+        self._deferred_titles.add(title)
+        self._late += 1
+        return False
+
+    def settle(self, pace: bool = True) -> RepoCost:
+        """Charge the model calls made since the last settle to the daily quota.
+
+        With pace, also wait as long as the per-minute budget requires
+        before the next call; calls answered from the cache cost nothing.
+        """
+        usage = model_usage()
+        spent = RepoCost(
+            usage.requests - self._usage.requests, usage.tokens - self._usage.tokens
+        )
+        self._usage = usage
+        self.quota.charge(spent)
+        if pace and spent.requests:
+            wait = self.bucket.reserve(int(spent.tokens), spent.requests)
+            if wait > 0:
+                print(f"  - Waiting {wait:.1f} seconds for the per-minute budget...")
+                time.sleep(wait)
+        return spent
+
+    def print_report(self) -> None:
+        """Summarize the day's spending and list what was deferred, most important first"""
+        print(
+            f"📋 Priority schedule: {len(self.admitted) - self._late} repos scheduled, "
+            f"{len(self.deferred)} deferred; {self.quota}"
+        )
+        if not self.deferred:
+            return
+        reason = "the API's daily quota ran out" if daily_quota_exhausted() else "over budget"
+        resets = self.quota.resets_at().strftime("%Y-%m-%d %H:%M %Z")
+        print(f"⏭️  Deferred {len(self.deferred)} repos ({reason}) to the window starting {resets}:")
+        for repo in sorted(self.deferred, key=lambda repo: (-repo.score, repo.location)):
+            print(
+                f"  - {repo.project.title} (score {repo.score:.2f}, "
+                f"~{repo.cost.requests:g} requests, ~{repo.cost.tokens:,.0f} tokens)"
+            )
+        print("  Rerun with --incremental after the reset to process them")
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Static, precompressed snapshot of the final project list for the site.
+
+Each snapshot is the list GET /api/projects returns, in the shape of the
+Project type in types/project.ts, written as projects.<hash>.json with .gz
+and (with the brotli extra installed) .br variants. The manifest
+projects.snapshot.json names the current files and their strong ETags, so
+app/api/projects/snapshot/route.ts can answer 304 without reading them.
+Both sides default to the site's public/snapshots directory, or to
+PROJECTS_SNAPSHOT_DIR when it is set (as an absolute path, since the site
+runs from the repo root and these scripts from scripts/).
+Usage: python snapshot.py                      (build from data/all_projects.json)
+       python snapshot.py --out /tmp/snapshots
+       python snapshot.py --validate
+"""
+
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+from manifest import ALL_PROJECTS_PATH
+from storage import atomic_open, read_entries, write_json
+
+# The directory app/api/projects/snapshot/route.ts reads, seen from scripts/
+SNAPSHOT_DIR = os.getenv("PROJECTS_SNAPSHOT_DIR") or os.path.join("..", "public", "snapshots")
+SNAPSHOT_MANIFEST = "projects.snapshot.json"
+SNAPSHOT_VERSION = 1
+# Older snapshots kept so clients holding their hashed URL can still fetch them
+SNAPSHOTS_KEPT = 3
+
+# The Project type in types/project.ts: field -> (type, required)
+PROJECT_SCHEMA = {
+    "position": (int, True),
+    "title": (str, True),
+    "description": (str, True),
+    "technologies": (list, True),
+    "githubLink": (str, False),
+    "playStoreLink": (str, False),
+    "liveLink": (str, False),
+    "status": (str, True),
+}
+PROJECT_STATUSES = ("Completed", "In Progress", "Planned")
+# The pipeline's status names that the site spells differently
+STATUS_ALIASES = {"Work in Progress": "In Progress"}
+
+
+class Snapshot(NamedTuple):
+    sha256: str
+    count: int
+    # Content coding ("identity", "gzip", "br") -> file name
+    files: Dict[str, str]
+    etags: Dict[str, str]
+    changed: bool
+
+
+def snapshot_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """An aggregate entry (create_project_json in either CLI) as a site Project"""
+    project = {
+        "position": entry["position"] if "position" in entry else entry.get("location"),
+        **{
+            field: entry[field]
+            for field in PROJECT_SCHEMA
+            if field != "position" and field in entry
+        },
+    }
+    status = project.get("status")
+    project["status"] = STATUS_ALIASES.get(status, status)
+    return project
+
+
+def validate_projects(projects: Any) -> List[str]:
+    """Every way the snapshot's projects differ from the Project schema"""
+    if not isinstance(projects, list):
+        return [f"expected a list of projects, got {type(projects).__name__}"]
+
+    errors = []
+    titles = set()
+    previous_position = None
+    for i, project in enumerate(projects):
+        where = f"projects[{i}]"
+        if not isinstance(project, dict):
+            errors.append(f"{where}: expected an object")
+            continue
+        for field, (expected, required) in PROJECT_SCHEMA.items():
+            if field not in project:
+                if required:
+                    errors.append(f"{where}.{field}: missing")
+                continue
+            value = project[field]
+            # bool is an int subclass, but never a valid position
+            if not isinstance(value, expected) or isinstance(value, bool):
+                errors.append(f"{where}.{field}: expected {expected.__name__}, got {value!r}")
+        for field in project.keys() - PROJECT_SCHEMA.keys():
+            errors.append(f"{where}.{field}: not a Project field")
+
+        technologies = project.get("technologies")
+        if isinstance(technologies, list) and not all(isinstance(t, str) for t in technologies):
+            errors.append(f"{where}.technologies: expected a list of strings")
+        if project.get("status") not in PROJECT_STATUSES:
+            errors.append(
+                f"{where}.status: {project.get('status')!r} is not one of {', '.join(PROJECT_STATUSES)}"
+            )
+        if project.get("title") in titles:
+            errors.append(f"{where}.title: duplicate {project['title']!r}")
+        titles.add(project.get("title"))
+
+        position = project.get("position")
+        if isinstance(position, int):
+            if previous_position is not None and position <= previous_position:
+                errors.append(f"{where}.position: {position} is not after {previous_position}")
+            previous_position = position
+    return errors
+
+
+def _brotli() -> Optional[Any]:
+    try:
+        import brotli
+
+        return brotli
+    except ImportError:
+        return None
+
+
+def encode_variants(body: bytes) -> Dict[str, bytes]:
+    """The body under every content coding the snapshot is served with"""
+    # mtime=0 keeps the gzip bytes, and so their ETag, stable across runs
+    variants = {"identity": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    brotli = _brotli()
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+    return variants
+
+
+def load_snapshot_manifest(out_dir: str = SNAPSHOT_DIR) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(out_dir, SNAPSHOT_MANIFEST), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _prune(out_dir: str, keep: int) -> None:
+    bodies = sorted(
+        glob.glob(os.path.join(out_dir, "projects.*.json")),
+        key=os.path.getmtime,
+        reverse=True,
+    )
+    for path in bodies:
+        if os.path.basename(path) == SNAPSHOT_MANIFEST:
+            continue
+        if keep > 0:
+            keep -= 1
+            continue
+        for variant in glob.glob(f"{path}*"):
+            os.remove(variant)
+
+
+def build_snapshot(
+    entries: List[Dict[str, Any]], out_dir: str = SNAPSHOT_DIR, keep: int = SNAPSHOTS_KEPT
+) -> Snapshot:
+    """Write a content-hashed snapshot of the projects and point the manifest at it.
+
+    Raises ValueError, writing nothing, if the projects do not match the
+    Project schema. When the content is unchanged the files are left alone,
+    so their ETags and modification times stay the same.
+    """
+    projects = sorted(
+        (snapshot_entry(entry) for entry in entries),
+        # Entries without a usable position sort first and fail validation
+        key=lambda project: project["position"] if isinstance(project["position"], int) else -1,
+    )
+    errors = validate_projects(projects)
+    if errors:
+        raise ValueError(
+            "Snapshot does not match the Project schema:\n  " + "\n  ".join(errors[:20])
+        )
+
+    body = json.dumps(projects, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    digest = hashlib.sha256(body).hexdigest()
+    previous = load_snapshot_manifest(out_dir)
+    if (
+        previous
+        and previous.get("sha256") == digest
+        and all(os.path.exists(os.path.join(out_dir, name)) for name in previous["files"].values())
+    ):
+        return Snapshot(digest, len(projects), previous["files"], previous["etags"], False)
+
+    name = f"projects.{digest[:16]}.json"
+    files, etags, sizes = {}, {}, {}
+    for coding, data in encode_variants(body).items():
+        files[coding] = name if coding == "identity" else f"{name}.{'gz' if coding == 'gzip' else coding}"
+        # Strong validators must differ between content codings of one resource
+        etags[coding] = f'"{digest[:32]}"' if coding == "identity" else f'"{digest[:32]}-{coding}"'
+        sizes[coding] = len(data)
+        with atomic_open(os.path.join(out_dir, files[coding]), "wb") as f:
+            f.write(data)
+
+    # The manifest is replaced last, so it never names files that are not there yet
+    write_json(
+        os.path.join(out_dir, SNAPSHOT_MANIFEST),
+        {
+            "version": SNAPSHOT_VERSION,
+            "sha256": digest,
+            "count": len(projects),
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "files": files,
+            "etags": etags,
+            "bytes": sizes,
+        },
+    )
+    _prune(out_dir, keep)
+    return Snapshot(digest, len(projects), files, etags, True)
+
+
+def validate_snapshot(out_dir: str = SNAPSHOT_DIR) -> List[str]:
+    """Check the current snapshot: manifest, hashes, every variant and the schema"""
+    manifest = load_snapshot_manifest(out_dir)
+    if manifest is None:
+        return [f"no readable {SNAPSHOT_MANIFEST} in {out_dir}"]
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        return [f"unsupported snapshot version {manifest.get('version')!r}"]
+
+    errors = []
+    files = manifest.get("files", {})
+    try:
+        with open(os.path.join(out_dir, files["identity"]), "rb") as f:
+            body = f.read()
+    except (KeyError, OSError) as e:
+        return [f"cannot read the snapshot body: {e}"]
+    if hashlib.sha256(body).hexdigest() != manifest.get("sha256"):
+        errors.append(f"{files['identity']}: sha256 does not match the manifest")
+
+    decoders = {"gzip": gzip.decompress, "br": getattr(_brotli(), "decompress", None)}
+    for coding, name in files.items():
+        if coding == "identity":
+            continue
+        decode = decoders.get(coding)
+        if decode is None:
+            print(f"  - Skipping {name}: no {coding} decoder installed")
+            continue
+        try:
+            with open(os.path.join(out_dir, name), "rb") as f:
+                if decode(f.read()) != body:
+                    errors.append(f"{name}: does not decode to the snapshot body")
+        except Exception as e:
+            errors.append(f"{name}: {type(e).__name__}: {e}")
+
+    projects = json.loads(body)
+    errors += validate_projects(projects)
+    if isinstance(projects, list) and len(projects) != manifest.get("count"):
+        errors.append(f"manifest count {manifest.get('count')} but {len(projects)} projects")
+    return errors
+
+
+def print_snapshot(snapshot: Snapshot, out_dir: str) -> None:
+    if not snapshot.changed:
+        print(f"📸 Snapshot unchanged ({snapshot.count} projects, ETag {snapshot.etags['identity']})")
+        return
+    print(
+        f"📸 Snapshot of {snapshot.count} projects written to "
+        f"'{os.path.join(out_dir, snapshot.files['identity'])}' "
+        f"(precompressed: {', '.join(coding for coding in snapshot.files if coding != 'identity')}; "
+        f"ETag {snapshot.etags['identity']})"
+    )
+    if "br" not in snapshot.files:
+        print("  Skipped the .br variant: install the brotli extra (uv sync --extra brotli)")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Build or validate the projects snapshot")
+    parser.add_argument("--source", default=ALL_PROJECTS_PATH, help="Aggregate to snapshot")
+    parser.add_argument("--out", default=SNAPSHOT_DIR, help="Snapshot directory")
+    parser.add_argument(
+        "--validate", action="store_true", help="Only check the current snapshot in --out"
+    )
+    args = parser.parse_args()
+
+    if not args.validate:
+        print_snapshot(build_snapshot(read_entries(args.source), args.out), args.out)
+
+    errors = validate_snapshot(args.out)
+    for error in errors:
+        print(f"  ❌ {error}")
+    if errors:
+        sys.exit(1)
+    print(f"✅ Snapshot in '{args.out}' is valid")
+
+
+if __name__ == "__main__":
+    main_cli()
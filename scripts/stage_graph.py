@@ -0,0 +1,116 @@
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Sequence, Set, Tuple
+from get_projects import Response
+from journal import STAGE_FIELDS
+from prompt_builder import PROMPT_FIELDS
+
+
+class StageSpec(NamedTuple):
+    name: str
+    # Response fields the stage's prompt, heuristics and rules look at
+    reads: Tuple[str, ...]
+    # Response fields the stage sets
+    writes: Tuple[str, ...]
+
+
+# In the order the stages used to run one after another
+INDIVIDUAL_STAGE_SPECS = tuple(
+    StageSpec(stage, PROMPT_FIELDS[stage], STAGE_FIELDS[stage])
+    for stage in ("desc", "status", "tech")
+)
+
+StageFunc = Callable[[Response], Response]
+AsyncStageFunc = Callable[[Response], Awaitable[Response]]
+
+
+def stage_dependencies(specs: Sequence[StageSpec]) -> Dict[str, List[str]]:
+    """Earlier stages each stage has to wait for, in declaration order.
+
+    A stage depends on an earlier one that writes a field it reads or also
+    writes. Every stage works on its own copy of the repo, so an earlier
+    stage merely reading a field a later one rewrites is no reason to wait.
+    """
+    dependencies = {}
+    for i, spec in enumerate(specs):
+        touched = set(spec.reads) | set(spec.writes)
+        dependencies[spec.name] = [
+            earlier.name for earlier in specs[:i] if touched & set(earlier.writes)
+        ]
+    return dependencies
+
+
+def _stage_input(
+    project: Response,
+    specs: Sequence[StageSpec],
+    dependencies: List[str],
+    outputs: Dict[str, Response],
+) -> Response:
+    """A private copy of the repo with its dependencies' results applied"""
+    staged = project.model_copy(deep=True)
+    _merge(staged, [spec for spec in specs if spec.name in dependencies], outputs)
+    return staged
+
+
+def _merge(project: Response, specs: Sequence[StageSpec], outputs: Dict[str, Response]) -> None:
+    # Declaration order, so a later writer of a field wins as it would in sequence
+    for spec in specs:
+        for field in spec.writes:
+            setattr(project, field, getattr(outputs[spec.name], field))
+
+
+def run_stage_graph(
+    project: Response, stages: Sequence[Tuple[StageSpec, StageFunc]]
+) -> Response:
+    """Run the stages on a thread pool, each as soon as its dependencies are done.
+
+    Independent stages run side by side on copies of the repo; afterwards
+    only the fields each stage declares it writes are copied back, so they
+    cannot clobber one another. The result matches running them in order.
+    """
+    specs = [spec for spec, _ in stages]
+    funcs = {spec.name: func for spec, func in stages}
+    dependencies = stage_dependencies(specs)
+    outputs: Dict[str, Response] = {}
+    running: Dict[Future, str] = {}
+    waiting: Set[str] = set(funcs)
+
+    with ThreadPoolExecutor(max_workers=len(specs)) as executor:
+        while waiting or running:
+            for spec in specs:
+                if spec.name in waiting and all(
+                    dependency in outputs for dependency in dependencies[spec.name]
+                ):
+                    waiting.discard(spec.name)
+                    staged = _stage_input(project, specs, dependencies[spec.name], outputs)
+                    running[executor.submit(funcs[spec.name], staged)] = spec.name
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                outputs[running.pop(future)] = future.result()
+
+    _merge(project, specs, outputs)
+    return project
+
+
+async def arun_stage_graph(
+    project: Response, stages: Sequence[Tuple[StageSpec, AsyncStageFunc]]
+) -> Response:
+    """Async counterpart of run_stage_graph, running each stage as a task"""
+    specs = [spec for spec, _ in stages]
+    dependencies = stage_dependencies(specs)
+    tasks: Dict[str, asyncio.Task] = {}
+    outputs: Dict[str, Response] = {}
+
+    async def run(spec: StageSpec, func: AsyncStageFunc) -> None:
+        for dependency in dependencies[spec.name]:
+            await tasks[dependency]
+        outputs[spec.name] = await func(
+            _stage_input(project, specs, dependencies[spec.name], outputs)
+        )
+
+    for spec, func in stages:
+        tasks[spec.name] = asyncio.ensure_future(run(spec, func))
+    await asyncio.gather(*tasks.values())
+
+    _merge(project, specs, outputs)
+    return project
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the scripts' CLI startup.
+
+Imports each entry module in a fresh interpreter several times and reports
+the median and worst wall time, plus which heavy packages got loaded. Modules
+that --dry-run relies on must not load LangChain; the script exits non-zero
+if one does or if any import exceeds --budget-ms.
+Usage: python startup_benchmark.py --runs 5
+       python startup_benchmark.py --budget-ms 500 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Label -> statement timed in a fresh interpreter
+TARGETS = {
+    "get_projects": "import get_projects",
+    "main": "import main",
+    "update_latest": "import update_latest",
+    "pipeline": "import pipeline",
+    "async_pipeline": "import async_pipeline",
+    "first model": "import llm; llm.get_model()",
+}
+
+# Targets a --dry-run / --fetch-only run imports; they must stay LangChain-free
+LIGHT_TARGETS = ("get_projects", "main", "update_latest")
+
+HEAVY_PACKAGES = ("langchain_core", "langchain_google_genai", "google.genai")
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def time_import(statement: str) -> Dict[str, Any]:
+    """Run statement in a new interpreter and return its duration and heavy imports"""
+    env = dict(os.environ)
+    # Building the Gemini client needs a key but makes no request
+    env.setdefault("GOOGLE_API_KEY", "startup-benchmark")
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(statement=statement, heavy=HEAVY_PACKAGES)],
+        cwd=SCRIPTS_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed, _, heavy = result.stdout.strip().splitlines()[-1].partition(" ")
+    return {"seconds": float(elapsed), "heavy": [name for name in heavy.split(",") if name]}
+
+
+def run_benchmark(targets: List[str], runs: int) -> List[Dict[str, Any]]:
+    results = []
+    for label in targets:
+        samples = [time_import(TARGETS[label]) for _ in range(runs)]
+        seconds = [sample["seconds"] for sample in samples]
+        results.append(
+            {
+                "target": label,
+                "runs": runs,
+                "median_ms": round(statistics.median(seconds) * 1000, 1),
+                "max_ms": round(max(seconds) * 1000, 1),
+                "heavy": samples[-1]["heavy"],
+            }
+        )
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Measure the scripts' import time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target")
+    parser.add_argument(
+        "--targets",
+        default=",".join(TARGETS),
+        help=f"Comma-separated targets to time ({', '.join(TARGETS)})",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=0,
+        help="Fail if a light target's median import exceeds this (0 = no limit)",
+    )
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    targets = [target.strip() for target in args.targets.split(",") if target.strip()]
+    unknown = [target for target in targets if target not in TARGETS]
+    if unknown:
+        parser.error(f"unknown target(s) {', '.join(unknown)}")
+
+    results = run_benchmark(targets, args.runs)
+
+    failures = []
+    for result in results:
+        heavy = ", ".join(result["heavy"]) or "-"
+        print(
+            f"{result['target']:<16} median={result['median_ms']:>7.1f}ms "
+            f"max={result['max_ms']:>7.1f}ms  heavy: {heavy}"
+        )
+        if result["target"] in LIGHT_TARGETS:
+            if result["heavy"]:
+                failures.append(f"{result['target']} loads {heavy}")
+            if args.budget_ms and result["median_ms"] > args.budget_ms:
+                failures.append(
+                    f"{result['target']} takes {result['median_ms']:.0f}ms "
+                    f"(budget {args.budget_ms:.0f}ms)"
+                )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results saved to '{args.json}'")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,10 +1,10 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from get_projects import Response
-import dotenv
-import os
-
-dotenv.load_dotenv()
+from llm import get_model, model_id
+from llm_cache import cache_key, get_cache
+from tracing import current_span
+from prompt_builder import build_payload, estimate_prompt_tokens
+from status_heuristics import classify_status
 
 status_sys_prompt = """
 You are a project status analysis expert.
@@ -45,25 +45,75 @@ status_template = ChatPromptTemplate.from_messages(
     ]
 )
 
-google_api_key = os.getenv("GOOGLE_API_KEY")
+TEMPERATURE = 0.1
 
-model = ChatGoogleGenerativeAI(
-    model="gemini-2.0-flash",
-    temperature=0.1,
-    google_api_key=google_api_key,
-)
+
+def gen_project_status(repo_data: Response, use_heuristics: bool = True):
+    if use_heuristics and apply_heuristic_status(repo_data):
+        return repo_data
+
+    json_repo_data = build_payload(repo_data, "status").text
+
+    key = cache_key("status", status_template, model_id(), json_repo_data)
+    content = get_cache().get(key)
+    span = current_span()
+    span.set(title=repo_data.title, cache="miss" if content is None else "hit")
+    if content is None:
+        chain = status_template | get_model(TEMPERATURE)
+        estimate_prompt_tokens(status_template, repo_data=json_repo_data)
+        res = chain.invoke({"repo_data": json_repo_data})
+        span.record_usage(res)
+
+        print(f"Status analysis result: {res.content}")
+
+        content = res.content
+        get_cache().set(key, "status", content)
+
+    return apply_status(repo_data, content)
 
 
-def gen_project_status(repo_data: Response):
-    json_repo_data = repo_data.model_dump_json()
+async def agen_project_status(repo_data: Response, use_heuristics: bool = True):
+    if use_heuristics and apply_heuristic_status(repo_data):
+        return repo_data
 
-    chain = status_template | model
-    res = chain.invoke({"repo_data": json_repo_data})
+    json_repo_data = build_payload(repo_data, "status").text
+
+    key = cache_key("status", status_template, model_id(), json_repo_data)
+    content = get_cache().get(key)
+    span = current_span()
+    span.set(title=repo_data.title, cache="miss" if content is None else "hit")
+    if content is None:
+        chain = status_template | get_model(TEMPERATURE)
+        estimate_prompt_tokens(status_template, repo_data=json_repo_data)
+        res = await chain.ainvoke({"repo_data": json_repo_data})
+        span.record_usage(res)
+
+        print(f"Status analysis result: {res.content}")
+
+        content = res.content
+        get_cache().set(key, "status", content)
+
+    return apply_status(repo_data, content)
+
+
+def apply_heuristic_status(repo_data: Response) -> bool:
+    """Set the status from local README signals when they are unambiguous"""
+    prediction = classify_status(repo_data)
+    if prediction.status is None:
+        return False
+
+    print(
+        f"Status from heuristics: {prediction.status} "
+        f"(confidence {prediction.confidence:.2f})"
+    )
+    current_span().set(title=repo_data.title, source="heuristics")
+    apply_status(repo_data, prediction.status)
+    return True
 
-    print(f"Status analysis result: {res.content}")
 
+def apply_status(repo_data: Response, content: str) -> Response:
     # Extract single character status
-    status = res.content.strip().lower()
+    status = content.strip().lower()
     if status not in ["c", "w", "p"]:
         # Default to 'w' if response is unclear
         status = "w"
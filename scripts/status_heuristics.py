@@ -0,0 +1,192 @@
+import json
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from get_projects import Response
+
+STATUS_FIXTURES_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "fixtures", "status_labels.json"
+)
+# Labelled repos the thresholds were never tuned on; the test suite keeps the
+# heuristics accurate on these
+STATUS_HOLDOUT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "fixtures", "status_holdout.json"
+)
+HEURISTIC_MIN_HOLDOUT_ACCURACY = 0.9
+
+# Below this margin between the best and second-best class the model decides
+HEURISTIC_MIN_CONFIDENCE = 0.5
+HEURISTIC_MIN_SCORE = 2.0
+
+COMPLETION_PHRASES = re.compile(
+    r"\b(completed?|finished|stable|production[- ]ready|released|deployed|"
+    r"live demo|live at|v\d+\.\d+)\b",
+    re.IGNORECASE,
+)
+# "not yet complete", "isn't finished", "never deployed": the completion word
+# is negated, so it must not count towards "c"
+NEGATED_COMPLETION = re.compile(
+    r"\b(not|never|isn't|aren't|wasn't|hasn't|haven't|yet to be|no longer)\s+"
+    r"((yet|fully|quite|been|be|really)\s+){0,2}"
+    r"(completed?|finished|stable|production[- ]ready|released|deployed)\b",
+    re.IGNORECASE,
+)
+WIP_PHRASES = re.compile(
+    r"\b(under (active )?development|work in progress|wip|in progress|"
+    r"still working|currently working|working on|"
+    r"roadmap)\b",
+    re.IGNORECASE,
+)
+PLANNED_PHRASES = re.compile(
+    r"\b(coming soon|planning phase|planned features?|in planning|concept|"
+    r"will include|planning to|idea stage|not (yet )?started|to be implemented)\b",
+    re.IGNORECASE,
+)
+TODO_HEADING = re.compile(r"^#{1,6}\s*(todo|to-do|to do)\b", re.IGNORECASE | re.MULTILINE)
+UNCHECKED_BOX = re.compile(r"^\s*[-*]\s*\[ \]", re.MULTILINE)
+
+
+class StatusPrediction(NamedTuple):
+    status: Optional[str]
+    confidence: float
+    scores: Dict[str, float]
+
+
+def score_status(repo_data: Response) -> Dict[str, float]:
+    """Score each status class from the signals listed in the status prompt"""
+    readme = repo_data.readme or ""
+    commits = repo_data.num_commits or 0
+    scores = {"c": 0.0, "w": 0.0, "p": 0.0}
+
+    # live_website_url: if present, likely completed
+    if repo_data.live_website_url:
+        scores["c"] += 2.0
+
+    # num_commits: higher commits suggest active or completed development
+    if commits >= 100:
+        scores["c"] += 1.5
+    elif commits >= 50:
+        scores["c"] += 1.0
+    elif commits >= 10:
+        scores["w"] += 0.5
+    elif commits <= 5:
+        scores["p"] += 1.5
+
+    # readme: completion, work in progress and planning indicators
+    completion_text = NEGATED_COMPLETION.sub(" ", readme)
+    scores["c"] += min(2.0, len(COMPLETION_PHRASES.findall(completion_text)) * 1.0)
+    # A negated completion word still says the work is unfinished
+    scores["w"] += min(3.0, len(NEGATED_COMPLETION.findall(readme)) * 1.5)
+    scores["w"] += min(3.0, len(WIP_PHRASES.findall(readme)) * 1.5)
+    scores["p"] += min(3.0, len(PLANNED_PHRASES.findall(readme)) * 1.5)
+
+    if TODO_HEADING.search(readme):
+        scores["w"] += 2.0
+    scores["w"] += min(2.0, len(UNCHECKED_BOX.findall(readme)) * 0.5)
+
+    # languages and minimal code: mostly documentation suggests planning
+    if not repo_data.languages:
+        scores["p"] += 1.0
+    if len(readme) < 300:
+        scores["p"] += 0.5
+
+    return scores
+
+
+def classify_status(
+    repo_data: Response,
+    min_confidence: float = HEURISTIC_MIN_CONFIDENCE,
+    min_score: float = HEURISTIC_MIN_SCORE,
+) -> StatusPrediction:
+    """Pick a status locally, or None when the signals are too close to call"""
+    scores = score_status(repo_data)
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    best, second = scores[ranked[0]], scores[ranked[1]]
+    confidence = (best - second) / best if best > 0 else 0.0
+
+    status = ranked[0] if best >= min_score and confidence >= min_confidence else None
+    return StatusPrediction(status, round(confidence, 2), scores)
+
+
+def load_status_fixtures(path: str = STATUS_FIXTURES_PATH) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def fixture_repo(fixture: Dict) -> Tuple[Response, str]:
+    """A labelled fixture as the repo to classify and its label"""
+    repo_data = Response.model_validate(
+        {key: value for key, value in fixture.items() if key != "label"}
+    )
+    return repo_data, fixture["label"]
+
+
+def heuristic_accuracy(fixtures: List[Dict]) -> Tuple[int, int]:
+    """How many fixtures the heuristics decide, and how many of those correctly"""
+    decided = correct = 0
+    for fixture in fixtures:
+        repo_data, label = fixture_repo(fixture)
+        status = classify_status(repo_data).status
+        if status:
+            decided += 1
+            correct += status == label
+    return decided, correct
+
+
+def agreement_report(
+    use_llm: bool = False, path: str = STATUS_FIXTURES_PATH, name: str = "Fixtures"
+) -> None:
+    """Compare heuristic decisions with the fixture labels and, optionally, the model"""
+    fixtures = load_status_fixtures(path)
+    decided = correct = 0
+    llm_correct = agree = compared = 0
+
+    print(f"{name} ({path}):")
+    for fixture in fixtures:
+        repo_data, label = fixture_repo(fixture)
+        prediction = classify_status(repo_data)
+
+        line = f"  - {repo_data.title}: label={label} heuristic={prediction.status or '-'}"
+        line += f" (confidence {prediction.confidence:.2f})"
+        if prediction.status:
+            decided += 1
+            correct += prediction.status == label
+
+        if use_llm:
+            from status_analyzer import gen_project_status
+
+            llm_status = gen_project_status(repo_data, use_heuristics=False).status
+            llm_correct += llm_status == label
+            line += f" llm={llm_status}"
+            if prediction.status:
+                compared += 1
+                agree += prediction.status == llm_status
+        print(line)
+
+    total = len(fixtures)
+    print(f"\n{name}: {total}")
+    print(f"Heuristic coverage: {decided}/{total} decided without the model")
+    if decided:
+        print(f"Heuristic accuracy on decided: {correct}/{decided} ({100 * correct / decided:.0f}%)")
+    if use_llm:
+        print(f"LLM accuracy: {llm_correct}/{total} ({100 * llm_correct / total:.0f}%)")
+        if compared:
+            print(f"Heuristic/LLM agreement: {agree}/{compared} ({100 * agree / compared:.0f}%)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Evaluate the heuristic status classifier")
+    parser.add_argument("--llm", action="store_true", help="Also ask the model for each fixture")
+    parser.add_argument("--fixtures", default=STATUS_FIXTURES_PATH)
+    parser.add_argument(
+        "--holdout",
+        default=STATUS_HOLDOUT_PATH,
+        help="Labelled repos kept out of tuning, to check the thresholds generalize",
+    )
+    args = parser.parse_args()
+
+    agreement_report(use_llm=args.llm, path=args.fixtures, name="Tuning fixtures")
+    print()
+    agreement_report(use_llm=args.llm, path=args.holdout, name="Held-out fixtures")
@@ -0,0 +1,198 @@
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterator, List, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, where an open spool cannot be removed by another run anyway
+    fcntl = None
+
+AGGREGATE_FORMATS = ("pretty", "compact", "ndjson")
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = "w", encoding: str = "utf-8") -> Iterator[IO]:
+    """Write to a temp file beside path and rename it over path on success.
+
+    Readers see either the old file or the complete new one, never a
+    truncated write; on error the temp file is removed and path is untouched.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        # mkstemp creates 0600 files; keep the permissions a plain open() would give
+        os.chmod(temp_path, os.stat(path).st_mode if os.path.exists(path) else 0o644)
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def dumps(data: Any, compact: bool = False, sort_keys: bool = False) -> str:
+    if compact:
+        return json.dumps(
+            data, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys
+        )
+    return json.dumps(data, indent=2, ensure_ascii=False, sort_keys=sort_keys)
+
+
+def write_json(path: str, data: Any, compact: bool = False, sort_keys: bool = False) -> None:
+    """Atomically write pretty (indent=2) or minified JSON"""
+    with atomic_open(path) as f:
+        f.write(dumps(data, compact, sort_keys))
+
+
+def aggregate_path(path: str, output_format: str = "pretty") -> str:
+    """NDJSON aggregates live next to the JSON one with an .ndjson extension"""
+    if output_format == "ndjson":
+        return os.path.splitext(path)[0] + ".ndjson"
+    return path
+
+
+def read_entries(path: str) -> List[Dict[str, Any]]:
+    """Read a JSON array or NDJSON aggregate"""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".ndjson"):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+class AggregateWriter:
+    """Build the all-projects file incrementally without holding every entry.
+
+    Entries are appended to an on-disk spool as they are produced, in any
+    order, and only their positions and offsets are kept in memory. commit()
+    streams them back in position order into a temp file, renumbers the
+    positions contiguously and atomically replaces the aggregate. If the run
+    fails before commit the previous aggregate is left as it was.
+
+    The spool is locked while the writer is open. A spool nobody holds was
+    left by a run that crashed; its entries are also in that run's journal,
+    so it is cleared and reused. A spool another run holds raises
+    FileExistsError.
+    """
+
+    def __init__(
+        self, path: str, output_format: str = "pretty", position_key: str = "location"
+    ):
+        if output_format not in AGGREGATE_FORMATS:
+            raise ValueError(f"Unknown aggregate format: {output_format}")
+        self.path = path
+        self.output_format = output_format
+        self.position_key = position_key
+        self.spool_path = f"{path}.partial.ndjson"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._spool = self._open_spool()
+        self._index: List[Tuple[int, int]] = []
+        self._titles = set()
+
+    def _open_spool(self) -> IO[bytes]:
+        while True:
+            spool = open(self.spool_path, "a+b")
+            if fcntl is None:
+                break
+            try:
+                fcntl.flock(spool.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                spool.close()
+                raise FileExistsError(
+                    f"'{self.spool_path}' is being written by another run"
+                ) from None
+            # The previous holder may have removed it between the open and the lock
+            if os.path.exists(self.spool_path) and os.path.samestat(
+                os.fstat(spool.fileno()), os.stat(self.spool_path)
+            ):
+                break
+            spool.close()
+        if spool.seek(0, os.SEEK_END):
+            print(f"🧹 Cleared the spool of an interrupted run: '{self.spool_path}'")
+            spool.truncate(0)
+        return spool
+
+    def __contains__(self, title: str) -> bool:
+        return title in self._titles
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        """Spool one entry; each title may only be added once"""
+        if entry["title"] in self._titles:
+            raise ValueError(f"Duplicate aggregate entry: {entry['title']}")
+        self._spool.seek(0, os.SEEK_END)
+        offset = self._spool.tell()
+        self._spool.write(dumps(entry, compact=True).encode("utf-8") + b"\n")
+        self._index.append((entry.get(self.position_key, len(self._index)), offset))
+        self._titles.add(entry["title"])
+
+    def _entries(self) -> Iterator[Dict[str, Any]]:
+        self._spool.flush()
+        for position, (_, offset) in enumerate(sorted(self._index)):
+            self._spool.seek(offset)
+            entry = json.loads(self._spool.readline())
+            entry[self.position_key] = position
+            yield entry
+
+    def _write(self, f: IO) -> None:
+        if self.output_format == "ndjson":
+            for entry in self._entries():
+                f.write(dumps(entry, compact=True) + "\n")
+            return
+
+        compact = self.output_format == "compact"
+        count = 0
+        for entry in self._entries():
+            text = dumps(entry, compact)
+            if not compact:
+                # Match json.dump(entries, indent=2) byte for byte
+                text = "\n".join("  " + line for line in text.splitlines())
+            if count == 0:
+                f.write("[" if compact else "[\n")
+            else:
+                f.write("," if compact else ",\n")
+            f.write(text)
+            count += 1
+        if count == 0:
+            f.write("[]")
+        else:
+            f.write("]" if compact else "\n]")
+
+    def commit(self) -> int:
+        """Atomically replace the aggregate, returning the number of entries"""
+        with atomic_open(self.path) as f:
+            self._write(f)
+        self.close()
+        return len(self._index)
+
+    def close(self) -> None:
+        """Drop the spool without touching the aggregate"""
+        if self._spool.closed:
+            return
+        if fcntl is not None:
+            # Removed while still locked, so no other run can claim it first
+            self._remove_spool()
+            self._spool.close()
+        else:
+            self._spool.close()
+            self._remove_spool()
+
+    def _remove_spool(self) -> None:
+        if os.path.exists(self.spool_path):
+            os.remove(self.spool_path)
+
+    def __enter__(self) -> "AggregateWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
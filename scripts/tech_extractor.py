@@ -1,10 +1,11 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from get_projects import Response
-import dotenv
-import os
-
-dotenv.load_dotenv()
+from llm import get_model, model_id
+from llm_cache import cache_key, get_cache
+from tracing import current_span
+from prompt_builder import build_payload, estimate_prompt_tokens
+from tech_rules import extract_technologies
+from typing import List
 
 tech_sys_prompt = """
 You are a technology extraction expert.
@@ -40,36 +41,94 @@ tech_template = ChatPromptTemplate.from_messages(
     ]
 )
 
-google_api_key = os.getenv("GOOGLE_API_KEY")
-
-model = ChatGoogleGenerativeAI(
-    model="gemini-2.0-flash",
-    temperature=0.1,
-    google_api_key=google_api_key,
-)
-
-
-def gen_tech_stack(repo_data: Response):
-    json_repo_data = repo_data.model_dump_json()
-
-    chain = tech_template | model
-    res = chain.invoke({"repo_data": json_repo_data})
+# Below this rule-extraction confidence the model is asked instead
+RULES_MIN_CONFIDENCE = 0.7
+
+TEMPERATURE = 0.1
+
+
+def merge_technologies(languages: List[str], technologies: List[str]) -> List[str]:
+    """Append technologies to languages, dropping case-insensitive duplicates"""
+    seen = set()
+    unique_technologies = []
+    for tech in (languages or []) + technologies:
+        if tech.lower() not in seen:
+            unique_technologies.append(tech)
+            seen.add(tech.lower())
+    return unique_technologies
+
+
+def gen_tech_stack(
+    repo_data: Response,
+    use_rules: bool = True,
+    min_confidence: float = RULES_MIN_CONFIDENCE,
+):
+    if use_rules and apply_rule_based_tech_stack(repo_data, min_confidence):
+        return repo_data
+
+    json_repo_data = build_payload(repo_data, "tech").text
+
+    key = cache_key("tech", tech_template, model_id(), json_repo_data)
+    content = get_cache().get(key)
+    span = current_span()
+    span.set(title=repo_data.title, cache="miss" if content is None else "hit")
+    if content is None:
+        chain = tech_template | get_model(TEMPERATURE)
+        estimate_prompt_tokens(tech_template, repo_data=json_repo_data)
+        res = chain.invoke({"repo_data": json_repo_data})
+        span.record_usage(res)
+        content = res.content
+        get_cache().set(key, "tech", content)
+
+    return apply_tech_stack(repo_data, content)
+
+
+async def agen_tech_stack(
+    repo_data: Response,
+    use_rules: bool = True,
+    min_confidence: float = RULES_MIN_CONFIDENCE,
+):
+    if use_rules and apply_rule_based_tech_stack(repo_data, min_confidence):
+        return repo_data
+
+    json_repo_data = build_payload(repo_data, "tech").text
+
+    key = cache_key("tech", tech_template, model_id(), json_repo_data)
+    content = get_cache().get(key)
+    span = current_span()
+    span.set(title=repo_data.title, cache="miss" if content is None else "hit")
+    if content is None:
+        chain = tech_template | get_model(TEMPERATURE)
+        estimate_prompt_tokens(tech_template, repo_data=json_repo_data)
+        res = await chain.ainvoke({"repo_data": json_repo_data})
+        span.record_usage(res)
+        content = res.content
+        get_cache().set(key, "tech", content)
+
+    return apply_tech_stack(repo_data, content)
+
+
+def apply_rule_based_tech_stack(repo_data: Response, min_confidence: float) -> bool:
+    """Fill the tech stack from the local alias dictionary when it is confident enough"""
+    extraction = extract_technologies(repo_data.readme or "")
+    if extraction.confidence < min_confidence or not extraction.technologies:
+        return False
+
+    print(
+        f"Tech stack from README rules (confidence {extraction.confidence:.2f}): "
+        f"{', '.join(extraction.technologies)}"
+    )
+    current_span().set(title=repo_data.title, source="rules")
+    repo_data.languages = merge_technologies(repo_data.languages, extraction.technologies)
+    return True
 
-    print(res.content)
 
+def apply_tech_stack(repo_data: Response, content: str) -> Response:
     # Parse comma-separated string into list
-    tech_string = res.content.strip()
+    tech_string = content.strip()
     if tech_string:
         technologies = [tech.strip() for tech in tech_string.split(",") if tech.strip()]
-        languages = repo_data.languages + technologies
-
-        seen = set()
-        unique_technologies = []
-        for tech in languages:
-            if tech.lower() not in seen:
-                unique_technologies.append(tech)
-                seen.add(tech.lower())
-        repo_data.languages = unique_technologies
+        repo_data.languages = merge_technologies(repo_data.languages, technologies)
 
     return repo_data
 
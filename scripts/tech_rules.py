@@ -0,0 +1,310 @@
+import re
+from collections import deque
+from typing import Dict, List, NamedTuple, Tuple
+
+# Canonical technology name -> lowercase spellings found in READMEs.
+# Ambiguous everyday words (go, express, next, spring, node) only appear in
+# unambiguous forms.
+TECH_ALIASES: Dict[str, List[str]] = {
+    # Languages
+    "Python": ["python", "python3"],
+    "JavaScript": ["javascript", "js", "es6", "ecmascript"],
+    "TypeScript": ["typescript"],
+    "Java": ["java"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["swift", "swiftui"],
+    "Go": ["golang", "go lang"],
+    "Rust": ["rust", "rustlang"],
+    "C++": ["c++", "cpp"],
+    "C#": ["c#", "csharp"],
+    "Ruby": ["ruby"],
+    "PHP": ["php"],
+    "Dart": ["dart"],
+    "Scala": ["scala"],
+    "Elixir": ["elixir"],
+    "Haskell": ["haskell"],
+    "Lua": ["lua"],
+    "Solidity": ["solidity"],
+    "Bash": ["bash", "shell script"],
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3"],
+    "SQL": ["sql"],
+    "GraphQL": ["graphql"],
+    "WebAssembly": ["webassembly", "wasm"],
+    "Jupyter Notebook": ["jupyter", "jupyter notebook", "ipynb"],
+    # Frontend
+    "React": ["react", "reactjs", "react.js"],
+    "React Native": ["react native", "react-native"],
+    "Next.js": ["next.js", "nextjs", "next js"],
+    "Vue.js": ["vue", "vuejs", "vue.js"],
+    "Nuxt": ["nuxt", "nuxtjs", "nuxt.js"],
+    "Angular": ["angular", "angularjs"],
+    "Svelte": ["svelte", "sveltekit"],
+    "Astro": ["astro"],
+    "Remix": ["remix"],
+    "Redux": ["redux", "redux toolkit"],
+    "Zustand": ["zustand"],
+    "jQuery": ["jquery"],
+    "Tailwind CSS": ["tailwind", "tailwindcss", "tailwind css"],
+    "Bootstrap": ["bootstrap"],
+    "Material UI": ["material ui", "material-ui", "mui"],
+    "Chakra UI": ["chakra ui", "chakra-ui"],
+    "Shadcn UI": ["shadcn", "shadcn/ui", "shadcn ui"],
+    "Radix UI": ["radix ui", "radix-ui", "radix"],
+    "Sass": ["sass", "scss"],
+    "Framer Motion": ["framer motion", "framer-motion"],
+    "Three.js": ["three.js", "threejs"],
+    "D3.js": ["d3.js", "d3js"],
+    "Chart.js": ["chart.js", "chartjs"],
+    "Vite": ["vite", "vitejs"],
+    "Webpack": ["webpack"],
+    "Flutter": ["flutter"],
+    "Expo": ["expo"],
+    "Electron": ["electron", "electronjs"],
+    "Tauri": ["tauri"],
+    "Pyodide": ["pyodide"],
+    "Zod": ["zod"],
+    # Backend
+    "Node.js": ["node.js", "nodejs", "node js"],
+    "Bun": ["bun", "bun.sh"],
+    "Deno": ["deno"],
+    "Express.js": ["express.js", "expressjs", "express js"],
+    "NestJS": ["nestjs", "nest.js"],
+    "Hono": ["hono"],
+    "FastAPI": ["fastapi"],
+    "Flask": ["flask"],
+    "Django": ["django", "django rest framework"],
+    "Streamlit": ["streamlit"],
+    "Gradio": ["gradio"],
+    "Spring Boot": ["spring boot", "springboot"],
+    "Ruby on Rails": ["ruby on rails", "rails"],
+    "Laravel": ["laravel"],
+    "Gin": ["gin-gonic"],
+    "Socket.IO": ["socket.io", "socketio"],
+    "gRPC": ["grpc"],
+    "Prisma": ["prisma"],
+    "Drizzle ORM": ["drizzle", "drizzle orm"],
+    "SQLAlchemy": ["sqlalchemy"],
+    "Mongoose": ["mongoose"],
+    "Pydantic": ["pydantic"],
+    "Celery": ["celery"],
+    "NextAuth.js": ["nextauth", "next-auth", "nextauth.js"],
+    "JWT": ["jwt", "json web token", "json web tokens"],
+    "OAuth": ["oauth", "oauth2"],
+    # Data stores
+    "PostgreSQL": ["postgresql", "postgres", "psql", "pg"],
+    "MySQL": ["mysql"],
+    "SQLite": ["sqlite", "sqlite3"],
+    "MongoDB": ["mongodb", "mongo db", "mongo"],
+    "Redis": ["redis"],
+    "Firebase": ["firebase", "firestore"],
+    "Supabase": ["supabase"],
+    "DynamoDB": ["dynamodb"],
+    "Elasticsearch": ["elasticsearch", "elastic search"],
+    "Cassandra": ["cassandra"],
+    "Neo4j": ["neo4j"],
+    "Pinecone": ["pinecone"],
+    "ChromaDB": ["chromadb", "chroma db"],
+    "FAISS": ["faiss"],
+    "Qdrant": ["qdrant"],
+    # AI / data
+    "LangChain": ["langchain"],
+    "LangGraph": ["langgraph"],
+    "LlamaIndex": ["llamaindex", "llama index", "llama_index"],
+    "OpenAI API": ["openai", "openai api", "gpt-4", "gpt-3.5", "chatgpt"],
+    "Google Gemini": ["gemini", "google gemini"],
+    "Hugging Face": ["hugging face", "huggingface", "transformers"],
+    "PyTorch": ["pytorch", "torch"],
+    "TensorFlow": ["tensorflow"],
+    "Keras": ["keras"],
+    "scikit-learn": ["scikit-learn", "sklearn", "scikit learn"],
+    "spaCy": ["spacy"],
+    "NLTK": ["nltk"],
+    "OpenCV": ["opencv", "cv2"],
+    "pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "SciPy": ["scipy"],
+    "Matplotlib": ["matplotlib"],
+    "Seaborn": ["seaborn"],
+    "Plotly": ["plotly"],
+    "XGBoost": ["xgboost"],
+    "Ollama": ["ollama"],
+    # Tools and platforms
+    "Docker": ["docker", "dockerfile", "docker compose", "docker-compose"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "AWS": ["aws", "amazon web services"],
+    "Google Cloud": ["gcp", "google cloud", "google cloud platform"],
+    "Azure": ["azure"],
+    "Vercel": ["vercel"],
+    "Netlify": ["netlify"],
+    "Heroku": ["heroku"],
+    "Render": ["render.com"],
+    "Cloudflare": ["cloudflare", "cloudflare workers"],
+    "Nginx": ["nginx"],
+    "GitHub Actions": ["github actions"],
+    "Terraform": ["terraform"],
+    "Linux": ["linux"],
+    "Postman": ["postman"],
+    "Jest": ["jest"],
+    "Pytest": ["pytest"],
+    "Playwright": ["playwright"],
+    "Cypress": ["cypress"],
+    "Selenium": ["selenium"],
+    "Puppeteer": ["puppeteer"],
+    "BeautifulSoup": ["beautifulsoup", "beautiful soup", "bs4"],
+    "Stripe": ["stripe"],
+    "Twilio": ["twilio"],
+    "WebSockets": ["websocket", "websockets"],
+    "WebRTC": ["webrtc"],
+    "Arduino": ["arduino"],
+    "Raspberry Pi": ["raspberry pi"],
+    "Chrome Extension": ["chrome extension", "manifest v3"],
+    "PostHog": ["posthog"],
+}
+
+TECH_SECTION_RE = re.compile(
+    r"^#{1,6}\s*.*\b(tech(nology|nologies)?\s*stack|built\s+with|technologies(\s+used)?|stack|tools\s+used)\b.*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+NEXT_HEADING_RE = re.compile(r"^#{1,6}\s", re.MULTILINE)
+ITEM_SPLIT_RE = re.compile(r",|;|\||/|\band\b|•")
+MARKUP_RE = re.compile(r"\*\*|__|`|!\[[^\]]*\]\([^)]*\)|<[^>]+>|\[|\]\([^)]*\)")
+
+
+class TechExtraction(NamedTuple):
+    technologies: List[str]
+    confidence: float
+    coverage: float
+
+
+class AhoCorasick:
+    """Multi-pattern matcher that finds every alias in one pass over the text"""
+
+    def __init__(self, patterns: Dict[str, str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str]]] = [[]]
+
+        for pattern, value in patterns.items():
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append((pattern, value))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                if self._fail[child] == child:
+                    self._fail[child] = 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """Return (start, end, value) for every whole-word match in text"""
+        matches = []
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern, value in self._output[state]:
+                start = index - len(pattern) + 1
+                end = index + 1
+                if _is_boundary(text, start - 1) and _is_boundary(text, end):
+                    matches.append((start, end, value))
+        return matches
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    return index < 0 or index >= len(text) or not (text[index].isalnum() or text[index] in "_+#")
+
+
+_automaton = AhoCorasick(
+    {alias: name for name, aliases in TECH_ALIASES.items() for alias in aliases}
+)
+
+
+def find_technologies(text: str) -> List[str]:
+    """Canonical technology names in order of first mention, ignoring nested matches"""
+    matches = _automaton.find(text.lower())
+    # Prefer the longest match so "react native" does not also count as "react"
+    matches.sort(key=lambda match: (match[0], -(match[1] - match[0])))
+    found = []
+    covered_until = -1
+    for start, end, name in matches:
+        if end <= covered_until:
+            continue
+        covered_until = max(covered_until, end)
+        if name not in found:
+            found.append(name)
+    return found
+
+
+def _tech_section(readme: str) -> str:
+    match = TECH_SECTION_RE.search(readme)
+    if not match:
+        return ""
+    following = NEXT_HEADING_RE.search(readme, match.end())
+    return readme[match.end() : following.start() if following else len(readme)]
+
+
+def _section_items(section: str) -> List[str]:
+    items = []
+    for line in section.splitlines():
+        line = MARKUP_RE.sub("", line).strip().lstrip("-*+ ").strip()
+        if not line:
+            continue
+        # Drop category labels such as "Frontend:" or "Backend & Database:"
+        if ":" in line and len(line.split(":", 1)[0].split()) <= 4:
+            line = line.split(":", 1)[1]
+        items.extend(
+            item.strip(" .()") for item in ITEM_SPLIT_RE.split(line) if item.strip(" .()")
+        )
+    # Long prose lines are descriptions rather than stack entries
+    return [item for item in items if len(item.split()) <= 4]
+
+
+def extract_technologies(readme: str) -> TechExtraction:
+    """Scan a README for known technologies and score how complete the result is.
+
+    Coverage is the share of entries in a "Tech Stack" style section that the
+    alias dictionary recognised; confidence combines it with the match count.
+    With such a section only its entries are returned, so words like "react"
+    or "swift" in the surrounding prose never ride on the section's confidence.
+    """
+    readme = readme or ""
+    items = _section_items(_tech_section(readme))
+
+    if items:
+        technologies = []
+        recognised = 0
+        for item in items:
+            names = find_technologies(item)
+            recognised += bool(names)
+            technologies.extend(name for name in names if name not in technologies)
+        coverage = recognised / len(items)
+        confidence = coverage
+    else:
+        # Without a stack section, scattered mentions are a weak signal
+        technologies = find_technologies(readme)
+        coverage = 0.0
+        confidence = min(1.0, len(technologies) / 10) * 0.6
+
+    return TechExtraction(technologies, round(confidence, 2), round(coverage, 2))
+
+
+if __name__ == "__main__":
+    import sys
+
+    text = open(sys.argv[1], encoding="utf-8").read() if len(sys.argv) > 1 else sys.stdin.read()
+    print(extract_technologies(text))
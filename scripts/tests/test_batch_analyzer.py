@@ -0,0 +1,60 @@
+import pytest
+
+import batch_analyzer
+from batch_analyzer import analyze_in_batches
+from get_projects import Response
+from llm_cache import configure_cache
+from project_analyzer import ProjectAnalysis
+from retry import RetryPolicy
+
+
+# Named like LangChain's class; classification matches on the MRO names
+class OutputParserException(ValueError):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def no_cache():
+    configure_cache(enabled=False)
+    yield
+    configure_cache()
+
+
+def repo(title):
+    return Response(title=title, num_commits=5, readme=f"# {title}\nA small tool.")
+
+
+def test_an_unparseable_reply_quoting_a_500_is_bisected(monkeypatch):
+    sizes = []
+
+    def request_batch(batch):
+        sizes.append(len(batch))
+        if len(batch) > 1:
+            raise OutputParserException("Invalid json output: the API returned 500 rows")
+        return {
+            batch[0].title: ProjectAnalysis(
+                description=f"{batch[0].title} tool", status="c", technologies=[]
+            )
+        }
+
+    monkeypatch.setattr(batch_analyzer, "request_batch", request_batch)
+    projects = [repo("a"), repo("b")]
+    analyzed = analyze_in_batches(projects, policy=RetryPolicy(base_delay=0))
+
+    assert analyzed == {"a", "b"}
+    assert sizes == [2, 1, 1]
+    assert projects[0].description == "a tool"
+
+
+def test_failures_other_than_the_reply_are_left_to_the_per_repo_pipeline(monkeypatch):
+    sizes = []
+
+    def request_batch(batch):
+        sizes.append(len(batch))
+        raise KeyError("repos")
+
+    monkeypatch.setattr(batch_analyzer, "request_batch", request_batch)
+    analyzed = analyze_in_batches([repo("a"), repo("b")], policy=RetryPolicy(base_delay=0))
+
+    assert analyzed == set()
+    assert sizes == [2]
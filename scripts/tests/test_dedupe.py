@@ -0,0 +1,58 @@
+from dedupe import (
+    DEFAULT_SIMILARITY_THRESHOLD,
+    adapt_analysis,
+    duplicate_map,
+    find_duplicates,
+    readme_sketch,
+)
+from get_projects import Response
+
+TEMPLATE = (
+    "# {name}\n\nA starter template for building a full stack web application with "
+    "authentication, a REST API, background jobs, email notifications and an admin "
+    "dashboard. Clone {name}, copy the example environment file, install the "
+    "dependencies and run the development server to get started quickly.\n"
+)
+
+
+def repo(title, readme, **fields):
+    return Response(title=title, num_commits=5, readme=readme, **fields)
+
+
+def test_renamed_copies_cluster_under_the_first_repo():
+    projects = [
+        repo("starter", TEMPLATE.format(name="starter")),
+        repo("unrelated", "# Unrelated\n\n" + " ".join(f"word{i}" for i in range(60))),
+        repo("my-shop", TEMPLATE.format(name="my-shop")),
+    ]
+    clusters = find_duplicates(projects)
+    assert [(cluster.representative, cluster.members) for cluster in clusters] == [
+        ("starter", ["my-shop"])
+    ]
+    assert clusters[0].similarity >= DEFAULT_SIMILARITY_THRESHOLD
+    assert duplicate_map(clusters) == {"my-shop": "starter"}
+
+
+def test_short_readmes_never_count_as_duplicates():
+    assert readme_sketch("# App\n\nA tool.") is None
+    projects = [repo("a", "# App\n\nA tool."), repo("b", "# App\n\nA tool.")]
+    assert find_duplicates(projects) == []
+
+
+def test_adapted_analysis_uses_the_members_name_and_languages():
+    representative = repo(
+        "starter",
+        TEMPLATE.format(name="starter"),
+        description="starter is a full stack template",
+        languages=["TypeScript", "Python"],
+        status="c",
+    )
+    member = repo("my-shop", TEMPLATE.format(name="my-shop"), languages=["python", "Go"])
+
+    adapted = adapt_analysis(representative, member)
+    assert adapted.title == "my-shop"
+    assert adapted.description == "my-shop is a full stack template"
+    assert adapted.languages == ["TypeScript", "Python", "Go"]
+    assert adapted.status in ("c", "w", "p")
+    # The member itself is left untouched
+    assert member.description is None
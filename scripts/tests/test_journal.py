@@ -0,0 +1,95 @@
+import json
+import os
+
+import pytest
+
+from get_projects import Response
+from journal import RunJournal, rebuild_aggregate
+from storage import read_entries
+
+
+def repo(title="app", **fields):
+    return Response(title=title, num_commits=5, **fields)
+
+
+def started(path, resume=False, restart=False, fingerprint=None):
+    journal = RunJournal(str(path), resume, restart)
+    journal.start_project("app", fingerprint or {"sha": "1"})
+    return journal
+
+
+def test_resume_restores_completed_stages(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = started(path)
+    journal.record(repo(description="A tool"), "desc")
+    journal.record(repo(status="c"), "status")
+    assert not journal.is_complete("app")
+
+    resumed = started(path, resume=True)
+    assert resumed.completed_stages("app") == {"desc", "status"}
+    project = repo()
+    assert resumed.restore(project, "desc") and project.description == "A tool"
+    assert not resumed.restore(project, "tech")
+
+    resumed.record(repo(languages=["Go"]), "tech")
+    assert resumed.is_complete("app")
+
+
+def test_a_changed_repo_starts_over(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    started(path).record(repo(status="w"), "analysis")
+
+    resumed = started(path, resume=True, fingerprint={"sha": "2"})
+    assert resumed.completed_stages("app") == set()
+    assert not resumed.is_complete("app")
+
+
+def test_torn_final_line_is_truncated_on_resume(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    started(path).record(repo(description="Kept"), "desc")
+    intact = os.path.getsize(path)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"title": "app", "stage": "sta')
+
+    resumed = started(path, resume=True)
+    assert resumed.completed_stages("app") == {"desc"}
+    assert os.path.getsize(path) == intact
+
+
+def test_an_interrupted_journal_is_not_silently_truncated(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    started(path).record(repo(description="A tool"), "desc")
+
+    with pytest.raises(FileExistsError, match="--resume"):
+        RunJournal(str(path))
+    assert started(path, resume=True).completed_stages("app") == {"desc"}
+
+    started(path, restart=True)
+    assert os.path.getsize(path) == 0
+
+
+def test_finished_runs_leave_nothing_to_resume(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = started(path)
+    journal.finish_project("app", {"location": 0, "title": "app"})
+    journal.discard()
+
+    assert not os.path.exists(path)
+    # A new run starts without --resume or --restart
+    assert not started(path).unfinished()
+
+
+def test_rebuild_aggregate_from_finished_repos(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = RunJournal(str(path))
+    for location, title in [(1, "b"), (0, "a")]:
+        journal.start_project(title, {"sha": title})
+        journal.finish_project(title, {"location": location, "title": title})
+    journal.start_project("c", {"sha": "c"})
+    journal.record(repo("c", status="w"), "status")
+
+    output = tmp_path / "all_projects.json"
+    assert rebuild_aggregate(str(path), str(output)) == 2
+    assert [entry["title"] for entry in read_entries(str(output))] == ["a", "b"]
+    with open(path, encoding="utf-8") as f:
+        assert [json.loads(line)["stage"] for line in f] == ["done", "done", "status"]
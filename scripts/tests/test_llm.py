@@ -0,0 +1,16 @@
+import pytest
+
+from llm import configure_backend, model_id
+
+
+@pytest.fixture
+def llama_cpp():
+    configure_backend("llama-cpp")
+    yield
+    configure_backend()
+
+
+def test_the_gguf_path_is_read_after_import(llama_cpp, monkeypatch):
+    # As when .env is loaded by the CLI, long after llm was imported
+    monkeypatch.setenv("LLAMA_MODEL_PATH", "/models/qwen2.5-3b-instruct-q4_k_m.gguf")
+    assert model_id() == "llama-cpp/qwen2.5-3b-instruct-q4_k_m.gguf"
@@ -0,0 +1,72 @@
+import asyncio
+
+import async_pipeline
+import pipeline
+from get_projects import Response
+from rate_limit import TokenBucket
+from retry import RetryPolicy
+
+
+# Named like LangChain's class; classification matches on the MRO names
+class OutputParserException(ValueError):
+    pass
+
+
+def repo():
+    return Response(title="app", num_commits=5, readme="# App\nA small tool.", languages=["Go"])
+
+
+def unparseable(project):
+    raise OutputParserException("Invalid json output: the service returned HTTP 500 twice")
+
+
+def set_field(field, value):
+    def stage(project):
+        setattr(project, field, value)
+        return project
+
+    return stage
+
+
+def test_an_unparseable_fused_reply_quoting_a_500_falls_back_to_the_stages(monkeypatch):
+    monkeypatch.setattr(pipeline, "gen_project_analysis", unparseable)
+    monkeypatch.setattr(pipeline, "gen_desc", set_field("description", "A tool"))
+    monkeypatch.setattr(pipeline, "gen_project_status", set_field("status", "c"))
+    monkeypatch.setattr(pipeline, "gen_tech_stack", set_field("languages", ["Go", "Redis"]))
+
+    project = pipeline.process_project_with_ai(repo(), policy=RetryPolicy(base_delay=0))
+    assert (project.description, project.status, project.languages) == (
+        "A tool",
+        "c",
+        ["Go", "Redis"],
+    )
+
+
+def test_the_async_pipeline_falls_back_the_same_way(monkeypatch):
+    def asynchronous(func):
+        async def stage(project):
+            return func(project)
+
+        return stage
+
+    monkeypatch.setattr(async_pipeline, "agen_project_analysis", asynchronous(unparseable))
+    monkeypatch.setattr(
+        async_pipeline, "agen_desc", asynchronous(set_field("description", "A tool"))
+    )
+    monkeypatch.setattr(
+        async_pipeline, "agen_project_status", asynchronous(set_field("status", "c"))
+    )
+    monkeypatch.setattr(
+        async_pipeline, "agen_tech_stack", asynchronous(set_field("languages", ["Go", "Redis"]))
+    )
+
+    project = asyncio.run(
+        async_pipeline.aprocess_project_with_ai(
+            repo(), TokenBucket(), policy=RetryPolicy(base_delay=0)
+        )
+    )
+    assert (project.description, project.status, project.languages) == (
+        "A tool",
+        "c",
+        ["Go", "Redis"],
+    )
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+import async_pipeline
+import get_projects
+from fake_llm import install_fake_model
+from fake_servers import fake_repos_api
+from http_cache import configure_http_cache
+from llm import use_model
+from llm_cache import configure_cache
+from main import process_all_projects
+from run_config import RunConfig
+from scheduler import DailyQuota, RepoCost
+from tracing import configure_tracing
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    server = fake_repos_api(4).start()
+    monkeypatch.setattr(get_projects, "GITHUB_STATS_API", server.url)
+    configure_cache(enabled=False)
+    configure_http_cache(enabled=False)
+    configure_tracing(None)
+    model = install_fake_model()
+    yield model
+    use_model(None)
+    configure_tracing(None)
+    configure_http_cache()
+    configure_cache()
+    server.stop()
+
+
+def test_concurrent_runs_admit_each_repo_against_what_was_spent(offline, tmp_path, monkeypatch):
+    quota = DailyQuota(requests_per_day=4, path=str(tmp_path / "quota.json"))
+    analyze = async_pipeline.agen_project_analysis
+
+    async def analyze_while_another_run_spends(project):
+        # Another tenant sharing the quota spends two requests after planning
+        if offline.requests == 0:
+            quota.charge(RepoCost(2, 0))
+        return await analyze(project)
+
+    monkeypatch.setattr(
+        async_pipeline, "agen_project_analysis", analyze_while_another_run_spends
+    )
+    config = RunConfig(concurrency=1, quota=quota, snapshot=False)
+    written = process_all_projects(config, "someone", data_dir=str(tmp_path / "data"))
+
+    # All four fit the plan, but only two still fit when their turn came
+    assert offline.requests == 2
+    assert quota.remaining().requests == 0
+    # Deferred repos still get a basic entry, but no analyzed file
+    assert written == 4
+    analyzed = [name for name in os.listdir(tmp_path / "data") if name.startswith("synthetic")]
+    assert len(analyzed) == 2
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+
+import pytest
+
+import rate_limit
+import retry
+from rate_limit import TokenBucket
+from retry import AdaptiveLimiter, StageRetryStats
+
+
+class FakeTime:
+    """A clock that only moves when told to, or when something sleeps"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(rate_limit, "time", fake)
+    return fake
+
+
+def test_burst_within_the_budget_does_not_wait(clock):
+    bucket = TokenBucket(requests_per_minute=3)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    # The fourth call waits for one request to refill
+    assert bucket.reserve() == pytest.approx(20)
+
+
+def test_budgets_refill_continuously(clock):
+    bucket = TokenBucket(requests_per_minute=2)
+    bucket.reserve()
+    bucket.reserve()
+    clock.now += 30
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(30)
+
+
+def test_token_budget_paces_large_prompts(clock):
+    bucket = TokenBucket(requests_per_minute=100, tokens_per_minute=1000)
+    assert bucket.reserve(600) == 0
+    assert bucket.reserve(600) == pytest.approx(12)
+    # A prompt larger than the whole budget is clamped rather than stuck forever
+    assert bucket.reserve(5000) == pytest.approx(72)
+
+
+def test_over_budget_callers_queue_in_order(clock):
+    bucket = TokenBucket(requests_per_minute=1)
+    waits = [bucket.reserve() for _ in range(3)]
+    assert waits == [0, pytest.approx(60), pytest.approx(120)]
+
+
+def test_acquire_sleeps_for_the_reserved_wait(clock):
+    bucket = TokenBucket(requests_per_minute=1)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(60)
+    assert clock.slept == [pytest.approx(60)]
+
+
+def test_limiter_grows_additively_up_to_the_maximum():
+    limiter = AdaptiveLimiter(maximum=4, initial=2)
+    limiter.on_success()
+    assert limiter.limit == pytest.approx(2.5)
+    for _ in range(20):
+        limiter.on_success()
+    assert limiter.limit == 4
+
+
+def test_limiter_halves_once_per_cooldown(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(retry.time, "monotonic", lambda: now[0])
+    limiter = AdaptiveLimiter(maximum=8, cooldown=5)
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert (limiter.limit, limiter.decreases) == (4, 1)
+
+    now[0] += 6
+    limiter.on_throttle()
+    limiter.on_throttle()
+    limiter.on_throttle()
+    # Never below the minimum
+    assert (limiter.limit, limiter.decreases) == (2, 2)
+    now[0] += 6
+    limiter.on_throttle()
+    now[0] += 6
+    limiter.on_throttle()
+    assert limiter.limit == 1
+
+
+def test_limiter_caps_calls_in_flight():
+    limiter = AdaptiveLimiter(maximum=2)
+    in_flight = []
+    peak = []
+
+    async def call():
+        async with limiter:
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(main())
+    assert max(peak) == 2
+    assert limiter.in_flight == 0
+
+
+def test_retry_stats_count_every_thread():
+    stats = StageRetryStats()
+
+    def work():
+        for _ in range(2000):
+            stats.add(calls=1, sleep_seconds=0.5)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert (stats.calls, stats.sleep_seconds) == (16000, 8000)
@@ -0,0 +1,15 @@
+from get_projects import Response
+from readme_compactor import compact_project
+from tokens import count_tokens
+
+
+def test_the_report_counts_with_the_budgets_counter():
+    readme = "# App\n\n" + "\n\n".join(
+        f"Paragraph {i} explains another part of the app in some detail." for i in range(40)
+    )
+    project = Response(title="app", num_commits=5, readme=readme)
+
+    report = compact_project(project, max_tokens=100)
+    assert report.tokens_before == count_tokens(readme)
+    assert report.tokens_after == count_tokens(project.readme)
+    assert report.tokens_after <= 100 < report.tokens_before
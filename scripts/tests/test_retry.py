@@ -0,0 +1,90 @@
+import pytest
+
+from retry import (
+    FATAL,
+    QUOTA_EXHAUSTED,
+    RATE_LIMITED,
+    TRANSIENT,
+    RetryPolicy,
+    call_with_retry,
+    classify_error,
+    daily_quota_exhausted,
+    is_output_error,
+)
+
+
+# Stand-ins named like the SDK classes; classification matches on the MRO names
+class OutputParserException(ValueError):
+    pass
+
+
+class ResourceExhausted(Exception):
+    pass
+
+
+class ServiceUnavailable(Exception):
+    pass
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [
+        "Invalid json output: The API returned 500 rows",
+        "Invalid json output: a timeout of 30 seconds",
+        "Invalid json output: free tier quota, 100 requests per day",
+    ],
+)
+def test_unparseable_replies_are_output_errors_whatever_they_quote(reply):
+    error = OutputParserException(reply)
+    assert classify_error(error) == FATAL
+    assert is_output_error(error)
+
+
+def test_a_wrapped_parser_error_is_still_an_output_error():
+    try:
+        try:
+            raise OutputParserException("503 in the reply")
+        except OutputParserException as parse_error:
+            raise RuntimeError("chain failed") from parse_error
+    except RuntimeError as error:
+        assert classify_error(error) == FATAL
+        assert is_output_error(error)
+
+
+def test_provider_errors_are_classified_by_type_then_message():
+    assert classify_error(ResourceExhausted("slow down")) == RATE_LIMITED
+    assert classify_error(ServiceUnavailable("try later")) == TRANSIENT
+    assert classify_error(RuntimeError("HTTP 503 from upstream")) == TRANSIENT
+    assert classify_error(RuntimeError("429 Too Many Requests")) == RATE_LIMITED
+    assert (
+        classify_error(ResourceExhausted("GenerateRequestsPerDayPerProjectPerModel-FreeTier"))
+        == QUOTA_EXHAUSTED
+    )
+    assert not is_output_error(ResourceExhausted("quota"))
+    assert classify_error(KeyError("description")) == FATAL
+
+
+def test_output_errors_are_not_retried_and_do_not_end_the_day():
+    calls = []
+
+    def reply_quoting_a_quota():
+        calls.append(1)
+        raise OutputParserException("Invalid json output: 50 requests per day quota")
+
+    with pytest.raises(OutputParserException):
+        call_with_retry("test_output", reply_quoting_a_quota, policy=RetryPolicy(base_delay=0))
+    assert len(calls) == 1
+    assert not daily_quota_exhausted()
+
+
+def test_transient_errors_are_retried(monkeypatch):
+    monkeypatch.setattr("retry.time.sleep", lambda seconds: None)
+    attempts = iter([ServiceUnavailable("busy"), None])
+
+    def flaky():
+        error = next(attempts)
+        if error:
+            raise error
+        return "ok"
+
+    assert call_with_retry("test_transient", flaky) == "ok"
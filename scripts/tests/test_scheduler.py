@@ -0,0 +1,64 @@
+from get_projects import Response
+from rate_limit import TokenBucket
+from scheduler import DailyQuota, QuotaScheduler, RepoCost
+
+
+def repo(title, num_commits=1):
+    return Response(title=title, num_commits=num_commits, readme=f"# {title}\nA small tool.")
+
+
+def candidates():
+    # Newest first; "c" is the oldest but has by far the most commits
+    return [
+        (0, repo("a"), "new"),
+        (1, repo("b"), "new"),
+        (2, repo("c", num_commits=100), "new"),
+    ]
+
+
+def test_plan_admits_the_highest_priority_repos_within_the_budget(tmp_path):
+    quota = DailyQuota(requests_per_day=2, path=str(tmp_path / "quota.json"))
+    scheduler = QuotaScheduler(quota, TokenBucket())
+
+    admitted = scheduler.plan(candidates(), listing_size=3)
+    assert [project.title for _, project in admitted] == ["a", "c"]
+    assert [repo.project.title for repo in scheduler.deferred] == ["b"]
+
+
+def test_weights_change_the_order(tmp_path):
+    quota = DailyQuota(requests_per_day=1, path=str(tmp_path / "quota.json"))
+    scheduler = QuotaScheduler(quota, TokenBucket(), {"recency": 0})
+
+    admitted = scheduler.plan(candidates(), listing_size=3)
+    assert [project.title for _, project in admitted] == ["c"]
+
+
+def test_near_duplicates_follow_their_representative(tmp_path):
+    quota = DailyQuota(requests_per_day=1, path=str(tmp_path / "quota.json"))
+    scheduler = QuotaScheduler(quota, TokenBucket())
+
+    admitted = scheduler.plan(candidates(), listing_size=3, duplicate_of={"b": "a"})
+    assert [project.title for _, project in admitted] == ["a", "b"]
+    assert [repo.project.title for repo in scheduler.deferred] == ["c"]
+    assert scheduler.admit("b")
+
+
+def test_spending_carries_over_to_later_runs_the_same_day(tmp_path):
+    path = str(tmp_path / "quota.json")
+    DailyQuota(requests_per_day=2, path=path).charge(RepoCost(2, 500))
+
+    quota = DailyQuota(requests_per_day=2, tokens_per_day=1000, path=path)
+    assert quota.remaining() == RepoCost(0, 500)
+    assert not quota.fits(RepoCost(1, 0))
+
+
+def test_admit_defers_once_the_day_is_spent(tmp_path):
+    quota = DailyQuota(requests_per_day=2, path=str(tmp_path / "quota.json"))
+    scheduler = QuotaScheduler(quota, TokenBucket())
+    scheduler.plan(candidates()[:2], listing_size=2)
+
+    assert scheduler.admit("a")
+    quota.charge(RepoCost(2, 0))
+    assert not scheduler.admit("b")
+    assert not scheduler.admit("b")
+    assert [repo.project.title for repo in scheduler.deferred] == ["b"]
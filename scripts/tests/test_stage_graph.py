@@ -0,0 +1,80 @@
+import asyncio
+import threading
+
+from get_projects import Response
+from stage_graph import (
+    INDIVIDUAL_STAGE_SPECS,
+    StageSpec,
+    arun_stage_graph,
+    run_stage_graph,
+    stage_dependencies,
+)
+
+
+def repo():
+    return Response(title="app", num_commits=5, description="old", languages=["Python"])
+
+
+def test_individual_stages_are_independent():
+    assert stage_dependencies(INDIVIDUAL_STAGE_SPECS) == {"desc": [], "status": [], "tech": []}
+
+
+def test_stages_wait_for_earlier_writers_of_what_they_touch():
+    specs = [
+        StageSpec("a", ("readme",), ("description",)),
+        StageSpec("b", ("description",), ("status",)),
+        StageSpec("c", ("readme",), ("description",)),
+        StageSpec("d", ("readme",), ("languages",)),
+    ]
+    assert stage_dependencies(specs) == {"a": [], "b": ["a"], "c": ["a"], "d": []}
+
+
+def test_independent_stages_run_side_by_side_and_merge_only_their_writes():
+    # Every stage has to reach the barrier before any can finish
+    barrier = threading.Barrier(3, timeout=5)
+
+    def stage(field, value):
+        def run(project):
+            barrier.wait()
+            project.description = f"clobbered by {field}"
+            setattr(project, field, value)
+            return project
+
+        return run
+
+    project = run_stage_graph(
+        repo(),
+        list(
+            zip(
+                INDIVIDUAL_STAGE_SPECS,
+                [
+                    stage("description", "new"),
+                    stage("status", "c"),
+                    stage("languages", ["Go"]),
+                ],
+            )
+        ),
+    )
+    assert (project.description, project.status, project.languages) == ("new", "c", ["Go"])
+
+
+def test_async_stages_see_their_dependencies_results():
+    specs = [
+        StageSpec("desc", ("readme",), ("description",)),
+        StageSpec("status", ("description",), ("status",)),
+    ]
+    seen = []
+
+    async def desc(project):
+        await asyncio.sleep(0.01)
+        project.description = "new"
+        return project
+
+    async def status(project):
+        seen.append(project.description)
+        project.status = "w"
+        return project
+
+    project = asyncio.run(arun_stage_graph(repo(), list(zip(specs, [desc, status]))))
+    assert seen == ["new"]
+    assert (project.description, project.status) == ("new", "w")
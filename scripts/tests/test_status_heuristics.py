@@ -0,0 +1,52 @@
+import pytest
+
+from get_projects import Response
+from status_heuristics import (
+    HEURISTIC_MIN_HOLDOUT_ACCURACY,
+    STATUS_FIXTURES_PATH,
+    STATUS_HOLDOUT_PATH,
+    classify_status,
+    heuristic_accuracy,
+    load_status_fixtures,
+)
+
+
+@pytest.mark.parametrize("path", [STATUS_FIXTURES_PATH, STATUS_HOLDOUT_PATH])
+def test_heuristics_stay_accurate_on_the_labelled_fixtures(path):
+    decided, correct = heuristic_accuracy(load_status_fixtures(path))
+    assert decided
+    assert correct / decided >= HEURISTIC_MIN_HOLDOUT_ACCURACY
+
+
+def test_a_deployed_project_is_completed():
+    repo = Response(
+        title="shop",
+        num_commits=150,
+        live_website_url="https://shop.example.com",
+        languages=["TypeScript"],
+        readme="# Shop\n\nA stable, production-ready storefront. Live demo at shop.example.com.",
+    )
+    assert classify_status(repo).status == "c"
+
+
+def test_negated_completion_counts_as_work_in_progress():
+    repo = Response(
+        title="engine",
+        num_commits=30,
+        languages=["Rust"],
+        readme="# Engine\n\nThe renderer is not yet finished and has never been deployed.\n"
+        "## TODO\n- [ ] shadows\n- [ ] textures\n",
+    )
+    prediction = classify_status(repo)
+    assert prediction.status == "w"
+    assert prediction.scores["c"] == 0
+
+
+def test_mixed_signals_are_left_to_the_model():
+    repo = Response(
+        title="tool",
+        num_commits=20,
+        languages=["Python"],
+        readme="# Tool\n\nReleased v1.2. Work in progress on the next version.",
+    )
+    assert classify_status(repo).status is None
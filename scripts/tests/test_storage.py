@@ -0,0 +1,125 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+import storage
+from storage import AggregateWriter, atomic_open, read_entries, write_json
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def entry(title, location):
+    return {"location": location, "title": title, "status": "Completed"}
+
+
+def test_commit_orders_and_renumbers_entries(tmp_path):
+    path = str(tmp_path / "all_projects.json")
+    with AggregateWriter(path) as aggregate:
+        aggregate.add(entry("b", 7))
+        aggregate.add(entry("a", 2))
+        aggregate.add(entry("c", 9))
+        assert aggregate.commit() == 3
+
+    assert read_entries(path) == [entry("a", 0), entry("b", 1), entry("c", 2)]
+    assert not os.path.exists(f"{path}.partial.ndjson")
+
+
+@pytest.mark.parametrize("output_format", ["pretty", "compact"])
+def test_json_formats_match_json_dump(tmp_path, output_format):
+    path = str(tmp_path / "all_projects.json")
+    entries = [entry("a", 0), {**entry("b", 1), "technologies": ["Python", "Go"]}]
+    with AggregateWriter(path, output_format) as aggregate:
+        for item in entries:
+            aggregate.add(item)
+        aggregate.commit()
+
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == storage.dumps(entries, compact=output_format == "compact")
+
+
+def test_ndjson_and_empty_aggregates(tmp_path):
+    path = str(tmp_path / "all_projects.ndjson")
+    with AggregateWriter(path, "ndjson") as aggregate:
+        aggregate.add(entry("a", 0))
+        aggregate.commit()
+    assert read_entries(path) == [entry("a", 0)]
+
+    empty = str(tmp_path / "empty.json")
+    with AggregateWriter(empty) as aggregate:
+        assert aggregate.commit() == 0
+    assert read_entries(empty) == []
+
+
+def test_duplicate_titles_are_rejected(tmp_path):
+    with AggregateWriter(str(tmp_path / "all_projects.json")) as aggregate:
+        aggregate.add(entry("a", 0))
+        with pytest.raises(ValueError):
+            aggregate.add(entry("a", 1))
+
+
+def test_failed_write_keeps_the_previous_file(tmp_path):
+    path = str(tmp_path / "all_projects.json")
+    write_json(path, [entry("old", 0)])
+
+    with pytest.raises(RuntimeError):
+        with atomic_open(path) as f:
+            f.write("[{")
+            raise RuntimeError("crash mid-write")
+
+    assert read_entries(path) == [entry("old", 0)]
+    assert os.listdir(tmp_path) == ["all_projects.json"]
+
+
+def test_close_without_commit_keeps_the_previous_aggregate(tmp_path):
+    path = str(tmp_path / "all_projects.json")
+    write_json(path, [entry("old", 0)])
+
+    with AggregateWriter(path) as aggregate:
+        aggregate.add(entry("new", 0))
+
+    assert read_entries(path) == [entry("old", 0)]
+    assert os.listdir(tmp_path) == ["all_projects.json"]
+
+
+def test_spool_of_a_crashed_run_is_cleared(tmp_path):
+    path = str(tmp_path / "all_projects.json")
+    write_json(path, [entry("old", 0)])
+
+    # A process that dies mid-run, without closing the writer or unwinding
+    crash = textwrap.dedent(
+        f"""
+        import os
+        from storage import AggregateWriter
+
+        aggregate = AggregateWriter({path!r})
+        aggregate.add({{"location": 0, "title": "half-done", "status": "Planned"}})
+        aggregate._spool.flush()
+        os._exit(1)
+        """
+    )
+    result = subprocess.run([sys.executable, "-c", crash], cwd=SCRIPTS_DIR)
+    assert result.returncode == 1
+    spool_path = f"{path}.partial.ndjson"
+    assert os.path.getsize(spool_path) > 0
+    assert read_entries(path) == [entry("old", 0)]
+
+    with AggregateWriter(path) as aggregate:
+        aggregate.add(entry("new", 0))
+        aggregate.commit()
+
+    assert read_entries(path) == [entry("new", 0)]
+    assert not os.path.exists(spool_path)
+
+
+@pytest.mark.skipif(storage.fcntl is None, reason="spool locking needs fcntl")
+def test_spool_held_by_another_run_is_refused(tmp_path):
+    path = str(tmp_path / "all_projects.json")
+    with AggregateWriter(path) as live:
+        live.add(entry("a", 0))
+        with pytest.raises(FileExistsError):
+            AggregateWriter(path)
+        assert live.commit() == 1
+    assert read_entries(path) == [entry("a", 0)]
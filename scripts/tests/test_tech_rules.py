@@ -0,0 +1,59 @@
+from tech_rules import AhoCorasick, extract_technologies, find_technologies
+
+
+def test_matcher_follows_failure_links_to_overlapping_patterns():
+    matcher = AhoCorasick({"he": "HE", "she": "SHE", "his": "HIS", "hers": "HERS"})
+    # Whole-word matches only, so embed each word between spaces
+    assert matcher.find("ushers") == []
+    assert sorted(matcher.find("she hers his")) == [
+        (0, 3, "SHE"),
+        (4, 8, "HERS"),
+        (9, 12, "HIS"),
+    ]
+
+
+def test_matcher_reports_suffix_patterns_at_the_same_end():
+    matcher = AhoCorasick({"next.js": "Next.js", "js": "JavaScript"})
+    assert sorted(matcher.find("next.js")) == [(0, 7, "Next.js"), (5, 7, "JavaScript")]
+
+
+def test_aliases_must_be_whole_words():
+    assert find_technologies("written in javascript") == ["JavaScript"]
+    assert find_technologies("reads config.json files") == []
+    assert find_technologies("a c++ and c# port") == ["C++", "C#"]
+
+
+def test_longest_alias_wins_and_order_follows_first_mention():
+    text = "Built with React Native and TypeScript; the web app uses react and python."
+    assert find_technologies(text) == ["React Native", "TypeScript", "React", "Python"]
+    assert find_technologies("Next.js frontend") == ["Next.js"]
+
+
+def test_extraction_scores_the_tech_stack_section():
+    readme = (
+        "# App\n\nA tool.\n\n## Tech Stack\n"
+        "- Frontend: React, TypeScript\n- Backend: FastAPI\n- Obscurelib\n\n"
+        "## Setup\nRun it.\n"
+    )
+    extraction = extract_technologies(readme)
+    assert extraction.technologies[:2] == ["React", "TypeScript"]
+    assert extraction.coverage == 0.75
+    assert extraction.confidence == 0.75
+
+
+def test_extraction_without_a_stack_section_is_low_confidence():
+    extraction = extract_technologies("A python script that talks to postgres.")
+    assert extraction.coverage == 0
+    assert extraction.confidence < 0.5
+    assert extract_technologies("").technologies == []
+
+
+def test_prose_outside_the_stack_section_is_not_returned():
+    readme = (
+        "# Remix\n\nA playlist remix tool that lets you react to tracks quickly. "
+        "First bootstrap the db, then watch it swift through your library.\n\n"
+        "## Tech Stack\n- Python\n- Flask\n"
+    )
+    extraction = extract_technologies(readme)
+    assert extraction.technologies == ["Python", "Flask"]
+    assert extraction.confidence == 1.0
@@ -0,0 +1,32 @@
+import json
+
+import requests
+
+from update_latest import bulk_upsert_projects
+
+
+class StubSession:
+    """Answers every POST with the queued (status, body) replies in order"""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+
+    def post(self, url, json=None, timeout=None):
+        status, body = self.replies.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response._content = body
+        return response
+
+
+def projects(*titles):
+    return [{"title": title, "githubLink": f"https://github.com/u/{title}"} for title in titles]
+
+
+def test_a_200_reply_that_is_not_json_leaves_the_batch_unsynced():
+    session = StubSession(
+        (200, b"<html>Gateway maintenance</html>"),
+        (200, json.dumps({"upserted": 1, "modified": 0}).encode()),
+    )
+    synced = bulk_upsert_projects(projects("a", "b"), "api.test", session, batch_size=1)
+    assert synced == ["b"]
@@ -0,0 +1,48 @@
+from typing import Any
+
+_encoding: Any = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the number of model tokens in a piece of text"""
+    if not text:
+        return 0
+    # Gemini and GPT style tokenizers average about four characters per token
+    return max(1, len(text) // 4)
+
+
+def _load_encoding() -> Any:
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            # Not installed, or offline before its vocabulary was first cached
+            print(
+                f"⚠️  tiktoken unavailable ({type(e).__name__}: {e}); "
+                "prompt budgets fall back to the characters / 4 estimate"
+            )
+            _encoding = False
+    return _encoding
+
+
+def token_counter() -> str:
+    """Which counter count_tokens uses, for logs and reports"""
+    return "tiktoken cl100k_base" if _load_encoding() else "characters / 4 estimate"
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken's cl100k_base, a declared dependency.
+
+    Gemini's tokenizer is not available offline, but a real BPE count tracks
+    it far more closely than the character estimate, which is the fallback
+    (with a warning) when tiktoken cannot be loaded.
+    """
+    if not text:
+        return 0
+    encoding = _load_encoding()
+    if encoding is False:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
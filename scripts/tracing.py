@@ -0,0 +1,194 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+from tokens import token_counter
+
+DEFAULT_TRACE_PATH = os.path.join("./data", "trace.jsonl")
+
+# Attributes summed per span name in the run summary
+SUMMED_ATTRIBUTES = (
+    "model_calls",
+    "estimated_tokens",
+    "input_tokens",
+    "output_tokens",
+    "retries",
+    "bytes",
+)
+
+
+class Span:
+    """One timed operation and the attributes recorded while it ran"""
+
+    def __init__(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.start = time.time()
+        self._start_counter = time.perf_counter()
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def add(self, attribute: str, amount: float = 1) -> None:
+        self.attributes[attribute] = self.attributes.get(attribute, 0) + amount
+
+    def record_usage(self, message: Any) -> None:
+        """Add the token counts LangChain reports on a model response"""
+        usage = getattr(message, "usage_metadata", None)
+        if usage:
+            self.add("input_tokens", usage.get("input_tokens", 0))
+            self.add("output_tokens", usage.get("output_tokens", 0))
+            return
+        # Older langchain-google-genai releases only fill response_metadata
+        metadata = (getattr(message, "response_metadata", None) or {}).get(
+            "usage_metadata"
+        ) or {}
+        self.add("input_tokens", metadata.get("prompt_token_count", 0))
+        self.add("output_tokens", metadata.get("candidates_token_count", 0))
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start_counter
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Span:
+    """The innermost open span, or a detached one that is simply discarded"""
+    return _current_span.get() or Span("detached")
+
+
+class Tracer:
+    """Collect spans for one run, appending each to a JSON-lines file.
+
+    Without a path spans are only aggregated for print_summary. Every line
+    carries the run id so several runs can share one trace file.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.run_id = uuid.uuid4().hex[:12]
+        self._durations: Dict[str, List[float]] = defaultdict(list)
+        self._totals: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._errors: Dict[str, int] = defaultdict(int)
+        self._cache_hits: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._file = None
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Time the body as a span; nested code can reach it via current_span"""
+        span = Span(name, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as error:
+            span.set(error=type(error).__name__)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.finish(span, span.elapsed())
+
+    def record(self, name: str, seconds: float, **attributes: Any) -> None:
+        """Record a span whose duration was measured by the caller"""
+        span = Span(name, attributes)
+        span.start -= seconds
+        self.finish(span, seconds)
+
+    def finish(self, span: Span, seconds: float) -> None:
+        record = {
+            "run": self.run_id,
+            "span": span.name,
+            "start": round(span.start, 3),
+            "duration_ms": round(seconds * 1000, 2),
+            **span.attributes,
+        }
+        with self._lock:
+            self._durations[span.name].append(seconds)
+            for attribute in SUMMED_ATTRIBUTES:
+                value = span.attributes.get(attribute)
+                if isinstance(value, (int, float)):
+                    self._totals[span.name][attribute] += value
+            if "error" in span.attributes:
+                self._errors[span.name] += 1
+            if span.attributes.get("cache") == "hit":
+                self._cache_hits[span.name] += 1
+            if self.path:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self._file.flush()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per span name: count, p50/p95/total milliseconds and summed attributes"""
+        with self._lock:
+            result = {}
+            for name, durations in self._durations.items():
+                ordered = sorted(durations)
+                result[name] = {
+                    "count": len(ordered),
+                    "p50_ms": round(_percentile(ordered, 50) * 1000, 1),
+                    "p95_ms": round(_percentile(ordered, 95) * 1000, 1),
+                    "total_ms": round(sum(ordered) * 1000, 1),
+                    "errors": self._errors[name],
+                    "cache_hits": self._cache_hits[name],
+                    **{key: int(value) for key, value in self._totals[name].items()},
+                }
+            return result
+
+    def print_summary(self) -> None:
+        summary = self.summary()
+        if not summary:
+            return
+        print(f"⏱️  Trace summary (run {self.run_id}):")
+        print(
+            f"  {'span':<10} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'total s':>8} "
+            f"{'est in':>8} {'tok in':>8} {'tok out':>8} {'cached':>7} {'retries':>8} "
+            f"{'errors':>7} {'KiB':>8}"
+        )
+        for name, row in sorted(summary.items()):
+            print(
+                f"  {name:<10} {row['count']:>6} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+                f"{row['total_ms'] / 1000:>8.2f} {row.get('estimated_tokens', 0):>8} "
+                f"{row.get('input_tokens', 0):>8} {row.get('output_tokens', 0):>8} "
+                f"{row['cache_hits']:>7} "
+                f"{row.get('retries', 0):>8} {row['errors']:>7} "
+                f"{row.get('bytes', 0) / 1024:>8.1f}"
+            )
+        if any(row.get("estimated_tokens") for row in summary.values()):
+            print(f"  est in: prompt tokens counted locally with {token_counter()}")
+        if self.path:
+            print(f"  Spans appended to '{self.path}'")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a sorted, non-empty list"""
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def configure_tracing(path: Optional[str] = DEFAULT_TRACE_PATH) -> Tracer:
+    """Start a new run's tracer, writing spans to path (None = summary only)"""
+    global _tracer
+    _tracer.close()
+    _tracer = Tracer(path)
+    return _tracer
@@ -2,18 +2,56 @@
 """
 Mini version of main.py that processes the latest N projects and adds them to MongoDB via API.
 Usage: python update_latest.py <number_of_projects>
+       python update_latest.py --incremental [max_projects]
 """
 
 import sys
 import json
 import time
+import argparse
 import requests
 import os
-from typing import Dict, Any, List
-from get_projects import get_projects, Response
-from discription_generator import gen_desc
-from status_analyzer import gen_project_status
-from tech_extractor import gen_tech_stack
+from typing import Dict, Any, List, Optional
+from get_projects import (
+    DEFAULT_GITHUB_USERNAME,
+    Response,
+    create_session,
+    get_projects,
+)
+from cli import (
+    add_concurrency_arguments,
+    add_cache_arguments,
+    add_compaction_arguments,
+    add_backend_arguments,
+    add_batch_arguments,
+    add_dry_run_arguments,
+    add_snapshot_arguments,
+    add_tracing_arguments,
+    configure_backend_from_args,
+    configure_cache_from_args,
+    configure_stage_budgets_from_args,
+    configure_tracing_from_args,
+    run_config_from_args,
+)
+from readme_compactor import compact_projects, print_compaction_report
+from llm_cache import get_cache, cache_stats
+from http_cache import configure_http_cache, http_cache_stats
+from retry import print_retry_stats
+from main import create_project_json as create_aggregate_entry
+from storage import write_json
+from snapshot import SNAPSHOT_DIR, build_snapshot, print_snapshot
+from prompt_builder import build_payload
+from tracing import get_tracer
+from run_config import RunConfig
+from manifest import (
+    ALL_PROJECTS_PATH,
+    diff_projects,
+    fingerprint,
+    load_aggregate,
+    load_manifest,
+    merge_aggregate,
+    save_manifest,
+)
 
 
 def convert_status_to_readable(status: str) -> str:
@@ -22,81 +60,61 @@ def convert_status_to_readable(status: str) -> str:
     return status_map.get(status, "Work in Progress")
 
 
-def create_project_json(repo_data: Response, position: int) -> Dict[str, Any]:
+def create_project_json(
+    repo_data: Response, position: int, username: str = DEFAULT_GITHUB_USERNAME
+) -> Dict[str, Any]:
     """Convert Response object to the required JSON format for MongoDB"""
     return {
         "position": position,
         "title": repo_data.title,
         "description": repo_data.description or "",
         "technologies": repo_data.languages or [],
-        "githubLink": f"https://github.com/tashifkhan/{repo_data.title}",
+        "githubLink": f"https://github.com/{username}/{repo_data.title}",
         "liveLink": repo_data.live_website_url or "",
         "status": convert_status_to_readable(repo_data.status or "w"),
     }
 
 
-def process_project_with_ai(project: Response, retry_delay: int = 60) -> Response:
-    """Process a single project with AI functions and retry logic"""
-    print(f"  - Generating description...")
-    try:
-        project = gen_desc(project)
-    except Exception as desc_error:
-        print(f"    Description generation failed: {str(desc_error)}")
-        if "ResourceExhausted" in str(desc_error) or "429" in str(desc_error):
-            print(f"    Rate limit hit, waiting {retry_delay} seconds...")
-            time.sleep(retry_delay)
-            try:
-                project = gen_desc(project)
-            except Exception:
-                print("    Retry failed, using original description")
+def normalize_api_base_url(api_base_url: str) -> str:
+    """Add a scheme to bare hosts such as the portfolio.tashifc.codes default"""
+    if "://" not in api_base_url:
+        api_base_url = f"https://{api_base_url}"
+    return api_base_url.rstrip("/")
 
-    print(f"  - Analyzing project status...")
-    try:
-        project = gen_project_status(project)
-    except Exception as status_error:
-        print(f"    Status analysis failed: {str(status_error)}")
-        if "ResourceExhausted" in str(status_error) or "429" in str(status_error):
-            print(f"    Rate limit hit, waiting {retry_delay} seconds...")
-            time.sleep(retry_delay)
-            try:
-                project = gen_project_status(project)
-            except Exception:
-                print("    Retry failed, using default status")
-                project.status = "w"  # Default to work in progress
 
-    print(f"  - Extracting tech stack...")
-    try:
-        project = gen_tech_stack(project)
-    except Exception as tech_error:
-        print(f"    Tech stack extraction failed: {str(tech_error)}")
-        if "ResourceExhausted" in str(tech_error) or "429" in str(tech_error):
-            print(f"    Rate limit hit, waiting {retry_delay} seconds...")
-            time.sleep(retry_delay)
-            try:
-                project = gen_tech_stack(project)
-            except Exception:
-                print("    Retry failed, using original languages")
+def create_api_session() -> requests.Session:
+    """Keep-alive session for the projects API, authenticated when API_TOKEN is set"""
+    # Upserts keyed on githubLink are idempotent, so POSTs are safe to retry
+    session = create_session(retry_methods=("GET", "HEAD", "POST"))
+    session.headers["Content-Type"] = "application/json"
+    api_token = os.getenv("API_TOKEN")
+    if api_token:
+        # The API routes authenticate with the admin login cookie
+        session.cookies.set("auth_token", api_token)
+    return session
+
 
-    return project
+def transferred_bytes(response: requests.Response) -> int:
+    """Request plus response body size of a completed API call"""
+    body = response.request.body if response.request is not None else None
+    return len(body or b"") + len(response.content)
 
 
-def add_project_to_mongodb(project_data: Dict[str, Any], api_base_url: str) -> bool:
+def add_project_to_mongodb(
+    project_data: Dict[str, Any],
+    api_base_url: str,
+    session: Optional[requests.Session] = None,
+) -> bool:
     """Add a single project to MongoDB via the API"""
     try:
-        # You'll need to set up authentication token if required
-        # For now, assuming the API endpoint accepts direct POST
-        headers = {
-            "Content-Type": "application/json",
-            # Add authentication headers if needed:
-            # 'Authorization': f'Bearer {os.getenv("API_TOKEN")}'
-        }
-
-        response = requests.post(
-            f"{api_base_url}/api/projects",
-            json=project_data,
-            headers=headers,
-            timeout=30,
-        )
+        session = session or create_api_session()
+        with get_tracer().span("push", title=project_data["title"], projects=1) as span:
+            response = session.post(
+                f"{normalize_api_base_url(api_base_url)}/api/projects",
+                json=project_data,
+                timeout=30,
+            )
+            span.set(status=response.status_code, bytes=transferred_bytes(response))
 
         if response.status_code == 201:
             print(f"    ✅ Successfully added '{project_data['title']}' to MongoDB")
@@ -119,28 +137,150 @@ def add_project_to_mongodb(project_data: Dict[str, Any], api_base_url: str) -> b
         return False
 
 
+def bulk_upsert_projects(
+    projects: List[Dict[str, Any]],
+    api_base_url: str,
+    session: Optional[requests.Session] = None,
+    batch_size: int = 100,
+) -> List[str]:
+    """Upsert projects keyed on githubLink in batched requests, returning synced titles"""
+    session = session or create_api_session()
+    url = f"{normalize_api_base_url(api_base_url)}/api/projects/bulk"
+    synced = []
+
+    for start in range(0, len(projects), batch_size):
+        batch = projects[start : start + batch_size]
+        try:
+            with get_tracer().span("push", projects=len(batch)) as span:
+                response = session.post(url, json={"projects": batch}, timeout=60)
+                span.set(status=response.status_code, bytes=transferred_bytes(response))
+        except requests.exceptions.RequestException as e:
+            print(f"    ❌ Network error syncing {len(batch)} projects: {str(e)}")
+            continue
+
+        if response.status_code == 200:
+            try:
+                result = response.json()
+            except ValueError:
+                # A proxy or error page answering 200; the batch is retried next run
+                print(f"    ❌ Failed to sync {len(batch)} projects: the reply was not JSON")
+                print(f"    Response: {response.text[:200]}")
+                continue
+            print(
+                f"    ✅ Synced {len(batch)} projects "
+                f"({result.get('upserted', 0)} added, {result.get('modified', 0)} updated)"
+            )
+            synced.extend(project["title"] for project in batch)
+        elif response.status_code == 401:
+            print(f"    ❌ Authentication failed. Check API credentials.")
+        else:
+            print(
+                f"    ❌ Failed to sync {len(batch)} projects. Status: {response.status_code}"
+            )
+            print(f"    Response: {response.text}")
+
+    return synced
+
+
 def process_latest_projects(
-    num_projects: int, api_base_url: str = "portfolio.tashifc.codes"
+    num_projects: Optional[int],
+    api_base_url: str = "portfolio.tashifc.codes",
+    config: Optional[RunConfig] = None,
+    username: str = DEFAULT_GITHUB_USERNAME,
+    bulk: bool = True,
+    dry_run: bool = False,
 ) -> None:
-    """Fetch and process the latest N projects, then add them to MongoDB"""
-    print(f"🚀 Fetching latest {num_projects} projects from GitHub...")
+    """Fetch and process the latest N projects, then add them to MongoDB.
+
+    The pipeline options come from config, as for main.py. With dry_run,
+    stop after selecting the projects and report what would be analyzed,
+    without loading the model or calling the API. Once the merged aggregate
+    covers every listed repo it is also written as the site's snapshot
+    (to config.snapshot_dir, or SNAPSHOT_DIR) unless config.snapshot is off.
+    """
+    config = config or RunConfig()
+    if config.incremental:
+        print("🚀 Fetching projects from GitHub to find new or changed repos...")
+    else:
+        print(f"🚀 Fetching latest {num_projects} projects from GitHub...")
 
     try:
-        all_projects = get_projects("tashifkhan")
+        all_projects = get_projects(username)
 
         if not all_projects:
             print("❌ No projects found!")
             return
 
-        # Get the latest N projects (assuming they're already sorted by recency)
-        latest_projects = all_projects[:num_projects]
+        # Fingerprint before the AI stages rewrite languages
+        fingerprints = {project.title: fingerprint(project) for project in all_projects}
+        listing_positions = {project.title: i for i, project in enumerate(all_projects)}
+        manifest = load_manifest()
+
+        if config.incremental:
+            changes = diff_projects(all_projects, manifest)
+            print(
+                f"🔍 {len(changes.new)} new, {len(changes.modified)} modified, "
+                f"{len(changes.unchanged)} unchanged, {len(changes.removed)} removed"
+            )
+            latest_projects = sorted(
+                changes.new + changes.modified,
+                key=lambda project: listing_positions[project.title],
+            )[:num_projects]
+        else:
+            # Get the latest N projects (assuming they're already sorted by recency)
+            latest_projects = all_projects[:num_projects]
 
         print(
             f"📦 Found {len(all_projects)} total projects. Processing latest {len(latest_projects)}..."
         )
 
+        if config.readme_budget:
+            print_compaction_report(compact_projects(latest_projects, config.readme_budget))
+
+        if dry_run:
+            prompt_tokens = 0
+            for project in latest_projects:
+                tokens = build_payload(project, "analysis").tokens
+                prompt_tokens += tokens
+                print(f"  - {project.title} (~{tokens} prompt tokens)")
+            print(
+                f"🔎 Dry run: would analyze and upsert {len(latest_projects)} projects "
+                f"(~{prompt_tokens} repo tokens before prompt overhead)"
+            )
+            get_tracer().print_summary()
+            return
+
+        # Imported here so --dry-run never loads LangChain
+        from pipeline import process_project_with_ai
+
+        batched = set()
+        if config.batch:
+            from batch_analyzer import analyze_in_batches
+
+            batched = analyze_in_batches(latest_projects, config.batch_tokens, config.batch_size)
+
+        if config.concurrency > 0:
+            from async_pipeline import process_projects_concurrently
+
+            processed = process_projects_concurrently(
+                [project for project in latest_projects if project.title not in batched],
+                config.concurrency,
+                config.requests_per_minute,
+                config.tokens_per_minute,
+                config.fused,
+            )
+            processed_by_title = {project.title: project for project in processed}
+            latest_projects = [
+                processed_by_title.get(project.title, project) for project in latest_projects
+            ]
+
         processed_count = 0
         failed_count = 0
+        aggregate_entries: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, Dict[str, Any]] = {}
+        pending_json: List[Dict[str, Any]] = []
+        unfinished = set()
+        session = create_api_session()
 
         for i, project in enumerate(latest_projects):
             print(
@@ -149,22 +289,47 @@ def process_latest_projects(
 
             try:
                 # Process project with AI
-                processed_project = process_project_with_ai(project)
+                misses_before = get_cache().misses
+                if config.concurrency > 0 or project.title in batched:
+                    processed_project = project
+                else:
+                    processed_project = process_project_with_ai(project, fused=config.fused)
 
                 # Convert to required format
-                project_json = create_project_json(processed_project, i)
-
-                # Add to MongoDB via API
-                print(f"  - Adding to MongoDB...")
-                success = add_project_to_mongodb(project_json, api_base_url)
-
-                if success:
-                    processed_count += 1
+                position = listing_positions[project.title] if config.incremental else i
+                project_json = create_project_json(processed_project, position, username)
+
+                aggregate_entry = create_aggregate_entry(processed_project, position, username)
+                if processed_project.status is None:
+                    # Pushed with the default status, but left out of the
+                    # manifest so --incremental asks for it again
+                    unfinished.add(project.title)
+                    manifest.pop(project.title, None)
+
+                if bulk:
+                    # Sent to MongoDB in one batched upsert after the loop
+                    pending[project.title] = aggregate_entry
+                    pending_json.append(project_json)
                 else:
-                    failed_count += 1
-
-                # Add delay between projects to avoid rate limits
-                if i < len(latest_projects) - 1:
+                    # Add to MongoDB via API
+                    print(f"  - Adding to MongoDB...")
+                    success = add_project_to_mongodb(project_json, api_base_url, session)
+
+                    if success:
+                        processed_count += 1
+                        if project.title not in unfinished:
+                            manifest[project.title] = fingerprints[project.title]
+                        aggregate_entries[project.title] = aggregate_entry
+                    else:
+                        failed_count += 1
+
+                # Add delay between projects to avoid rate limits,
+                # unless every stage was answered from the cache
+                if (
+                    config.concurrency <= 0
+                    and get_cache().misses > misses_before
+                    and i < len(latest_projects) - 1
+                ):
                     print(f"  - Waiting 5 seconds before next project...")
                     time.sleep(5)
 
@@ -173,10 +338,47 @@ def process_latest_projects(
                 failed_count += 1
                 continue
 
+        if pending_json:
+            print(f"\n📤 Upserting {len(pending_json)} projects to MongoDB...")
+            synced = set(bulk_upsert_projects(pending_json, api_base_url, session))
+            for title, aggregate_entry in pending.items():
+                if title in synced:
+                    processed_count += 1
+                    if title not in unfinished:
+                        manifest[title] = fingerprints[title]
+                    aggregate_entries[title] = aggregate_entry
+                else:
+                    failed_count += 1
+
+        # Merge the pushed projects into the local aggregate and manifest
+        if aggregate_entries:
+            merged = merge_aggregate(
+                [project.title for project in all_projects],
+                aggregate_entries,
+                load_aggregate(),
+            )
+            write_json(ALL_PROJECTS_PATH, merged)
+            save_manifest(manifest)
+            print(f"📄 Merged {len(aggregate_entries)} projects into '{ALL_PROJECTS_PATH}'")
+            snapshot_dir = (config.snapshot_dir or SNAPSHOT_DIR) if config.snapshot else None
+            missing = len(all_projects) - len(merged)
+            if snapshot_dir and missing:
+                # Publishing only the pushed repos would empty the site's list
+                print(
+                    f"📸 Snapshot skipped: {missing} of {len(all_projects)} listed projects "
+                    f"have no entry in '{ALL_PROJECTS_PATH}' yet; run main.py once to build it"
+                )
+            elif snapshot_dir:
+                print_snapshot(build_snapshot(merged, snapshot_dir), snapshot_dir)
+
         print(f"\n🎉 Processing complete!")
         print(f"✅ Successfully processed: {processed_count}")
         print(f"❌ Failed: {failed_count}")
         print(f"📊 Total: {processed_count + failed_count}")
+        print(f"🗄️  {cache_stats()}")
+        print(f"🌐 {http_cache_stats()}")
+        print_retry_stats()
+        get_tracer().print_summary()
 
     except Exception as e:
         print(f"❌ Critical error: {str(e)}")
@@ -185,28 +387,86 @@ def process_latest_projects(
 
 def main():
     """Main function to handle command line arguments"""
-    if len(sys.argv) != 2:
-        print("Usage: python update_latest.py <number_of_projects>")
-        print("Example: python update_latest.py 5")
+    parser = argparse.ArgumentParser(
+        description="Process the latest N projects and add them to MongoDB",
+        epilog="Example: python update_latest.py 5",
+    )
+    parser.add_argument(
+        "num_projects",
+        nargs="?",
+        help="Number of latest projects to process (optional with --incremental)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only process repos that are new or changed since the last run",
+    )
+    parser.add_argument(
+        "--user", default=DEFAULT_GITHUB_USERNAME, help="GitHub user or org to process"
+    )
+    parser.add_argument(
+        "--no-bulk",
+        action="store_true",
+        help="POST each project separately instead of one batched upsert",
+    )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Use three separate AI calls per project instead of one combined call",
+    )
+    add_concurrency_arguments(parser)
+    add_backend_arguments(parser)
+    add_cache_arguments(parser)
+    add_compaction_arguments(parser)
+    add_batch_arguments(parser)
+    add_dry_run_arguments(parser)
+    add_snapshot_arguments(parser)
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+    configure_tracing_from_args(args)
+    configure_stage_budgets_from_args(args)
+    configure_backend_from_args(args)
+    configure_cache_from_args(args)
+    if args.dry_run:
+        # A dry run writes nothing, not even the listing's validators
+        configure_http_cache(enabled=False)
+
+    num_projects = None
+    if args.num_projects is None and not args.incremental:
+        parser.print_usage()
         sys.exit(1)
-
-    try:
-        num_projects = int(sys.argv[1])
-        if num_projects <= 0:
-            print("❌ Number of projects must be greater than 0")
+    if args.num_projects is not None:
+        try:
+            num_projects = int(args.num_projects)
+            if num_projects <= 0:
+                print("❌ Number of projects must be greater than 0")
+                sys.exit(1)
+        except ValueError:
+            print("❌ Please provide a valid number")
             sys.exit(1)
-    except ValueError:
-        print("❌ Please provide a valid number")
-        sys.exit(1)
 
     # You can override the API base URL with environment variable
     api_base_url = os.getenv("API_BASE_URL", "portfolio.tashifc.codes")
 
-    print(f"🎯 Target: Process latest {num_projects} projects")
+    if args.incremental:
+        print(f"🎯 Target: Process new or changed projects (limit: {num_projects or 'none'})")
+    else:
+        print(f"🎯 Target: Process latest {num_projects} projects")
     print(f"🔗 API Base URL: {api_base_url}")
 
-    process_latest_projects(num_projects, api_base_url)
+    if args.fake_llm:
+        from fake_llm import install_fake_model
+
+        install_fake_model(latency=args.fake_latency)
 
+    process_latest_projects(
+        num_projects,
+        api_base_url,
+        run_config_from_args(args),
+        args.user,
+        bulk=not args.no_bulk,
+        dry_run=args.dry_run,
+    )
 
 if __name__ == "__main__":
     main()
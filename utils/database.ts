@@ -70,6 +70,29 @@ export class DatabaseService {
     return result.modifiedCount > 0
   }
 
+  static async upsertProjects(
+    projects: Omit<Project, '_id' | 'createdAt' | 'updatedAt'>[]
+  ): Promise<{ matched: number; modified: number; upserted: number }> {
+    const collection = await this.getCollection('Project Collection')
+    const now = new Date()
+    const bulkOps = projects.map(project => ({
+      updateOne: {
+        filter: { githubLink: project.githubLink },
+        update: {
+          $set: { ...project, updatedAt: now },
+          $setOnInsert: { createdAt: now }
+        },
+        upsert: true
+      }
+    }))
+    const result = await collection.bulkWrite(bulkOps, { ordered: false })
+    return {
+      matched: result.matchedCount,
+      modified: result.modifiedCount,
+      upserted: result.upsertedCount
+    }
+  }
+
   // Notable Projects operations - using original collection name
   static async getNotableProjects(): Promise<NotableProject[]> {
     const collection = await this.getCollection('MajorProjects')
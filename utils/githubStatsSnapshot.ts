@@ -0,0 +1,56 @@
+import { promises as fs } from "fs";
+import path from "path";
+import { calculateLanguagePercentages, LanguageData } from "./languageStats";
+
+// Written by scripts/github_stats.py
+const SNAPSHOT_DIR = path.join(process.cwd(), "data", "github-stats");
+const SNAPSHOT_VERSION = 1;
+// Older snapshots fall back to live GitHub calls so streaks stay current
+const MAX_SNAPSHOT_AGE_MS =
+  Number(process.env.GITHUB_STATS_SNAPSHOT_MAX_AGE_HOURS || 24) * 60 * 60 * 1000;
+
+export interface GithubStatsSnapshot {
+  version: number;
+  username: string;
+  generatedAt: string;
+  repoCount: number;
+  languageBytes: Record<string, number>;
+  totalCommits: number;
+  longestStreak: number;
+  currentStreak: number;
+}
+
+export interface GithubStats {
+  topLanguages: LanguageData[];
+  totalCommits: number;
+  longestStreak: number;
+  currentStreak: number;
+}
+
+export const readGithubStatsSnapshot = async (
+  username: string
+): Promise<GithubStatsSnapshot | null> => {
+  try {
+    const file = path.join(SNAPSHOT_DIR, `${username.toLowerCase()}.json`);
+    const snapshot: GithubStatsSnapshot = JSON.parse(await fs.readFile(file, "utf-8"));
+
+    if (snapshot.version !== SNAPSHOT_VERSION) return null;
+    if (Date.now() - new Date(snapshot.generatedAt).getTime() > MAX_SNAPSHOT_AGE_MS) {
+      return null;
+    }
+    return snapshot;
+  } catch {
+    // Missing or unreadable snapshot; the caller computes the stats live
+    return null;
+  }
+};
+
+export const statsFromSnapshot = (
+  snapshot: GithubStatsSnapshot,
+  excludedLanguages: string[]
+): GithubStats => ({
+  topLanguages: calculateLanguagePercentages(snapshot.languageBytes, excludedLanguages),
+  totalCommits: snapshot.totalCommits,
+  longestStreak: snapshot.longestStreak,
+  currentStreak: snapshot.currentStreak,
+});
@@ -12,11 +12,30 @@ const DEFAULT_EXCLUDED_LANGUAGES = [
   "XML"
 ];
 
-interface LanguageData {
+export interface LanguageData {
   name: string;
   percentage: number;
 }
 
+// Turn per-language byte totals into percentages, skipping excluded languages.
+// Also used on the precomputed totals written by scripts/github_stats.py.
+export const calculateLanguagePercentages = (
+  languageTotals: Record<string, number>,
+  excludedLanguages: string[] = DEFAULT_EXCLUDED_LANGUAGES
+): LanguageData[] => {
+  const included = Object.entries(languageTotals).filter(
+    ([lang]) => !excludedLanguages.includes(lang)
+  );
+  const totalBytes = included.reduce((sum, [, bytes]) => sum + bytes, 0);
+
+  return included
+    .map(([name, bytes]) => ({
+      name,
+      percentage: parseFloat(((bytes / totalBytes) * 100).toFixed(2))
+    }))
+    .sort((a, b) => b.percentage - a.percentage);
+};
+
 export const fetchLanguageStats = async (
   username: string, 
   excludedLanguages: string[] = DEFAULT_EXCLUDED_LANGUAGES
@@ -46,23 +65,11 @@ export const fetchLanguageStats = async (
     const languageTotals: Record<string, number> = {};
     repoLanguages.forEach((langs) => {
       Object.entries(langs).forEach(([lang, bytes]: [string, unknown]) => {
-        // Skip excluded languages
-        if (excludedLanguages.includes(lang)) return;
         languageTotals[lang] = (languageTotals[lang] || 0) + (bytes as number);
       });
     });
 
-    // Calculate percentages
-    const totalBytes = Object.values(languageTotals).reduce((a, b) => a + b, 0);
-
-    const languageStats = Object.entries(languageTotals)
-      .map(([name, bytes]) => ({
-        name,
-        percentage: parseFloat(((bytes / totalBytes) * 100).toFixed(2))
-      }))
-      .sort((a, b) => b.percentage - a.percentage);
-
-    return languageStats;
+    return calculateLanguagePercentages(languageTotals, excludedLanguages);
   } catch (error) {
     console.error('Error fetching language stats:', error);
     return [];